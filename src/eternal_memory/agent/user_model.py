@@ -196,7 +196,12 @@ total_updates: 0
         
         return deleted
     
-    async def batch_update(self, insights: List[dict]) -> int:
+    async def batch_update(
+        self,
+        insights: List[dict],
+        min_confidence: Optional[float] = None,
+        min_evidence: Optional[int] = None,
+    ) -> int:
         """
         Batch update USER.md with multiple insights.
         
@@ -209,6 +214,10 @@ total_updates: 0
                 - content: The insight content
                 - confidence: Confidence score (0.0-1.0)
                 - evidence_count: Number of supporting observations
+            min_confidence: Confidence threshold for this call
+                (defaults to MIN_CONFIDENCE)
+            min_evidence: Evidence threshold for this call
+                (defaults to MIN_EVIDENCE)
         
         Returns:
             Number of insights successfully added
@@ -216,11 +225,16 @@ total_updates: 0
         if not insights:
             return 0
         
+        if min_confidence is None:
+            min_confidence = self.MIN_CONFIDENCE
+        if min_evidence is None:
+            min_evidence = self.MIN_EVIDENCE
+        
         # Filter insights by quality threshold
         valid_insights = [
             ins for ins in insights
-            if ins.get("confidence", 0) >= self.MIN_CONFIDENCE
-            and ins.get("evidence_count", 0) >= self.MIN_EVIDENCE
+            if ins.get("confidence", 0) >= min_confidence
+            and ins.get("evidence_count", 0) >= min_evidence
             and ins.get("section") in self.VALID_SECTIONS
             and ins.get("content")
         ]
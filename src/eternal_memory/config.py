@@ -48,6 +48,7 @@ class EmbeddingConfig(BaseModel):
     """Embedding model configuration."""
     model: str = "text-embedding-ada-002"
     dimension: int = 1536
+    cache_path: Optional[str] = None  # SQLite file for a persistent embedding cache
 
 
 class ConsolidationConfig(BaseModel):
@@ -73,6 +74,18 @@ class ScoringConfig(BaseModel):
     
     # Minimum relevance threshold for retrieval
     min_relevance_threshold: float = 0.3
+    
+    # Two-stage search for Matryoshka-trained embeddings (text-embedding-3-*):
+    # shortlist cascade_candidates items on the first cascade_dim dimensions,
+    # then score only those on the full vector (at most 1000). None = single
+    # full-dim scan. Setting it creates a prefix index (pgvector 0.7+).
+    cascade_dim: Optional[int] = None
+    cascade_candidates: int = 200
+    
+    # Shortlist on 1-bit quantized embeddings (Hamming distance) before the
+    # full-precision scoring; combines with cascade_dim. Setting it creates
+    # a binary-quantized index (pgvector 0.7+).
+    use_quantized_prefilter: bool = False
 
 
 
@@ -100,6 +113,15 @@ class LLMConfig(BaseModel):
     use_memory_supersede: bool = False  # Whether to detect and supersede contradicting memories
     use_semantic_triples: bool = False  # Whether to extract entity-level triples for precise updates
     
+    # Smart categorization: a top category candidate at least this similar
+    # is used as-is, without asking the LLM (values above 1.0 always ask)
+    category_auto_threshold: float = 0.75
+    
+    # Bare greetings/acknowledgements are only logged to the timeline, with
+    # no extraction call; so are inputs shorter than this (after stripping).
+    # Off by default: short statements carry facts ("I'm Bob", "나 비건이야")
+    min_extract_chars: int = 0
+    
     # Lazy Evaluation for triple extraction
     triple_extraction_immediate: bool = True  # True = extract on memorize, False = batch process later
     triple_extraction_interval_minutes: int = 5  # Interval for batch extraction when immediate=False (1, 5, 10, 30)
@@ -122,6 +144,18 @@ class BufferConfig(BaseModel):
     """Conversation buffer configuration."""
     flush_threshold_tokens: int = 4000  # OpenClaw default
     auto_flush_enabled: bool = True
+    
+    # Cache flush LLM responses so re-flushing an identical transcript skips
+    # the LLM calls. Exact matches only: a near-identical transcript may add
+    # a new fact, which a reused response would silently drop.
+    flush_response_cache: bool = True
+    
+    # Seconds a flushed transcript is remembered; flushing the same
+    # transcript again within this window returns the earlier items (0 disables)
+    flush_dedup_ttl_seconds: float = 600.0
+    
+    # Stream the flush extraction response and store facts as lines arrive
+    flush_stream_extraction: bool = True
 
 
 class MemoryConfig(BaseModel):
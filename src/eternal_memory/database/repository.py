@@ -6,14 +6,70 @@ Handles vector similarity search and full-text search.
 """
 
 import json
+import struct
+import sys
+from array import array
+from contextlib import nullcontext
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional, Sequence, Tuple, Union
 from uuid import UUID
 
 import asyncpg
 
-from eternal_memory.models.memory_item import Category, MemoryItem, MemoryType, Resource
-from eternal_memory.models.semantic_triple import SemanticTriple, normalize_predicate
+from eternal_memory.database.schema import shortlist_key
+from eternal_memory.models.memory_item import Category, MemoryItem, Resource, content_hash
+from eternal_memory.models.semantic_triple import (
+    OPPOSITE_PREDICATES,
+    SemanticTriple,
+    normalize_predicate,
+)
+
+Vector = Union[Sequence[float], array]
+
+_VECTOR_HEADER = struct.Struct(">HH")  # dimensions, unused
+_SWAP_FLOATS = sys.byteorder == "little"
+
+
+def _encode_vector(value: Union[Vector, str]) -> bytes:
+    """pgvector binary send format: header + big-endian float4 values."""
+    if isinstance(value, str):
+        value = json.loads(value)
+    if isinstance(value, array) and value.typecode == "f" and not _SWAP_FLOATS:
+        return _VECTOR_HEADER.pack(len(value), 0) + value.tobytes()
+    vector = array("f", value)
+    if _SWAP_FLOATS:
+        vector.byteswap()
+    return _VECTOR_HEADER.pack(len(vector), 0) + vector.tobytes()
+
+
+def _decode_vector(data: bytes) -> array:
+    """Inverse of _encode_vector; embeddings read back as packed float32."""
+    dimensions, _ = _VECTOR_HEADER.unpack_from(data)
+    vector = array("f")
+    vector.frombytes(data[_VECTOR_HEADER.size:_VECTOR_HEADER.size + 4 * dimensions])
+    if _SWAP_FLOATS:
+        vector.byteswap()
+    return vector
+
+
+def _vector_literal(vector: Vector) -> str:
+    """pgvector text literal, for vectors bound inside text[] parameters."""
+    return "[" + ",".join(map(str, vector)) + "]"
+
+
+async def _init_connection(conn: asyncpg.Connection) -> None:
+    """Bind vector parameters in binary instead of formatting them as text."""
+    try:
+        await conn.set_type_codec(
+            "vector",
+            schema="public",
+            encoder=_encode_vector,
+            decoder=_decode_vector,
+            format="binary",
+        )
+    except ValueError:
+        # Extension not installed yet: no vector columns to bind either
+        pass
 
 
 class MemoryRepository:
@@ -27,15 +83,18 @@ class MemoryRepository:
     - Category management
     """
     
-    def __init__(self, connection_string: str = None):
+    def __init__(self, connection_string: str = None, embedding_dim: int = 1536):
         self.connection_string = connection_string or "postgresql://127.0.0.1/eternal_memory"
+        self.embedding_dim = embedding_dim
         self._pool: Optional[asyncpg.Pool] = None
     
     async def connect(self) -> None:
         """Initialize connection pool."""
         if self._pool is not None:
             return
-        self._pool = await asyncpg.create_pool(self.connection_string, min_size=2, max_size=10)
+        self._pool = await asyncpg.create_pool(
+            self.connection_string, min_size=2, max_size=10, init=_init_connection
+        )
     
     async def disconnect(self) -> None:
         """Close connection pool."""
@@ -71,7 +130,7 @@ class MemoryRepository:
                 resource_id,
             )
             if row:
-                return Resource(
+                return Resource.from_trusted(
                     id=row["id"],
                     uri=row["uri"],
                     modality=row["modality"],
@@ -83,7 +142,7 @@ class MemoryRepository:
     
     # ========== Category Operations ==========
     
-    async def create_category(self, category: Category, embedding: Optional[List[float]] = None) -> Category:
+    async def create_category(self, category: Category, embedding: Optional[Vector] = None) -> Category:
         """Create a new category."""
         async with self._pool.acquire() as conn:
             await conn.execute(
@@ -102,18 +161,79 @@ class MemoryRepository:
                 category.parent_id,
                 category.summary,
                 category.path,
-                str(embedding) if embedding else None,
+                embedding if embedding else None,
                 category.last_accessed,
             )
         return category
 
+    async def create_categories_bulk(
+        self,
+        categories: List[Category],
+        embeddings: List[Optional[Vector]],
+    ) -> List[Category]:
+        """
+        Create several categories in one transaction.
+        
+        Rows are inserted in list order, so a category may use the ID of
+        an earlier one in the list as its parent_id. A path that already
+        exists keeps its stored ID; the Category (and any later
+        parent_id pointing at it) is updated to match, so the returned
+        categories are exactly what is in the table.
+        """
+        if not categories:
+            return []
+        
+        stored_ids: Dict[UUID, UUID] = {}
+        async with self._pool.acquire() as conn:
+            async with conn.transaction():
+                for category, embedding in zip(categories, embeddings):
+                    category.parent_id = stored_ids.get(category.parent_id, category.parent_id)
+                    stored_id = await conn.fetchval(
+                        """
+                        INSERT INTO categories (id, name, description, parent_id, summary, path, embedding, last_accessed)
+                        VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+                        ON CONFLICT (path) DO UPDATE SET
+                            description = EXCLUDED.description,
+                            summary = EXCLUDED.summary,
+                            embedding = COALESCE(EXCLUDED.embedding, categories.embedding),
+                            last_accessed = NOW()
+                        RETURNING id
+                        """,
+                        category.id,
+                        category.name,
+                        category.description,
+                        category.parent_id,
+                        category.summary,
+                        category.path,
+                        embedding if embedding else None,
+                        category.last_accessed,
+                    )
+                    if stored_id != category.id:
+                        stored_ids[category.id] = stored_id
+                        category.id = stored_id
+        return categories
+    
     async def vector_search_categories(
         self,
-        query_embedding: List[float],
+        query_embedding: Vector,
         limit: int = 5,
         threshold: float = 0.3,
     ) -> List[Category]:
         """Search categories by semantic similarity."""
+        return [
+            category
+            for category, _ in await self.vector_search_categories_with_scores(
+                query_embedding, limit, threshold
+            )
+        ]
+    
+    async def vector_search_categories_with_scores(
+        self,
+        query_embedding: Vector,
+        limit: int = 5,
+        threshold: float = 0.3,
+    ) -> List[Tuple[Category, float]]:
+        """Search categories by semantic similarity, with each similarity."""
         async with self._pool.acquire() as conn:
             rows = await conn.fetch(
                 """
@@ -123,23 +243,12 @@ class MemoryRepository:
                 ORDER BY embedding <=> $1::vector
                 LIMIT $3
                 """,
-                str(query_embedding),
+                query_embedding,
                 threshold,
                 limit,
             )
             
-            return [
-                Category(
-                    id=row["id"],
-                    name=row["name"],
-                    description=row["description"],
-                    parent_id=row["parent_id"],
-                    summary=row["summary"],
-                    path=row["path"],
-                    last_accessed=row["last_accessed"],
-                )
-                for row in rows
-            ]
+            return [(self._row_to_category(row), row["similarity"]) for row in rows]
     
     async def get_category_by_path(self, path: str) -> Optional[Category]:
         """Get a category by its path."""
@@ -149,33 +258,26 @@ class MemoryRepository:
                 path,
             )
             if row:
-                return Category(
-                    id=row["id"],
-                    name=row["name"],
-                    description=row["description"],
-                    parent_id=row["parent_id"],
-                    summary=row["summary"],
-                    path=row["path"],
-                    last_accessed=row["last_accessed"],
-                )
+                return self._row_to_category(row)
         return None
     
+    async def get_categories_by_paths(self, paths: List[str]) -> List[Category]:
+        """Get the categories that exist among the given paths."""
+        if not paths:
+            return []
+        
+        async with self._pool.acquire() as conn:
+            rows = await conn.fetch(
+                "SELECT * FROM categories WHERE path = ANY($1::text[])",
+                paths,
+            )
+            return [self._row_to_category(row) for row in rows]
+    
     async def get_all_categories(self) -> List[Category]:
         """Get all categories."""
         async with self._pool.acquire() as conn:
             rows = await conn.fetch("SELECT * FROM categories ORDER BY path")
-            return [
-                Category(
-                    id=row["id"],
-                    name=row["name"],
-                    description=row["description"],
-                    parent_id=row["parent_id"],
-                    summary=row["summary"],
-                    path=row["path"],
-                    last_accessed=row["last_accessed"],
-                )
-                for row in rows
-            ]
+            return [self._row_to_category(row) for row in rows]
     
     async def update_category_summary(self, path: str, summary: str) -> None:
         """Update the summary of a category."""
@@ -195,7 +297,7 @@ class MemoryRepository:
     async def create_memory_item(
         self,
         item: MemoryItem,
-        embedding: List[float],
+        embedding: Vector,
         category_id: Optional[UUID] = None,
     ) -> MemoryItem:
         """Create a new memory item with its embedding vector."""
@@ -204,26 +306,56 @@ class MemoryRepository:
                 await conn.execute(
                     """
                     INSERT INTO memory_items 
-                    (id, category_id, resource_id, content, embedding, type, importance, confidence, mention_count, created_at, last_accessed)
-                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11)
+                    (id, category_id, resource_id, content, embedding, type, importance, confidence, mention_count, created_at, last_accessed, content_hash)
+                    VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12)
                     """,
                     item.id,
                     category_id,
                     item.source_resource_id,
                     item.content,
-                    str(embedding),  # pgvector accepts string format
+                    embedding,
                     item.type,
                     item.importance,
                     item.confidence,
                     item.mention_count,
                     item.created_at,
                     item.last_accessed,
+                    content_hash(item.content),
                 )
         except Exception as e:
             print(f"DEBUG ERROR: Failed to insert memory item: {e}", flush=True)
             raise e
         return item
     
+    async def get_memory_items_by_content_hashes(
+        self,
+        hashes: List[str],
+    ) -> Dict[str, MemoryItem]:
+        """
+        Find active memories whose normalized content hashes match.
+        
+        See models.memory_item.content_hash(). When several memories share
+        a hash, the most reinforced one is returned.
+        
+        Returns:
+            Dict mapping each found hash to its memory
+        """
+        if not hashes:
+            return {}
+        
+        async with self._pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT DISTINCT ON (mi.content_hash) mi.*, c.path as category_path
+                FROM memory_items mi
+                LEFT JOIN categories c ON mi.category_id = c.id
+                WHERE mi.content_hash = ANY($1::text[]) AND mi.is_active
+                ORDER BY mi.content_hash, mi.mention_count DESC
+                """,
+                hashes,
+            )
+            return {row["content_hash"]: self._row_to_memory_item(row) for row in rows}
+    
     async def get_memory_item(self, item_id: UUID) -> Optional[MemoryItem]:
         """Get a memory item by ID."""
         async with self._pool.acquire() as conn:
@@ -237,20 +369,27 @@ class MemoryRepository:
                 item_id,
             )
             if row:
-                return MemoryItem(
-                    id=row["id"],
-                    content=row["content"],
-                    category_path=row["category_path"] or "",
-                    type=MemoryType(row["type"]),
-                    confidence=row["confidence"],
-                    importance=row["importance"],
-                    mention_count=row.get("mention_count", 1),
-                    source_resource_id=row["resource_id"],
-                    created_at=row["created_at"],
-                    last_accessed=row["last_accessed"],
-                )
+                return self._row_to_memory_item(row)
         return None
     
+    async def get_memory_items_by_ids(self, item_ids: List[UUID]) -> List[MemoryItem]:
+        """Get memory items by ID, in the order given (missing IDs are skipped)."""
+        if not item_ids:
+            return []
+        
+        async with self._pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT mi.*, c.path as category_path
+                FROM memory_items mi
+                LEFT JOIN categories c ON mi.category_id = c.id
+                WHERE mi.id = ANY($1::uuid[])
+                """,
+                item_ids,
+            )
+        items = {row["id"]: self._row_to_memory_item(row) for row in rows}
+        return [items[item_id] for item_id in item_ids if item_id in items]
+    
     async def update_last_accessed(self, item_id: UUID) -> None:
         """Update the last_accessed timestamp for a memory item."""
         async with self._pool.acquire() as conn:
@@ -279,6 +418,43 @@ class MemoryRepository:
             )
             return row["mention_count"] if row else 0
 
+    async def reinforce_memory_items_bulk(
+        self,
+        item_ids: List[UUID],
+        importances: List[float],
+        increments: Optional[List[int]] = None,
+    ) -> Dict[UUID, int]:
+        """
+        Reinforce several memory items in one statement.
+        
+        Args:
+            item_ids: Distinct memory item IDs
+            importances: New importance for each item
+            increments: Mention count increment for each item (default 1)
+            
+        Returns:
+            Mapping of item ID to its new mention_count
+        """
+        if not item_ids:
+            return {}
+        
+        async with self._pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                UPDATE memory_items mi
+                SET last_accessed = NOW(),
+                    mention_count = mi.mention_count + u.increment,
+                    importance = u.importance
+                FROM unnest($1::uuid[], $2::float8[], $3::int[]) AS u(id, importance, increment)
+                WHERE mi.id = u.id
+                RETURNING mi.id, mi.mention_count
+                """,
+                item_ids,
+                importances,
+                increments or [1] * len(item_ids),
+            )
+            return {row["id"]: row["mention_count"] for row in rows}
+
     async def supersede_memory_item(
         self,
         old_item_id: UUID,
@@ -311,11 +487,41 @@ class MemoryRepository:
             )
             return result == "UPDATE 1"
     
+    async def supersede_memory_items(
+        self,
+        old_item_ids: List[UUID],
+        new_item_id: UUID,
+    ) -> int:
+        """
+        Mark several memories as superseded by one new memory.
+        
+        Same as supersede_memory_item() for each ID, in one statement.
+        
+        Returns:
+            Number of memories superseded
+        """
+        if not old_item_ids:
+            return 0
+        
+        async with self._pool.acquire() as conn:
+            result = await conn.execute(
+                """
+                UPDATE memory_items 
+                SET is_active = FALSE,
+                    superseded_by = $2,
+                    last_accessed = NOW()
+                WHERE id = ANY($1::uuid[])
+                """,
+                old_item_ids,
+                new_item_id,
+            )
+            return int(result.split()[-1])
+    
     # ========== Search Operations ==========
     
     async def vector_search(
         self,
-        query_embedding: List[float],
+        query_embedding: Vector,
         limit: int = 5,
         threshold: float = 0.8,
     ) -> List[MemoryItem]:
@@ -335,24 +541,15 @@ class MemoryRepository:
                 ORDER BY mi.embedding <=> $1::vector
                 LIMIT $3
                 """,
-                str(query_embedding),
+                query_embedding,
                 threshold,
                 limit,
             )
             
             items = []
             for row in rows:
-                item = MemoryItem(
-                    id=row["id"],
-                    content=row["content"],
-                    category_path=row["category_path"] or "",
-                    type=MemoryType(row["type"]),
-                    confidence=row["confidence"] * row["similarity"],  # Adjust by similarity
-                    importance=row["importance"],
-                    mention_count=row.get("mention_count", 1),
-                    source_resource_id=row["resource_id"],
-                    created_at=row["created_at"],
-                    last_accessed=row["last_accessed"],
+                item = self._row_to_memory_item(
+                    row, confidence=row["confidence"] * row["similarity"]  # Adjust by similarity
                 )
                 items.append(item)
                 # Update access timestamp
@@ -360,10 +557,66 @@ class MemoryRepository:
             
             return items
 
+    async def vector_search_batch(
+        self,
+        query_embeddings: List[Vector],
+        limit: int = 5,
+        threshold: float = 0.8,
+    ) -> List[List[MemoryItem]]:
+        """
+        Run vector_search for several query embeddings in one round-trip.
+        
+        Each query is probed through a LATERAL subquery, so every probe
+        still uses the HNSW index.
+        
+        Returns:
+            One result list per query embedding, in input order
+        """
+        if not query_embeddings:
+            return []
+        
+        async with self._pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT q.idx, m.*, c.path as category_path
+                FROM unnest($1::text[]) WITH ORDINALITY AS q(embedding, idx)
+                CROSS JOIN LATERAL (
+                    SELECT mi.*,
+                           1 - (mi.embedding <=> q.embedding::vector) as similarity
+                    FROM memory_items mi
+                    WHERE 1 - (mi.embedding <=> q.embedding::vector) >= $2
+                    ORDER BY mi.embedding <=> q.embedding::vector
+                    LIMIT $3
+                ) m
+                LEFT JOIN categories c ON m.category_id = c.id
+                ORDER BY q.idx, m.similarity DESC
+                """,
+                [_vector_literal(embedding) for embedding in query_embeddings],
+                threshold,
+                limit,
+            )
+            
+            results: List[List[MemoryItem]] = [[] for _ in query_embeddings]
+            for row in rows:
+                results[row["idx"] - 1].append(
+                    self._row_to_memory_item(
+                        row, confidence=row["confidence"] * row["similarity"]  # Adjust by similarity
+                    )
+                )
+            
+            # Update access timestamps in one statement
+            if rows:
+                await conn.execute(
+                    "UPDATE memory_items SET last_accessed = NOW() WHERE id = ANY($1::uuid[])",
+                    list({row["id"] for row in rows}),
+                )
+            
+            return results
+
     async def hybrid_search(
         self,
         query_text: str,
-        query_embedding: List[float],
+        query_embedding: Vector,
         limit: int = 5,
         vector_weight: float = 0.7,
     ) -> List[MemoryItem]:
@@ -408,7 +661,7 @@ class MemoryRepository:
                 LIMIT $5
                 """,
                 query_text,
-                str(query_embedding),
+                query_embedding,
                 vector_weight,
                 keyword_weight,
                 limit,
@@ -416,18 +669,7 @@ class MemoryRepository:
             
             items = []
             for row in rows:
-                item = MemoryItem(
-                    id=row["id"],
-                    content=row["content"],
-                    category_path=row["category_path"] or "",
-                    type=MemoryType(row["type"]),
-                    confidence=row["confidence"], # Score is separate
-                    importance=row["importance"],
-                    mention_count=row.get("mention_count", 1),
-                    source_resource_id=row["resource_id"],
-                    created_at=row["created_at"],
-                    last_accessed=row["last_accessed"],
-                )
+                item = self._row_to_memory_item(row)
                 # Attach score metadata if needed, or just return sorted
             items.append(item)
             
@@ -435,13 +677,17 @@ class MemoryRepository:
 
     async def generative_agents_search(
         self,
-        query_embedding: List[float],
+        query_embedding: Vector,
         limit: int = 10,
         alpha_relevance: float = 1.0,
         alpha_recency: float = 1.0,
         alpha_importance: float = 1.0,
         recency_decay_factor: float = 0.995,
         min_relevance_threshold: float = 0.3,
+        exclude_outdated_triples: bool = False,
+        cascade_dim: Optional[int] = None,
+        cascade_candidates: int = 200,
+        quantized_prefilter: bool = False,
     ) -> List[MemoryItem]:
         """
         Search using Generative Agents (Park et al., 2023) scoring formula.
@@ -461,63 +707,93 @@ class MemoryRepository:
             alpha_importance: Weight for importance score
             recency_decay_factor: Per-hour decay factor (0.995 default)
             min_relevance_threshold: Minimum relevance to include
+            exclude_outdated_triples: Skip items that have semantic triples
+                but no active one (everything they said was superseded)
+            cascade_dim: Shortlist on this many leading embedding dimensions
+                first (Matryoshka embeddings only); None scans full vectors
+            cascade_candidates: Shortlist size scored on the full vector
+                (at most 1000, pgvector's hnsw.ef_search limit)
+            quantized_prefilter: Shortlist by Hamming distance between
+                binary-quantized embeddings (combines with cascade_dim)
             
         Returns:
             List of MemoryItems sorted by combined score (highest first)
         """
+        # Items without triples (bool_or is NULL) are kept
+        triple_filter = (
+            """
+                      AND COALESCE((
+                          SELECT bool_or(t.is_active) FROM semantic_triples t
+                          WHERE t.memory_item_id = mi.id
+                      ), TRUE)"""
+            if exclude_outdated_triples else ""
+        )
+        # Cascade: the shortlist distance matches an index expression of the
+        # schema, so it comes from an index scan over short or quantized
+        # vectors and only cascade_candidates rows are compared in full
+        cascade = ""
+        if cascade_dim or quantized_prefilter:
+            cascade = f"""
+                candidates AS (
+                    SELECT id FROM memory_items
+                    WHERE is_active = TRUE
+                    ORDER BY {self._shortlist_distance(cascade_dim, quantized_prefilter)}
+                    LIMIT {int(cascade_candidates)}
+                ),"""
+        source = "memory_items mi JOIN candidates USING (id)" if cascade else "memory_items mi"
         async with self._pool.acquire() as conn:
-            rows = await conn.fetch(
-                """
-                WITH scored AS (
-                    SELECT 
-                        mi.*,
-                        c.path as category_path,
-                        -- Relevance: Convert cosine distance to similarity
-                        1 - (mi.embedding <=> $1::vector) as relevance,
-                        -- Recency: Exponential decay based on hours since access
-                        -- decay_factor^hours = e^(hours * ln(decay_factor))
-                        POWER($5::float, 
-                            GREATEST(0, EXTRACT(EPOCH FROM (NOW() - mi.last_accessed)) / 3600.0)
-                        ) as recency,
-                        -- Importance: Direct from storage
-                        mi.importance as importance_score
-                    FROM memory_items mi
-                    LEFT JOIN categories c ON mi.category_id = c.id
-                    WHERE mi.is_active = TRUE
-                      AND 1 - (mi.embedding <=> $1::vector) >= $6
+            # An HNSW scan stops after hnsw.ef_search rows (default 40), which
+            # would silently cap the shortlist; raise it for this transaction
+            # (pgvector accepts at most 1000)
+            transaction = conn.transaction() if cascade else nullcontext()
+            async with transaction:
+                if cascade:
+                    await conn.execute(
+                        "SELECT set_config('hnsw.ef_search', $1, true)",
+                        str(min(max(int(cascade_candidates), 40), 1000)),
+                    )
+                rows = await conn.fetch(
+                    f"""
+                    WITH {cascade}
+                    scored AS (
+                        SELECT 
+                            mi.*,
+                            c.path as category_path,
+                            -- Relevance: Convert cosine distance to similarity
+                            1 - (mi.embedding <=> $1::vector) as relevance,
+                            -- Recency: Exponential decay based on hours since access
+                            -- decay_factor^hours = e^(hours * ln(decay_factor))
+                            POWER($5::float, 
+                                GREATEST(0, EXTRACT(EPOCH FROM (NOW() - mi.last_accessed)) / 3600.0)
+                            ) as recency,
+                            -- Importance: Direct from storage
+                            mi.importance as importance_score
+                        FROM {source}
+                        LEFT JOIN categories c ON mi.category_id = c.id
+                        WHERE mi.is_active = TRUE
+                          AND 1 - (mi.embedding <=> $1::vector) >= $6{triple_filter}
+                    )
+                    SELECT *,
+                           -- Combined score using alpha weights
+                           ($2::float * relevance + 
+                            $3::float * recency + 
+                            $4::float * importance_score) as final_score
+                    FROM scored
+                    ORDER BY final_score DESC
+                    LIMIT $7
+                    """,
+                    query_embedding,  # $1
+                    alpha_relevance,       # $2
+                    alpha_recency,         # $3
+                    alpha_importance,      # $4
+                    recency_decay_factor,  # $5
+                    min_relevance_threshold,  # $6
+                    limit,                 # $7
                 )
-                SELECT *,
-                       -- Combined score using alpha weights
-                       ($2::float * relevance + 
-                        $3::float * recency + 
-                        $4::float * importance_score) as final_score
-                FROM scored
-                ORDER BY final_score DESC
-                LIMIT $7
-                """,
-                str(query_embedding),  # $1
-                alpha_relevance,       # $2
-                alpha_recency,         # $3
-                alpha_importance,      # $4
-                recency_decay_factor,  # $5
-                min_relevance_threshold,  # $6
-                limit,                 # $7
-            )
             
             items = []
             for row in rows:
-                item = MemoryItem(
-                    id=row["id"],
-                    content=row["content"],
-                    category_path=row["category_path"] or "",
-                    type=MemoryType(row["type"]),
-                    confidence=row["confidence"],
-                    importance=row["importance"],
-                    mention_count=row.get("mention_count", 1),
-                    source_resource_id=row["resource_id"],
-                    created_at=row["created_at"],
-                    last_accessed=row["last_accessed"],
-                )
+                item = self._row_to_memory_item(row)
                 items.append(item)
                 # Update access timestamp for retrieved items
                 await self.update_last_accessed(row["id"])
@@ -525,6 +801,12 @@ class MemoryRepository:
             return items
 
     
+    def _shortlist_distance(self, cascade_dim: Optional[int], quantized: bool) -> str:
+        """SQL distance between the embedding column and $1 used to pick cascade candidates."""
+        column = shortlist_key("embedding", self.embedding_dim, cascade_dim, quantized)
+        query = shortlist_key("$1::vector", self.embedding_dim, cascade_dim, quantized)
+        return f"{column} {'<~>' if quantized else '<=>'} {query}"
+    
     async def fulltext_search(
         self,
         query: str,
@@ -548,21 +830,7 @@ class MemoryRepository:
                 limit,
             )
             
-            return [
-                MemoryItem(
-                    id=row["id"],
-                    content=row["content"],
-                    category_path=row["category_path"] or "",
-                    type=MemoryType(row["type"]),
-                    confidence=row["confidence"],
-                    importance=row["importance"],
-                    mention_count=row.get("mention_count", 1),
-                    source_resource_id=row["resource_id"],
-                    created_at=row["created_at"],
-                    last_accessed=row["last_accessed"],
-                )
-                for row in rows
-            ]
+            return [self._row_to_memory_item(row) for row in rows]
     
     async def get_items_by_category(
         self,
@@ -585,21 +853,44 @@ class MemoryRepository:
                 limit,
             )
             
-            return [
-                MemoryItem(
-                    id=row["id"],
-                    content=row["content"],
-                    category_path=row["category_path"] or "",
-                    type=MemoryType(row["type"]),
-                    confidence=row["confidence"],
-                    importance=row["importance"],
-                    mention_count=row.get("mention_count", 1),
-                    source_resource_id=row["resource_id"],
-                    created_at=row["created_at"],
-                    last_accessed=row["last_accessed"],
-                )
-                for row in rows
-            ]
+            return [self._row_to_memory_item(row) for row in rows]
+    
+    async def get_items_for_categories(
+        self,
+        category_paths: List[str],
+        per_category_limit: int = 3,
+    ) -> List[MemoryItem]:
+        """
+        Top items of several categories in one query.
+        
+        Same selection as get_items_by_category() for each path, grouped in
+        the order the paths were given. An item under more than one of the
+        paths is returned once per path.
+        """
+        if not category_paths:
+            return []
+        
+        async with self._pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT * FROM (
+                    SELECT mi.*, c.path as category_path, p.ord,
+                           ROW_NUMBER() OVER (
+                               PARTITION BY p.ord
+                               ORDER BY mi.importance DESC, mi.last_accessed DESC
+                           ) as rank
+                    FROM unnest($1::text[]) WITH ORDINALITY AS p(path, ord)
+                    JOIN categories c ON c.path = p.path OR c.path LIKE p.path || '/%'
+                    JOIN memory_items mi ON mi.category_id = c.id
+                ) ranked
+                WHERE rank <= $2
+                ORDER BY ord, rank
+                """,
+                category_paths,
+                per_category_limit,
+            )
+            
+            return [self._row_to_memory_item(row) for row in rows]
     
     async def get_stale_items(
         self,
@@ -621,21 +912,7 @@ class MemoryRepository:
                 limit,
             )
             
-            return [
-                MemoryItem(
-                    id=row["id"],
-                    content=row["content"],
-                    category_path=row["category_path"] or "",
-                    type=MemoryType(row["type"]),
-                    confidence=row["confidence"],
-                    importance=row["importance"],
-                    mention_count=row.get("mention_count", 1),
-                    source_resource_id=row["resource_id"],
-                    created_at=row["created_at"],
-                    last_accessed=row["last_accessed"],
-                )
-                for row in rows
-            ]
+            return [self._row_to_memory_item(row) for row in rows]
     
     async def delete_memory_item(self, item_id: UUID) -> None:
         """Delete a memory item."""
@@ -659,21 +936,7 @@ class MemoryRepository:
                 limit,
             )
             
-            return [
-                MemoryItem(
-                    id=row["id"],
-                    content=row["content"],
-                    category_path=row["category_path"] or "",
-                    type=MemoryType(row["type"]),
-                    confidence=row["confidence"],
-                    importance=row["importance"],
-                    mention_count=row.get("mention_count", 1),
-                    source_resource_id=row["resource_id"],
-                    created_at=row["created_at"],
-                    last_accessed=row["last_accessed"],
-                )
-                for row in rows
-            ]
+            return [self._row_to_memory_item(row) for row in rows]
 
     async def get_memories_since(
         self,
@@ -706,21 +969,7 @@ class MemoryRepository:
                 limit,
             )
             
-            return [
-                MemoryItem(
-                    id=row["id"],
-                    content=row["content"],
-                    category_path=row["category_path"] or "",
-                    type=MemoryType(row["type"]),
-                    confidence=row["confidence"],
-                    importance=row["importance"],
-                    mention_count=row.get("mention_count", 1),
-                    source_resource_id=row["resource_id"],
-                    created_at=row["created_at"],
-                    last_accessed=row["last_accessed"],
-                )
-                for row in rows
-            ]
+            return [self._row_to_memory_item(row) for row in rows]
 
     async def get_reflections_by_type(
         self,
@@ -755,21 +1004,7 @@ class MemoryRepository:
                 limit,
             )
             
-            return [
-                MemoryItem(
-                    id=row["id"],
-                    content=row["content"],
-                    category_path=row["category_path"] or "",
-                    type=MemoryType(row["type"]),
-                    confidence=row["confidence"],
-                    importance=row["importance"],
-                    mention_count=row.get("mention_count", 1),
-                    source_resource_id=row["resource_id"],
-                    created_at=row["created_at"],
-                    last_accessed=row["last_accessed"],
-                )
-                for row in rows
-            ]
+            return [self._row_to_memory_item(row) for row in rows]
 
     async def list_items(
         self,
@@ -792,21 +1027,7 @@ class MemoryRepository:
                 offset,
             )
             
-            return [
-                MemoryItem(
-                    id=row["id"],
-                    content=row["content"],
-                    category_path=row["category_path"] or "",
-                    type=MemoryType(row["type"]),
-                    confidence=row["confidence"],
-                    importance=row["importance"],
-                    source_resource_id=row["resource_id"],
-                    created_at=row["created_at"],
-                    last_accessed=row["last_accessed"],
-                    is_active=row.get("is_active", True),
-                )
-                for row in rows
-            ]
+            return [self._row_to_memory_item(row) for row in rows]
 
     async def count_items(self) -> int:
         """Get total number of memory items."""
@@ -999,8 +1220,8 @@ class MemoryRepository:
     async def create_triple(
         self,
         triple: SemanticTriple,
-        subject_embedding: Optional[List[float]] = None,
-        object_embedding: Optional[List[float]] = None,
+        subject_embedding: Optional[Vector] = None,
+        object_embedding: Optional[Vector] = None,
     ) -> SemanticTriple:
         """
         Create a new semantic triple.
@@ -1031,8 +1252,8 @@ class MemoryRepository:
                 triple.importance,
                 triple.confidence,
                 triple.is_active,
-                str(subject_embedding) if subject_embedding else None,
-                str(object_embedding) if object_embedding else None,
+                subject_embedding if subject_embedding else None,
+                object_embedding if object_embedding else None,
                 triple.created_at,
                 triple.last_accessed,
             )
@@ -1084,7 +1305,7 @@ class MemoryRepository:
 
     async def search_triples_semantic(
         self,
-        query_embedding: List[float],
+        query_embedding: Vector,
         limit: int = 10,
         threshold: float = 0.5,
         active_only: bool = True,
@@ -1115,7 +1336,7 @@ class MemoryRepository:
                 ORDER BY similarity DESC
                 LIMIT $3
                 """,
-                str(query_embedding),
+                query_embedding,
                 threshold,
                 limit,
             )
@@ -1148,21 +1369,7 @@ class MemoryRepository:
         normalized_pred = normalize_predicate(predicate)
         where_active = "AND is_active = TRUE" if active_only else ""
         
-        # Opposite predicate pairs
-        opposite_map = {
-            "likes": "dislikes",
-            "dislikes": "likes",
-            "loves": "hates",
-            "hates": "loves",
-            "wants": "avoids",
-            "avoids": "wants",
-            "is": "is_not",
-            "is_not": "is",
-            "can": "cannot",
-            "cannot": "can",
-        }
-        
-        opposite_pred = opposite_map.get(normalized_pred)
+        opposite_pred = OPPOSITE_PREDICATES.get(normalized_pred)
         
         async with self._pool.acquire() as conn:
             # Case 1: Same subject + predicate (different object will be filtered by caller)
@@ -1297,9 +1504,42 @@ class MemoryRepository:
                 f"SELECT COUNT(*) FROM semantic_triples {where_active}"
             )
 
+    def _row_to_memory_item(self, row, confidence: Optional[float] = None) -> MemoryItem:
+        """
+        Convert a memory_items row (joined with its category path) to a MemoryItem.
+        
+        Rows come from our own schema, so validation is skipped; type stays
+        the raw enum value, matching use_enum_values.
+        """
+        return MemoryItem.from_trusted(
+            id=row["id"],
+            content=row["content"],
+            category_path=row["category_path"] or "",
+            type=row["type"],
+            confidence=row["confidence"] if confidence is None else confidence,
+            importance=row["importance"],
+            mention_count=row.get("mention_count", 1),
+            source_resource_id=row["resource_id"],
+            created_at=row["created_at"],
+            last_accessed=row["last_accessed"],
+            is_active=row.get("is_active", True),
+        )
+
+    def _row_to_category(self, row) -> Category:
+        """Convert a categories row to a Category."""
+        return Category.from_trusted(
+            id=row["id"],
+            name=row["name"],
+            description=row["description"],
+            parent_id=row["parent_id"],
+            summary=row["summary"],
+            path=row["path"],
+            last_accessed=row["last_accessed"],
+        )
+
     def _row_to_triple(self, row) -> SemanticTriple:
         """Convert database row to SemanticTriple object."""
-        return SemanticTriple(
+        return SemanticTriple.from_trusted(
             id=row["id"],
             memory_item_id=row["memory_item_id"],
             subject=row["subject"],
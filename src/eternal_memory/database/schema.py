@@ -5,8 +5,26 @@ Defines and creates the PostgreSQL schema with pgvector extension
 as specified in eternal_memory_spec.md Section 3.
 """
 
+from typing import Optional
+
 import asyncpg
 
+
+def shortlist_key(operand: str, embedding_dim: int, cascade_dim: Optional[int], quantized: bool) -> str:
+    """
+    SQL expression a cascade search shortlists on, for a vector operand.
+    
+    Used for both the index and the query side, which must match exactly
+    for the planner to use the index.
+    """
+    dim = int(cascade_dim) if cascade_dim else int(embedding_dim)
+    if cascade_dim:
+        operand = f"subvector({operand}, 1, {dim})"
+    if quantized:
+        return f"binary_quantize({operand})::bit({dim})"
+    return f"{operand}::vector({dim})"
+
+
 # SQL Schema as defined in the specification
 SCHEMA_SQL = """
 -- Enable vector extension
@@ -48,6 +66,7 @@ CREATE TABLE IF NOT EXISTS memory_items (
     mention_count INTEGER DEFAULT 1,            -- Reinforcement counter
     is_active BOOLEAN DEFAULT TRUE,             -- Soft delete for superseded memories
     superseded_by UUID REFERENCES memory_items(id),  -- MemGPT-style replacement tracking
+    content_hash TEXT,                          -- SHA-256 of normalized content (exact dedup)
     created_at TIMESTAMPTZ DEFAULT NOW(),
     last_accessed TIMESTAMPTZ DEFAULT NOW()
 );
@@ -168,6 +187,12 @@ class DatabaseSchema:
                 # MemGPT-style supersede columns
                 await conn.execute("ALTER TABLE memory_items ADD COLUMN IF NOT EXISTS is_active BOOLEAN DEFAULT TRUE")
                 await conn.execute("ALTER TABLE memory_items ADD COLUMN IF NOT EXISTS superseded_by UUID REFERENCES memory_items(id)")
+                # Exact-duplicate lookup (rows stored before this column have
+                # no hash and are only found by vector search)
+                await conn.execute("ALTER TABLE memory_items ADD COLUMN IF NOT EXISTS content_hash TEXT")
+                await conn.execute(
+                    "CREATE INDEX IF NOT EXISTS idx_memory_content_hash ON memory_items (content_hash)"
+                )
             except Exception:
                 # Fallback for older Postgres versions or if column exists and IF NOT EXISTS is not supported
                 pass
@@ -176,6 +201,38 @@ class DatabaseSchema:
         
         self._initialized = True
     
+    async def create_cascade_index(
+        self,
+        cascade_dim: Optional[int],
+        quantized: bool = False,
+        embedding_dim: int = 1536,
+    ) -> None:
+        """
+        Create the index cascade search shortlists from.
+        
+        Only call this with ScoringConfig.cascade_dim or
+        use_quantized_prefilter set: like any vector index it is updated on
+        every memory write. Needs pgvector 0.7+ (subvector(),
+        binary_quantize()); on older versions this raises, as cascade
+        searches would fail as well.
+        
+        Args:
+            cascade_dim: Leading dimensions shortlisted on (None = all)
+            quantized: Index binary-quantized vectors (Hamming distance)
+            embedding_dim: Dimensions of the stored embeddings
+        """
+        key = shortlist_key("embedding", embedding_dim, cascade_dim, quantized)
+        dim = int(cascade_dim) if cascade_dim else int(embedding_dim)
+        name = f"idx_memory_embedding_{'bits' if quantized else 'prefix'}_{dim}"
+        ops = "bit_hamming_ops" if quantized else "vector_cosine_ops"
+        conn = await asyncpg.connect(self.connection_string)
+        try:
+            await conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {name} ON memory_items USING hnsw (({key}) {ops})"
+            )
+        finally:
+            await conn.close()
+    
     async def drop_all(self) -> None:
         """
         Drop all tables. USE WITH CAUTION - this destroys all data.
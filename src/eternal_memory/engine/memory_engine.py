@@ -17,6 +17,7 @@ from eternal_memory.database.repository import MemoryRepository
 from eternal_memory.database.schema import DatabaseSchema
 from eternal_memory.engine.base import EternalMemoryEngine
 from eternal_memory.llm.client import LLMClient
+from eternal_memory.llm.response_cache import LLMResponseCache
 from eternal_memory.models.memory_item import Category, MemoryItem
 from eternal_memory.models.retrieval import RetrievalResult
 from eternal_memory.models.retrieval import RetrievalResult
@@ -74,13 +75,17 @@ class EternalMemorySystem(EternalMemoryEngine):
         
         # Initialize components
         self.schema = DatabaseSchema(self.config.database.connection_string)
-        self.repository = MemoryRepository(self.config.database.connection_string)
+        self.repository = MemoryRepository(
+            self.config.database.connection_string,
+            embedding_dim=self.config.embedding.dimension,
+        )
         self.vault = MarkdownVault(vault_path)
         self.llm = LLMClient(
             api_key=self.config.llm.api_key,
             base_url=self.config.llm.base_url,
             model=self.config.llm.model,
             usage_callback=self.repository.record_token_usage,
+            cache_path=self.config.embedding.cache_path,
         )
         
         # Initialize pipelines
@@ -123,6 +128,13 @@ class EternalMemorySystem(EternalMemoryEngine):
         
         # Initialize database schema
         await self.schema.initialize()
+        scoring = self.config.scoring
+        if scoring.cascade_dim or scoring.use_quantized_prefilter:
+            await self.schema.create_cascade_index(
+                scoring.cascade_dim,
+                quantized=scoring.use_quantized_prefilter,
+                embedding_dim=self.config.embedding.dimension,
+            )
         
         # Connect to database
         await self.repository.connect()
@@ -176,6 +188,7 @@ class EternalMemorySystem(EternalMemoryEngine):
             repository=self.repository,
             llm_client=self.llm,
             vault=self.vault,
+            scoring_config=self.config.scoring,
             llm_config=self.config.llm,  # Enable hierarchical filtering if use_semantic_triples is enabled
         )
         
@@ -199,6 +212,9 @@ class EternalMemorySystem(EternalMemoryEngine):
             vault=self.vault,
             memorize_pipeline=self._memorize_pipeline,
             user_model=self.user_model,  # Enable immediate user insight capture
+            response_cache=self._create_flush_response_cache(),
+            dedup_ttl_seconds=self.config.buffer.flush_dedup_ttl_seconds,
+            stream_extraction=self.config.buffer.flush_stream_extraction,
         )
         
         # Register standard cron jobs
@@ -274,6 +290,12 @@ class EternalMemorySystem(EternalMemoryEngine):
         
         self._initialized = True
     
+    def _create_flush_response_cache(self) -> Optional[LLMResponseCache]:
+        """Build the flush pipeline's (exact-match) LLM response cache from buffer config."""
+        if not self.config.buffer.flush_response_cache:
+            return None
+        return LLMResponseCache()
+    
     async def close(self) -> None:
         """Close all connections and cleanup with graceful buffer flush."""
         # Flush remaining buffer before shutdown (only if fully initialized)
@@ -283,6 +305,14 @@ class EternalMemorySystem(EternalMemoryEngine):
         
         if self.scheduler:
             await self.scheduler.stop()
+        
+        # Let background token-usage writes land before the pool goes away
+        await self.llm.flush_usage_reports()
+        
+        # Write out buffered performance metrics
+        monitor = getattr(self._memorize_pipeline, "monitor", None)
+        if monitor is not None:
+            monitor.flush()
             
         if self.repository:
             await self.repository.disconnect()
@@ -367,6 +397,7 @@ class EternalMemorySystem(EternalMemoryEngine):
             await self.initialize()
         
         items = await self._memorize_pipeline.execute(text, metadata)
+        self._retrieve_pipeline.clear_result_cache()
         
         # Return the first item, or create a placeholder if none extracted
         if items:
@@ -389,11 +420,13 @@ class EternalMemorySystem(EternalMemoryEngine):
         if not self._initialized:
             await self.initialize()
             
-        return await self._memorize_pipeline.store_single_memory(
+        item = await self._memorize_pipeline.store_single_memory(
             content=content,
             metadata=metadata,
             importance=importance,
         )
+        self._retrieve_pipeline.clear_result_cache()
+        return item
     
     async def retrieve(
         self,
@@ -488,6 +521,7 @@ class EternalMemorySystem(EternalMemoryEngine):
             await self.initialize()
         
         await self._consolidate_pipeline.execute()
+        self._retrieve_pipeline.clear_result_cache()
     
     async def predict_context(
         self,
@@ -557,6 +591,7 @@ class EternalMemorySystem(EternalMemoryEngine):
         
         # Execute flush pipeline
         items = await self._flush_pipeline.execute(self.conversation_buffer)
+        self._retrieve_pipeline.clear_result_cache()
         
         # Clear memory buffer after successful flush
         self.conversation_buffer = []
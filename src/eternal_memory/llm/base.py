@@ -5,8 +5,15 @@ This module defines abstract interfaces that allow supporting
 multiple LLM providers (OpenAI, Gemini, etc.) through the adapter pattern.
 """
 
+import asyncio
+import logging
+import random
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Awaitable, Callable, List, Optional, Sequence, TypeVar
+
+logger = logging.getLogger("eternal_memory.llm")
+
+T = TypeVar("T")
 
 
 class EmbeddingProvider(ABC):
@@ -17,8 +24,18 @@ class EmbeddingProvider(ABC):
     for efficient API usage.
     """
     
+    # Transient failures worth retrying (rate limit + server errors)
+    RETRYABLE_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+    
+    # Backoff: min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2**attempt) + jitter,
+    # never shorter than a Retry-After sent by the server
+    RETRY_MAX_ATTEMPTS = 5
+    RETRY_BASE_DELAY = 0.5
+    RETRY_MAX_DELAY = 30.0
+    RETRY_JITTER = 0.5
+    
     @abstractmethod
-    async def batch_embed(self, texts: List[str]) -> List[List[float]]:
+    async def batch_embed(self, texts: List[str]) -> List[Sequence[float]]:
         """
         Generate embeddings for multiple texts in a single API call.
         
@@ -26,7 +43,8 @@ class EmbeddingProvider(ABC):
             texts: List of text strings to embed
             
         Returns:
-            List of embedding vectors in the same order as input texts
+            List of embedding vectors in the same order as input texts.
+            Built-in providers return packed float32 rows (array('f')).
             
         Raises:
             EmbeddingError: If the embedding API fails
@@ -52,6 +70,83 @@ class EmbeddingProvider(ABC):
             Model name string
         """
         pass
+    
+    async def aclose(self) -> None:
+        """Release network resources held by the provider (optional)."""
+        pass
+    
+    async def _with_retry(
+        self,
+        request: Callable[[], Awaitable[T]],
+        max_retries: Optional[int] = None,
+    ) -> T:
+        """
+        Run an API request, retrying transient failures with backoff.
+        
+        Only errors carrying a retryable HTTP status (429/5xx) are retried;
+        anything else propagates immediately. Jitter spreads out concurrent
+        sub-batches so they don't retry in lockstep.
+        
+        Args:
+            request: Zero-argument factory returning a fresh awaitable per attempt
+            max_retries: Override for RETRY_MAX_ATTEMPTS
+        """
+        if max_retries is None:
+            max_retries = self.RETRY_MAX_ATTEMPTS
+        
+        attempt = 0
+        while True:
+            try:
+                return await request()
+            except Exception as e:
+                status = _error_status(e)
+                if status not in self.RETRYABLE_STATUS_CODES or attempt >= max_retries:
+                    raise
+                
+                delay = min(self.RETRY_MAX_DELAY, self.RETRY_BASE_DELAY * 2 ** attempt)
+                delay += random.uniform(0, self.RETRY_JITTER)
+                retry_after = _retry_after(e)
+                if retry_after is not None:
+                    delay = max(delay, retry_after)
+                
+                attempt += 1
+                logger.warning(
+                    f"{type(self).__name__}: HTTP {status}, "
+                    f"retry {attempt}/{max_retries} in {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+
+
+def _error_status(error: Exception) -> Optional[int]:
+    """
+    Extract an HTTP status code from SDK exceptions.
+    
+    Covers openai.APIStatusError (status_code), httpx.HTTPStatusError
+    (response.status_code) and google.api_core errors (code).
+    """
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is None:
+        status = getattr(error, "code", None)
+    return int(status) if isinstance(status, int) else None
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """Read a Retry-After hint (seconds) from an exception, if present."""
+    value: Any = getattr(error, "retry_after", None)
+    if value is None:
+        headers = getattr(getattr(error, "response", None), "headers", None)
+        if headers is not None:
+            try:
+                value = headers.get("retry-after")
+            except Exception:
+                value = None
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        # HTTP-date form is not worth parsing here; fall back to backoff
+        return None
 
 
 class EmbeddingError(Exception):
@@ -9,16 +9,46 @@ Handles all LLM interactions including:
 - Summarization
 """
 
+import asyncio
+import inspect
 import json
+import logging
 import os
-from typing import List, Optional, Callable, Any
+from typing import Any, AsyncIterator, Callable, List, Optional
 
 from openai import AsyncOpenAI
+from pydantic import ValidationError
 
 from eternal_memory.models.memory_item import MemoryType
 from eternal_memory.llm.base import EmbeddingProvider
+from eternal_memory.llm.disk_cache import SQLiteEmbeddingStore
+from eternal_memory.llm.embed_cache import EmbeddingCache, as_float_list
+from eternal_memory.llm.schemas import DailyReflection, MonthlySummary, WeeklySummary
 from eternal_memory.llm.openai_provider import OpenAIEmbeddingProvider
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+logger = logging.getLogger("eternal_memory.llm")
+
+
+def _json_loads(data: str) -> Any:
+    """Parse a JSON document, preferring orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps_pretty(obj: Any) -> str:
+    """Serialize to indented, non-ASCII-escaped JSON for prompt embedding."""
+    if orjson is not None:
+        return orjson.dumps(
+            obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+        ).decode()
+    return json.dumps(obj, ensure_ascii=False, indent=2)
+
 
 class LLMClient:
     """
@@ -28,6 +58,55 @@ class LLMClient:
     the adapter pattern.
     """
     
+    # _parse_importance(): "0".."99" -> score clamped to 1-10, normalized to 0.1-1.0
+    _IMPORTANCE_LUT = {str(i): max(1, min(10, i)) / 10.0 for i in range(100)}
+    
+    # Request parameters per call type, built once and splatted into every
+    # chat request so sampling profiles are tunable in one place (read-only).
+    _CHAT_PARAMS = {
+        "extract": {"temperature": 0.3, "response_format": {"type": "json_object"}},
+        # Cut off any explanation after the rewritten query
+        "evolve_query": {"temperature": 0.3, "max_tokens": 64, "stop": ["\n\n"]},
+        "reason": {"temperature": 0.5},
+        "summarize": {"temperature": 0.3},
+        "predict": {"temperature": 0.4},
+        "categorize": {"temperature": 0.2, "max_tokens": 64},
+        # Low temperature for consistent ratings
+        "importance": {"temperature": 0.1, "max_tokens": 5},
+        "importance_batch": {"temperature": 0.1},
+        "relationship": {"temperature": 0.0, "max_tokens": 10},  # Deterministic
+        "triples": {"temperature": 0.0, "max_tokens": 500},  # Deterministic
+        "reflection": {"temperature": 0.4, "response_format": {"type": "json_object"}},
+    }
+    
+    # Prompt budgets (estimated tokens) for the items of reflection prompts
+    DAILY_REFLECTION_TOKEN_BUDGET = 6000
+    WEEKLY_SUMMARY_TOKEN_BUDGET = 8000
+    MONTHLY_SUMMARY_TOKEN_BUDGET = 8000
+    REASON_CONTEXT_TOKEN_BUDGET = 4000
+    
+    # Longer context items are cut in reason_from_context() (characters)
+    REASON_ITEM_MAX_CHARS = 1000
+    
+    # Static instructions of the hot-path prompts. They are sent as the
+    # system message ahead of the per-call input, so every request shares
+    # an identical prefix that the provider can serve from its prompt cache.
+    _EVOLVE_QUERY_SYSTEM = """You are helping to clarify a user's memory retrieval query.
+
+If the query is already specific enough, return it as-is.
+If the query is vague or uses pronouns/references that need context, rewrite it to be more specific.
+
+Return ONLY the clarified query, nothing else."""
+    
+    _REASON_SYSTEM = """Answer the user's query based on the memory context they provide.
+
+Provide a helpful answer based on the memories given. If the information is insufficient, say so."""
+    
+    _PREDICT_SYSTEM = """Based on the current context and past behavioral patterns, predict what the user might need next.
+
+Generate a brief context string (1-2 sentences) that could be helpful for proactively assisting the user.
+Focus on actionable predictions, not just observations."""
+    
     def __init__(
         self,
         api_key: Optional[str] = None,
@@ -38,37 +117,59 @@ class LLMClient:
         max_cache_size: int = 1000,
         embedding_provider: str = "openai",
         embedding_api_key: Optional[str] = None,
+        cache_path: Optional[str] = None,
+        disk_cache_max: int = 100_000,
+        max_concurrency: int = 16,
+        http_client: Optional[Any] = None,
     ):
         self.model = model
         self.usage_callback = usage_callback
+        self._usage_tasks: set[asyncio.Task] = set()  # in-flight usage reports
+        # A caller-supplied http_client (e.g. an httpx.AsyncClient with tuned
+        # keep-alive limits) is shared by all chat requests of this client.
+        # The caller keeps ownership of it: aclose() leaves it open.
+        self._owns_http_client = http_client is None
         self.client = AsyncOpenAI(
             api_key=api_key or os.getenv("OPENAI_API_KEY"),
             base_url=base_url,
+            http_client=http_client,
         )
         
+        # App-level cap on concurrent chat requests; bursts beyond this queue
+        # locally instead of tripping provider rate limits (429 + backoff).
+        self.max_concurrency = max_concurrency
+        self._request_semaphore = asyncio.Semaphore(max_concurrency)
+        
         # Initialize embedding provider
         self.embedding_provider_name = embedding_provider
         self._embedding_provider = self._create_embedding_provider(
             embedding_provider,
             embedding_api_key or api_key,
             base_url,
+            # Same credentials: embeddings share the chat client's connection pool
+            shared_client=self.client if embedding_api_key in (None, api_key) else None,
+            http_client=http_client,
         )
         
-        # Embedding cache (LRU)
+        # Embedding cache (LRU, optionally backed by a persistent SQLite tier)
         self.enable_embedding_cache = enable_embedding_cache
         self.max_cache_size = max_cache_size
-        self._embedding_cache: dict[str, List[float]] = {}
-        self._cache_order: list[str] = []  # For LRU tracking
-        
-        # Cache statistics
-        self._cache_hits = 0
-        self._cache_misses = 0
+        disk_store = None
+        if enable_embedding_cache and cache_path:
+            disk_store = SQLiteEmbeddingStore(cache_path, max_entries=disk_cache_max)
+        self._embedding_cache = EmbeddingCache(
+            self._embedding_provider.get_model_name(),
+            max_size=max_cache_size,
+            disk_store=disk_store,
+        )
     
     def _create_embedding_provider(
         self,
         provider: str,
         api_key: Optional[str],
         base_url: Optional[str],
+        shared_client: Optional[AsyncOpenAI] = None,
+        http_client: Optional[Any] = None,
     ) -> EmbeddingProvider:
         """
         Factory method to create the appropriate embedding provider.
@@ -77,6 +178,8 @@ class LLMClient:
             provider: Provider name ("openai" or "gemini")
             api_key: API key for the provider
             base_url: Base URL for OpenAI-compatible APIs
+            shared_client: AsyncOpenAI client to reuse for OpenAI embeddings
+            http_client: Caller's HTTP client for an unshared OpenAI client
             
         Returns:
             EmbeddingProvider instance
@@ -85,6 +188,8 @@ class LLMClient:
             return OpenAIEmbeddingProvider(
                 api_key=api_key or os.getenv("OPENAI_API_KEY"),
                 base_url=base_url,
+                client=shared_client,
+                http_client=http_client,
             )
         elif provider == "gemini":
             from eternal_memory.llm.gemini_provider import GeminiEmbeddingProvider
@@ -97,15 +202,53 @@ class LLMClient:
                 f"Supported providers: openai, gemini"
             )
     
-    async def _report_usage(self, response: Any, model_override: str = None):
-        """Helper to report token usage via callback."""
+    def _report_usage(self, response: Any, model_override: str = None) -> None:
+        """
+        Helper to report token usage via callback.
+        
+        Async callbacks (e.g. database writes) are scheduled as background
+        tasks so token accounting never delays the caller.
+        """
         if self.usage_callback and hasattr(response, "usage") and response.usage:
-            await self.usage_callback(
+            result = self.usage_callback(
                 model_override or self.model,
                 response.usage.prompt_tokens,
                 getattr(response.usage, "completion_tokens", 0),
                 response.usage.total_tokens
             )
+            if inspect.isawaitable(result):
+                task = asyncio.ensure_future(result)
+                self._usage_tasks.add(task)
+                task.add_done_callback(self._on_usage_reported)
+    
+    def _on_usage_reported(self, task: asyncio.Task) -> None:
+        """Drop a finished usage task and surface its failure, if any."""
+        self._usage_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Token usage callback failed", exc_info=task.exception())
+    
+    async def flush_usage_reports(self) -> None:
+        """Wait for all pending usage reports (call before shutdown)."""
+        if self._usage_tasks:
+            await asyncio.gather(*list(self._usage_tasks), return_exceptions=True)
+
+    async def _chat_completion(self, **kwargs) -> Any:
+        """Create a chat completion, bounded by the concurrency semaphore."""
+        async with self._request_semaphore:
+            return await self.client.chat.completions.create(**kwargs)
+    
+    async def aclose(self) -> None:
+        """
+        Flush pending usage reports and release network/disk resources.
+        
+        AsyncOpenAI.close() closes its HTTP client, so it is only called
+        when that client was created here, not passed in as http_client.
+        """
+        await self.flush_usage_reports()
+        await self._embedding_provider.aclose()
+        if self._owns_http_client:
+            await self.client.close()
+        self._embedding_cache.close()
 
     async def extract_facts(
         self,
@@ -117,7 +260,86 @@ class LLMClient:
         
         Returns list of facts with category assignments.
         """
-        prompt = f"""Analyze the following input and extract independent memory items.
+        response = await self._chat_completion(
+            model=self.model,
+            messages=[{"role": "user", "content": self._extract_facts_prompt(text, existing_categories)}],
+            **self._CHAT_PARAMS["extract"],
+        )
+        self._report_usage(response)
+        
+        try:
+            return self._facts_from_result(_json_loads(response.choices[0].message.content))
+        except (json.JSONDecodeError, IndexError):
+            return []
+    
+    async def stream_extract_facts(
+        self,
+        text: str,
+        existing_categories: List[str],
+    ) -> AsyncIterator[dict]:
+        """
+        Extract salient facts from input text, yielding each as it completes.
+        
+        Same prompt and result as extract_facts(), but the response is
+        streamed and every fact object of the facts array is yielded as
+        soon as its closing brace arrives, so callers can start on early
+        facts while later ones are still being generated. Replies that
+        are not a list of objects are parsed once the stream ends.
+        """
+        decoder = json.JSONDecoder()
+        buffer = ""
+        pos = None  # Where the next fact object may start
+        incremental = True
+        yielded = False
+        
+        async with self._request_semaphore:
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": self._extract_facts_prompt(text, existing_categories)}],
+                stream=True,
+                stream_options={"include_usage": True},
+                **self._CHAT_PARAMS["extract"],
+            )
+            async for chunk in stream:
+                # Usage arrives on a final chunk with no choices
+                self._report_usage(chunk)
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                buffer += chunk.choices[0].delta.content
+                
+                while incremental:
+                    if pos is None:
+                        start = buffer.find("[")
+                        if start < 0:
+                            break
+                        pos = start + 1
+                    while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                        pos += 1
+                    if pos == len(buffer):
+                        break
+                    if buffer[pos] != "{":
+                        # End of the array, or not an array of objects
+                        incremental = False
+                        break
+                    try:
+                        fact, pos = decoder.raw_decode(buffer, pos)
+                    except json.JSONDecodeError:
+                        break  # Object still incomplete
+                    yielded = True
+                    yield fact
+        
+        if not yielded:
+            try:
+                facts = self._facts_from_result(_json_loads(buffer))
+            except json.JSONDecodeError:
+                return
+            for fact in facts:
+                yield fact
+    
+    @staticmethod
+    def _extract_facts_prompt(text: str, existing_categories: List[str]) -> str:
+        """Prompt shared by extract_facts() and stream_extract_facts()."""
+        return f"""Analyze the following input and extract independent memory items.
 Focus on FACTS, PREFERENCES, EVENTS, and GOALS.
 Ignore trivial chit-chat.
 
@@ -142,34 +364,25 @@ Rules:
 - Return empty array [] if no meaningful facts found
 
 Return ONLY valid JSON array, no other text."""
-
-        response = await self.client.chat.completions.create(
-            model=self.model,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3,
-            response_format={"type": "json_object"},
-        )
-        await self._report_usage(response)
-        
-        try:
-            result = json.loads(response.choices[0].message.content)
-            # Handle multiple response formats:
-            # 1. {"facts": [...]} or {"items": [...]} - wrapper object
-            # 2. [...] - direct array
-            # 3. {"content": "...", "type": "...", ...} - single fact object
-            if isinstance(result, dict):
-                if "facts" in result:
-                    return result["facts"]
-                elif "items" in result:
-                    return result["items"]
-                elif "content" in result:
-                    # Single fact object, wrap in array
-                    return [result]
-                else:
-                    return []
-            return result if isinstance(result, list) else []
-        except (json.JSONDecodeError, IndexError):
-            return []
+    
+    @staticmethod
+    def _facts_from_result(result: Any) -> List[dict]:
+        """Fact list from a parsed extraction reply."""
+        # Handle multiple response formats:
+        # 1. {"facts": [...]} or {"items": [...]} - wrapper object
+        # 2. [...] - direct array
+        # 3. {"content": "...", "type": "...", ...} - single fact object
+        if isinstance(result, dict):
+            if "facts" in result:
+                return result["facts"]
+            elif "items" in result:
+                return result["items"]
+            elif "content" in result:
+                # Single fact object, wrap in array
+                return [result]
+            else:
+                return []
+        return result if isinstance(result, list) else []
     
     async def evolve_query(
         self,
@@ -181,23 +394,17 @@ Return ONLY valid JSON array, no other text."""
         
         e.g., "그때 거기 어디였지?" → "지난달 출장 갔을 때 묵었던 호텔 이름은?"
         """
-        prompt = f"""You are helping to clarify a user's memory retrieval query.
-        
-Conversation context: {conversation_context or "None"}
+        prompt = f"""Conversation context: {conversation_context or "None"}
 
 User query: "{query}"
+"""
 
-If the query is already specific enough, return it as-is.
-If the query is vague or uses pronouns/references that need context, rewrite it to be more specific.
-
-Return ONLY the clarified query, nothing else."""
-
-        response = await self.client.chat.completions.create(
+        response = await self._chat_completion(
             model=self.model,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.3,
+            messages=self._messages(self._EVOLVE_QUERY_SYSTEM, prompt),
+            **self._CHAT_PARAMS["evolve_query"],
         )
-        await self._report_usage(response)
+        self._report_usage(response)
         
         return response.choices[0].message.content.strip()
     
@@ -205,15 +412,19 @@ Return ONLY the clarified query, nothing else."""
         """
         Generate embedding vector for text with caching.
         
-        Internally uses batch_generate_embeddings for consistency.
-        This ensures all embedding calls benefit from batch optimization.
+        Single-text fast path of batch_generate_embeddings(): same cache
+        tiers and statistics, without the per-batch bookkeeping.
         
         Uses the configured embedding provider (OpenAI or Gemini).
         Caches results to reduce API calls.
         """
-        # Use batch embedding with single item for consistency
-        embeddings = await self.batch_generate_embeddings([text])
-        return embeddings[0]
+        if not self.enable_embedding_cache:
+            self._embedding_cache.misses += 1
+            return as_float_list((await self._embedding_provider.batch_embed([text]))[0])
+        
+        return await self._embedding_cache.embed_one(
+            text, self._embedding_provider.batch_embed
+        )
     
     async def batch_generate_embeddings(self, texts: List[str]) -> List[List[float]]:
         """
@@ -241,110 +452,67 @@ Return ONLY the clarified query, nothing else."""
         if not texts:
             return []
         
-        # Check which texts need embedding (not in cache)
-        uncached_texts = []
-        uncached_indices = []
-        result_embeddings = [None] * len(texts)
+        if not self.enable_embedding_cache:
+            self._embedding_cache.misses += len(texts)
+            embeddings = await self._embedding_provider.batch_embed(texts)
+            return [as_float_list(embedding) for embedding in embeddings]
         
-        for i, text in enumerate(texts):
-            if self.enable_embedding_cache and text in self._embedding_cache:
-                self._cache_hits += 1
-                self._touch_cache(text)
-                result_embeddings[i] = self._embedding_cache[text]
-            else:
-                uncached_texts.append(text)
-                uncached_indices.append(i)
-        
-        # If all texts were cached, return early
-        if not uncached_texts:
-            return result_embeddings
-        
-        # Batch API call for uncached texts using provider adapter
-        self._cache_misses += len(uncached_texts)
-        embeddings_from_api = await self._embedding_provider.batch_embed(uncached_texts)
-        
-        # Process results and update cache
-        for i, embedding in enumerate(embeddings_from_api):
-            original_index = uncached_indices[i]
-            text = uncached_texts[i]
-            
-            result_embeddings[original_index] = embedding
-            
-            # Store in cache
-            if self.enable_embedding_cache:
-                self._add_to_cache(text, embedding)
-        
-        return result_embeddings
-    
-    def _touch_cache(self, key: str) -> None:
-        """Update LRU order for cache hit."""
-        if key in self._cache_order:
-            self._cache_order.remove(key)
-        self._cache_order.append(key)
-    
-    def _add_to_cache(self, key: str, value: List[float]) -> None:
-        """Add to cache with LRU eviction."""
-        # Evict oldest if cache full
-        if len(self._embedding_cache) >= self.max_cache_size:
-            if self._cache_order:
-                oldest = self._cache_order.pop(0)
-                del self._embedding_cache[oldest]
-        
-        # Add new entry
-        self._embedding_cache[key] = value
-        self._cache_order.append(key)
+        # Only texts that are neither cached nor already in flight reach the
+        # provider, each distinct text once
+        return await self._embedding_cache.embed(
+            texts, self._embedding_provider.batch_embed
+        )
     
     def get_cache_stats(self) -> dict:
         """Get cache hit/miss statistics."""
-        total = self._cache_hits + self._cache_misses
-        hit_rate = (self._cache_hits / total * 100) if total > 0 else 0
-        
-        return {
-            "hits": self._cache_hits,
-            "misses": self._cache_misses,
-            "total_requests": total,
-            "hit_rate_percent": round(hit_rate, 2),
-            "cache_size": len(self._embedding_cache),
-            "max_cache_size": self.max_cache_size,
-        }
+        return self._embedding_cache.get_stats()
     
     def clear_embedding_cache(self) -> None:
         """Clear the embedding cache."""
         self._embedding_cache.clear()
-        self._cache_order.clear()
-        self._cache_hits = 0
-        self._cache_misses = 0
     
     async def reason_from_context(
         self,
         query: str,
         context_items: List[str],
         category_summaries: List[str],
+        entity_facts: Optional[str] = None,
     ) -> str:
         """
         Deep reasoning mode: synthesize answer from context.
+        
+        Context items are expected most relevant first; each is cut to
+        REASON_ITEM_MAX_CHARS and the list to REASON_CONTEXT_TOKEN_BUDGET,
+        bounding the prompt (and its prefill cost) for long memories.
+        
+        The prompt runs from most to least stable: instructions, category
+        summaries, query, memories, and finally the per-query entity facts,
+        so consecutive calls share as long a cacheable prefix as possible.
         """
+        limit = self.REASON_ITEM_MAX_CHARS
+        context_items = self._fit_to_budget(
+            [item if len(item) <= limit else item[:limit] + "..." for item in context_items],
+            self.REASON_CONTEXT_TOKEN_BUDGET,
+        )
         context = "\n".join([f"- {item}" for item in context_items])
         summaries = "\n".join([f"Category: {s}" for s in category_summaries])
         
-        prompt = f"""Based on the following memory context, answer the user's query.
+        prompt = f"""Category summaries:
+{summaries}
 
 Query: "{query}"
 
 Relevant memories:
-{context}
-
-Category summaries:
-{summaries}
+{context}"""
+        if entity_facts:
+            prompt += f"\n\n[High-precision entity facts]: {entity_facts}"
 
-Provide a helpful answer based on the memories above. If the information is insufficient, say so."""
-
-        response = await self.client.chat.completions.create(
+        response = await self._chat_completion(
             model=self.model,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.5,
+            messages=self._messages(self._REASON_SYSTEM, prompt),
+            **self._CHAT_PARAMS["reason"],
         )
-        await self._report_usage(response)
+        self._report_usage(response)
         
         return response.choices[0].message.content
     
@@ -366,12 +534,12 @@ Items:
 Create a concise 2-3 sentence summary that captures the key themes and important facts.
 This summary will be used as a quick reference for this category."""
 
-        response = await self.client.chat.completions.create(
+        response = await self._chat_completion(
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
-            temperature=0.3,
+            **self._CHAT_PARAMS["summarize"],
         )
-        await self._report_usage(response)
+        self._report_usage(response)
         
         return response.choices[0].message.content
     
@@ -383,26 +551,21 @@ This summary will be used as a quick reference for this category."""
         """
         Predict user's next intent based on context and patterns.
         """
-        context_str = json.dumps(current_context, ensure_ascii=False, indent=2)
+        context_str = _json_dumps_pretty(current_context)
         patterns_str = "\n".join([f"- {p}" for p in recent_patterns])
         
-        prompt = f"""Based on the current context and past behavioral patterns, predict what the user might need next.
-
-Current context:
+        prompt = f"""Current context:
 {context_str}
 
 Recent patterns:
-{patterns_str}
-
-Generate a brief context string (1-2 sentences) that could be helpful for proactively assisting the user.
-Focus on actionable predictions, not just observations."""
+{patterns_str}"""
 
-        response = await self.client.chat.completions.create(
+        response = await self._chat_completion(
             model=self.model,
-            messages=[{"role": "user", "content": prompt}],
-            temperature=0.4,
+            messages=self._messages(self._PREDICT_SYSTEM, prompt),
+            **self._CHAT_PARAMS["predict"],
         )
-        await self._report_usage(response)
+        self._report_usage(response)
         
         return response.choices[0].message.content
     
@@ -436,12 +599,12 @@ Rules:
 
 Category path (ONLY the path):"""
 
-        response = await self.client.chat.completions.create(
+        response = await self._chat_completion(
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
-            temperature=0.2,
+            **self._CHAT_PARAMS["categorize"],
         )
-        await self._report_usage(response)
+        self._report_usage(response)
         
         return response.choices[0].message.content.strip().lower()
 
@@ -470,12 +633,12 @@ Rules:
 
 Category path:"""
 
-        response = await self.client.chat.completions.create(
+        response = await self._chat_completion(
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
-            temperature=0.2,
+            **self._CHAT_PARAMS["categorize"],
         )
-        await self._report_usage(response)
+        self._report_usage(response)
         
         return response.choices[0].message.content.strip()
 
@@ -507,22 +670,66 @@ Memory: "{content}"
 
 Respond with ONLY a single integer (1-10):"""
 
-        response = await self.client.chat.completions.create(
+        response = await self._chat_completion(
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
-            temperature=0.1,  # Low temperature for consistent ratings
-            max_tokens=5,
+            **self._CHAT_PARAMS["importance"],
         )
-        await self._report_usage(response)
+        self._report_usage(response)
         
-        try:
-            score = int(response.choices[0].message.content.strip())
-            # Clamp to valid range and normalize
-            score = max(1, min(10, score))
-            return score / 10.0
-        except (ValueError, IndexError):
-            # Fallback to middle importance
-            return 0.5
+        return self._parse_importance(response.choices[0].message.content)
+
+    async def batch_rate_importance(self, contents: List[str]) -> List[float]:
+        """
+        Rate several memories with one LLM call.
+        
+        Same 1-10 scale as rate_importance(); the model answers with one
+        comma-separated score per memory. Scores that are missing or
+        unreadable fall back to middle importance.
+        
+        Args:
+            contents: The memory contents to rate
+            
+        Returns:
+            Normalized importance scores (0.0-1.0), one per content
+        """
+        if not contents:
+            return []
+        
+        numbered = "\n".join(f"{i}. \"{content}\"" for i, content in enumerate(contents, 1))
+        prompt = f"""Rate each of the following memories' importance from 1-10.
+
+Guidelines:
+- 1-3: Trivial (daily routines, casual remarks like "had coffee")
+- 4-6: Useful (facts, mild preferences, general interests)
+- 7-9: Important (strong preferences, key decisions, relationships, goals)
+- 10: Critical (life-changing events, core identity facts)
+
+Memories:
+{numbered}
+
+Respond with ONLY {len(contents)} comma-separated integers (1-10), in order:"""
+
+        response = await self._chat_completion(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            max_tokens=4 * len(contents) + 4,
+            **self._CHAT_PARAMS["importance_batch"],
+        )
+        self._report_usage(response)
+        
+        scores = response.choices[0].message.content.split(",")
+        scores += [""] * (len(contents) - len(scores))
+        return [self._parse_importance(score) for score in scores[:len(contents)]]
+
+    @classmethod
+    def _parse_importance(cls, text: str) -> float:
+        """Normalize a 1-10 score reply to 0.1-1.0 (0.5 if unreadable)."""
+        # Table lookup on the leading one or two characters replaces
+        # int() + clamp; anything unrecognized falls back to middle importance.
+        text = text.strip()
+        lut = cls._IMPORTANCE_LUT
+        return lut.get(text[:2]) or lut.get(text[:1]) or 0.5
 
     async def is_update_or_correction(
         self,
@@ -560,13 +767,12 @@ Determine the relationship:
 Reply with ONLY one word: UPDATE, ADD, or UNRELATED"""
 
         model = model_override or self.model
-        response = await self.client.chat.completions.create(
+        response = await self._chat_completion(
             model=model,
             messages=[{"role": "user", "content": prompt}],
-            temperature=0.0,  # Deterministic
-            max_tokens=10,
+            **self._CHAT_PARAMS["relationship"],
         )
-        await self._report_usage(response)
+        self._report_usage(response)
         
         result = response.choices[0].message.content.strip().upper()
         
@@ -578,6 +784,40 @@ Reply with ONLY one word: UPDATE, ADD, or UNRELATED"""
         else:
             return "UNRELATED"
 
+    async def classify_fact(
+        self,
+        content: str,
+        existing_categories: List[str],
+        existing_content: Optional[str] = None,
+    ) -> tuple[float, str, Optional[str]]:
+        """
+        Rate, categorize and (optionally) relate a fact in one round-trip.
+        
+        Preferred over calling rate_importance(), assign_category() and
+        is_update_or_correction() one after another: the three requests are
+        independent, so they run concurrently and the total latency is that
+        of the slowest call rather than the sum.
+        
+        Args:
+            content: The memory content to classify
+            existing_categories: Known category paths for assign_category()
+            existing_content: Existing memory to compare against (optional)
+            
+        Returns:
+            Tuple of (importance, category_path, relationship). relationship
+            is None when no existing_content was given.
+        """
+        tasks = [
+            self.rate_importance(content),
+            self.assign_category(content, existing_categories),
+        ]
+        if existing_content:
+            tasks.append(self.is_update_or_correction(content, existing_content))
+        
+        results = await asyncio.gather(*tasks)
+        relationship = results[2] if existing_content else None
+        return results[0], results[1], relationship
+
     async def extract_triples(
         self,
         text: str,
@@ -634,13 +874,12 @@ Respond with ONLY a valid JSON array of triples. No explanation."""
         model = model_override or self.model
         
         try:
-            response = await self.client.chat.completions.create(
+            response = await self._chat_completion(
                 model=model,
                 messages=[{"role": "user", "content": prompt}],
-                temperature=0.0,  # Deterministic
-                max_tokens=500,
+                **self._CHAT_PARAMS["triples"],
             )
-            await self._report_usage(response)
+            self._report_usage(response)
             
             result = response.choices[0].message.content.strip()
             
@@ -651,7 +890,7 @@ Respond with ONLY a valid JSON array of triples. No explanation."""
                 if result.startswith("json"):
                     result = result[4:]
             
-            triples = json.loads(result)
+            triples = _json_loads(result)
             
             # Validate and normalize
             normalized = []
@@ -677,19 +916,129 @@ Respond with ONLY a valid JSON array of triples. No explanation."""
         prompt: str,
         temperature: float = 0.7,
         max_tokens: int = 1000,
-    ) -> str:
+        response_format: Optional[str] = None,
+    ) -> Any:
         """
         Generate a straight completion for a prompt.
+        
+        Args:
+            prompt: User prompt
+            temperature: Sampling temperature
+            max_tokens: Completion token limit
+            response_format: "json_object" to request JSON mode; the parsed
+                object is returned instead of the raw text
         """
-        response = await self.client.chat.completions.create(
+        params = {}
+        if response_format:
+            params["response_format"] = {"type": response_format}
+        
+        response = await self._chat_completion(
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
             temperature=temperature,
             max_tokens=max_tokens,
+            **params,
         )
-        await self._report_usage(response)
-        return response.choices[0].message.content
+        self._report_usage(response)
+        content = response.choices[0].message.content
+        if response_format == "json_object":
+            return _json_loads(content)
+        return content
 
+    async def stream_complete(
+        self,
+        prompt: str,
+        temperature: float = 0.7,
+        max_tokens: int = 1000,
+    ) -> AsyncIterator[str]:
+        """
+        Stream a straight completion for a prompt.
+        
+        Yields text deltas as the model generates them, so callers can act
+        on early output while the rest is still being decoded.
+        
+        Args:
+            prompt: User prompt
+            temperature: Sampling temperature
+            max_tokens: Completion token limit
+        """
+        async with self._request_semaphore:
+            stream = await self.client.chat.completions.create(
+                model=self.model,
+                messages=[{"role": "user", "content": prompt}],
+                temperature=temperature,
+                max_tokens=max_tokens,
+                stream=True,
+                stream_options={"include_usage": True},
+            )
+            async for chunk in stream:
+                # Usage arrives on a final chunk with no choices
+                self._report_usage(chunk)
+                if chunk.choices:
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        yield delta
+
+    @staticmethod
+    def _messages(system: str, user: str) -> List[dict]:
+        """
+        Chat messages with the static instructions first.
+        
+        OpenAI caches prompt prefixes automatically, so the invariant system
+        message must precede everything that changes per call.
+        """
+        return [
+            {"role": "system", "content": system},
+            {"role": "user", "content": user},
+        ]
+    
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """
+        Conservative token estimate without a tokenizer.
+        
+        ~4 chars per token holds for English, but Korean text is much denser,
+        so assume 2 chars per token (same heuristic as the conversation buffer).
+        """
+        return len(text) // 2 + 1
+    
+    def _fit_to_budget(
+        self,
+        items: List[str],
+        budget_tokens: int,
+        keep_latest: bool = False,
+    ) -> List[str]:
+        """
+        Keep as many items as fit into an estimated token budget.
+        
+        Args:
+            items: Prompt items in the caller's order; selection is purely
+                positional, so that order decides what survives (e.g.
+                relevance rank, or newest first)
+            budget_tokens: Maximum estimated tokens for all kept items
+            keep_latest: Keep the tail instead of the head (for
+                oldest-first chronological items)
+            
+        Returns:
+            The kept items, in their original order. Callers that cannot afford
+            to lose the rest should condense them into a summary item first.
+        """
+        ordered = reversed(items) if keep_latest else items
+        kept = []
+        used = 0
+        for item in ordered:
+            used += self._estimate_tokens(item)
+            if used > budget_tokens and kept:  # always keep at least one item
+                break
+            kept.append(item)
+        
+        if len(kept) < len(items):
+            logger.info(
+                f"Prompt truncated to {len(kept)}/{len(items)} items "
+                f"(budget {budget_tokens} tokens)"
+            )
+        return kept[::-1] if keep_latest else kept
+    
     async def generate_daily_reflection(
         self,
         memory_items: List[str],
@@ -699,12 +1048,16 @@ Respond with ONLY a valid JSON array of triples. No explanation."""
         Generate a structured daily reflection from the day's memories.
         
         Args:
-            memory_items: List of memory content strings from the past 24 hours
+            memory_items: List of memory content strings from the past 24 hours,
+                oldest first; the most recent are kept if over budget
             date_str: Date string for the reflection (e.g., "2026-01-31")
             
         Returns:
             Dictionary with keys: summary, key_events, sentiment, insights
         """
+        memory_items = self._fit_to_budget(
+            memory_items, self.DAILY_REFLECTION_TOKEN_BUDGET, keep_latest=True
+        )
         items_text = "\n".join([f"- {item}" for item in memory_items])
         
         prompt = f"""You are a personal memory analyst. Based on the following memories from {date_str}, create a daily reflection.
@@ -728,24 +1081,19 @@ Guidelines:
 
 Return ONLY valid JSON, no other text."""
 
-        response = await self.client.chat.completions.create(
+        response = await self._chat_completion(
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
-            temperature=0.4,
-            response_format={"type": "json_object"},
+            **self._CHAT_PARAMS["reflection"],
         )
-        await self._report_usage(response)
+        self._report_usage(response)
         
         try:
-            result = json.loads(response.choices[0].message.content)
-            # Ensure all expected keys exist with defaults
-            return {
-                "summary": result.get("summary", "No summary available."),
-                "key_events": result.get("key_events", []),
-                "sentiment": result.get("sentiment", "neutral"),
-                "insights": result.get("insights", ""),
-            }
-        except (json.JSONDecodeError, KeyError):
+            # Missing or mistyped keys fall back to the schema defaults
+            return DailyReflection.model_validate_json(
+                response.choices[0].message.content
+            ).model_dump()
+        except ValidationError:
             return {
                 "summary": f"Daily reflection for {date_str} (parsing failed).",
                 "key_events": [],
@@ -762,12 +1110,17 @@ Return ONLY valid JSON, no other text."""
         Generate a weekly summary from daily reflections.
         
         Args:
-            daily_reflections: List of daily reflection content strings
+            daily_reflections: List of daily reflection content strings,
+                newest first (as get_reflections_by_type() returns them);
+                the oldest are dropped if over budget
             week_str: Week identifier (e.g., "2026-W05")
             
         Returns:
             Dictionary with keys: summary, themes, patterns, achievements, advice
         """
+        daily_reflections = self._fit_to_budget(
+            daily_reflections, self.WEEKLY_SUMMARY_TOKEN_BUDGET
+        )
         items_text = "\n\n".join([f"Day {i+1}:\n{item}" for i, item in enumerate(daily_reflections)])
         
         prompt = f"""You are a personal memory analyst. Based on the following daily reflections from {week_str}, create a weekly summary.
@@ -792,24 +1145,18 @@ Guidelines:
 
 Return ONLY valid JSON, no other text."""
 
-        response = await self.client.chat.completions.create(
+        response = await self._chat_completion(
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
-            temperature=0.4,
-            response_format={"type": "json_object"},
+            **self._CHAT_PARAMS["reflection"],
         )
-        await self._report_usage(response)
+        self._report_usage(response)
         
         try:
-            result = json.loads(response.choices[0].message.content)
-            return {
-                "summary": result.get("summary", "No summary available."),
-                "themes": result.get("themes", []),
-                "patterns": result.get("patterns", ""),
-                "achievements": result.get("achievements", []),
-                "advice": result.get("advice", ""),
-            }
-        except (json.JSONDecodeError, KeyError):
+            return WeeklySummary.model_validate_json(
+                response.choices[0].message.content
+            ).model_dump()
+        except ValidationError:
             return {
                 "summary": f"Weekly summary for {week_str} (parsing failed).",
                 "themes": [],
@@ -827,12 +1174,17 @@ Return ONLY valid JSON, no other text."""
         Generate a monthly summary from weekly summaries.
         
         Args:
-            weekly_summaries: List of weekly summary content strings
+            weekly_summaries: List of weekly summary content strings,
+                newest first (as get_reflections_by_type() returns them);
+                the oldest are dropped if over budget
             month_str: Month identifier (e.g., "2026-01")
             
         Returns:
             Dictionary with keys: summary, keywords, trends, growth, goals
         """
+        weekly_summaries = self._fit_to_budget(
+            weekly_summaries, self.MONTHLY_SUMMARY_TOKEN_BUDGET
+        )
         items_text = "\n\n".join([f"Week {i+1}:\n{item}" for i, item in enumerate(weekly_summaries)])
         
         prompt = f"""You are a personal memory analyst. Based on the following weekly summaries from {month_str}, create a monthly summary.
@@ -858,24 +1210,18 @@ Guidelines:
 
 Return ONLY valid JSON, no other text."""
 
-        response = await self.client.chat.completions.create(
+        response = await self._chat_completion(
             model=self.model,
             messages=[{"role": "user", "content": prompt}],
-            temperature=0.4,
-            response_format={"type": "json_object"},
+            **self._CHAT_PARAMS["reflection"],
         )
-        await self._report_usage(response)
+        self._report_usage(response)
         
         try:
-            result = json.loads(response.choices[0].message.content)
-            return {
-                "summary": result.get("summary", "No summary available."),
-                "keywords": result.get("keywords", []),
-                "trends": result.get("trends", ""),
-                "growth": result.get("growth", ""),
-                "goals": result.get("goals", []),
-            }
-        except (json.JSONDecodeError, KeyError):
+            return MonthlySummary.model_validate_json(
+                response.choices[0].message.content
+            ).model_dump()
+        except ValidationError:
             return {
                 "summary": f"Monthly summary for {month_str} (parsing failed).",
                 "keywords": [],
@@ -0,0 +1,152 @@
+"""
+Disk-backed embedding store.
+
+Persists embedding vectors in a local SQLite database so that a process
+restart does not re-pay the API cost for texts that were already embedded.
+WAL mode lets several workers share the same file.
+"""
+
+import sqlite3
+import sys
+import threading
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+
+class SQLiteEmbeddingStore:
+    """
+    Key/value store of embedding vectors backed by SQLite.
+
+    Keys are opaque bytes (content hashes computed by the caller).
+    Vectors are stored as packed float32 blobs, which matches the
+    precision pgvector keeps in the database anyway.
+
+    Eviction is LRU-approximate: every read or write stamps the row with
+    a monotonically increasing counter, and when the table grows beyond
+    ``max_entries`` the least recently touched rows are deleted.
+
+    Methods may be called from worker threads (the embedding cache runs
+    them via asyncio.to_thread); a lock serializes use of the connection.
+    """
+
+    # Check the row count only every N inserts to keep writes cheap
+    EVICTION_CHECK_INTERVAL = 256
+
+    def __init__(self, path: str, max_entries: int = 100_000):
+        """
+        Open (or create) the store.
+
+        Args:
+            path: SQLite database file path
+            max_entries: Maximum number of vectors kept on disk
+        """
+        self.path = path
+        self.max_entries = max_entries
+
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS emb ("
+            "k BLOB PRIMARY KEY, v BLOB NOT NULL, touched INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_emb_touched ON emb(touched)")
+        self._conn.commit()
+
+        row = self._conn.execute("SELECT COALESCE(MAX(touched), 0) FROM emb").fetchone()
+        self._clock = row[0]
+        self._inserts_since_check = 0
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    @staticmethod
+    def _pack(vector: Iterable[float]) -> bytes:
+        packed = array("f", vector)
+        if sys.byteorder == "big":
+            packed.byteswap()
+        return packed.tobytes()
+
+    @staticmethod
+    def _unpack(blob: bytes) -> array:
+        unpacked = array("f")
+        unpacked.frombytes(blob)
+        if sys.byteorder == "big":
+            unpacked.byteswap()
+        return unpacked
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, array]:
+        """
+        Look up several keys at once.
+
+        Returns:
+            Mapping of found keys to float32 arrays (missing keys are omitted)
+        """
+        if not keys:
+            return {}
+
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT k, v FROM emb WHERE k IN ({placeholders})", keys
+            ).fetchall()
+            if not rows:
+                return {}
+
+            self._conn.executemany(
+                "UPDATE emb SET touched = ? WHERE k = ?",
+                [(self._tick(), k) for k, _ in rows],
+            )
+            self._conn.commit()
+        return {k: self._unpack(v) for k, v in rows}
+
+    def put_many(self, items: List[Tuple[bytes, Sequence[float]]]) -> None:
+        """Insert or replace several vectors at once."""
+        if not items:
+            return
+
+        packed = [(k, self._pack(v)) for k, v in items]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO emb (k, v, touched) VALUES (?, ?, ?)",
+                [(k, v, self._tick()) for k, v in packed],
+            )
+            self._inserts_since_check += len(items)
+            if self._inserts_since_check >= self.EVICTION_CHECK_INTERVAL:
+                self._inserts_since_check = 0
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Delete least recently touched rows beyond max_entries."""
+        count = self._conn.execute("SELECT COUNT(*) FROM emb").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow <= 0:
+            return
+
+        row = self._conn.execute(
+            "SELECT touched FROM emb ORDER BY touched LIMIT 1 OFFSET ?",
+            (overflow,),
+        ).fetchone()
+        if row is not None:
+            self._conn.execute("DELETE FROM emb WHERE touched < ?", (row[0],))
+
+    def count(self) -> int:
+        """Number of vectors currently stored."""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM emb").fetchone()[0]
+
+    def clear(self) -> None:
+        """Remove all stored vectors."""
+        with self._lock:
+            self._conn.execute("DELETE FROM emb")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,276 @@
+"""
+Content-hashed embedding cache.
+
+Sits in front of an embedding provider's batch_embed and makes sure each
+distinct text is embedded at most once:
+- Memory tier: LRU of packed float32 vectors
+- Disk tier (optional): SQLiteEmbeddingStore shared across processes
+- Identical texts within one batch are sent once
+- Concurrent requests for the same text share a single in-flight call
+"""
+
+import asyncio
+import hashlib
+from array import array
+from collections import deque
+from typing import Awaitable, Callable, Dict, List, Optional, Sequence, Set
+
+from .disk_cache import SQLiteEmbeddingStore
+
+EmbedFn = Callable[[List[str]], Awaitable[List[Sequence[float]]]]
+
+
+def as_float_list(vector: Sequence[float]) -> List[float]:
+    """Materialize a provider vector (packed array or list) as List[float]."""
+    return vector.tolist() if isinstance(vector, array) else vector
+
+
+class EmbeddingCache:
+    """
+    LRU embedding cache keyed by (model name, blake2b(text)).
+
+    All bookkeeping happens between awaits on the event loop, so the cache
+    is safe to share between concurrent tasks without locks.
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        max_size: int = 1000,
+        disk_store: Optional[SQLiteEmbeddingStore] = None,
+    ):
+        """
+        Args:
+            model_name: Embedding model name; part of every key so vectors
+                from different models never mix
+            max_size: Maximum number of vectors kept in memory
+            disk_store: Optional persistent tier behind the memory LRU
+        """
+        self.max_size = max_size
+        self.disk_store = disk_store
+        self._key_prefix = f"{model_name}\0".encode("utf-8")
+
+        # Values are packed float32 arrays (~6KB per 1536-dim vector instead of
+        # ~48KB as a list of Python floats); pgvector stores float4 anyway.
+        self._entries: Dict[bytes, array] = {}
+        # LRU tracking with lazy deletion: every use appends (key, stamp) and
+        # entries whose stamp is no longer the key's latest are skipped on eviction.
+        self._order: deque[tuple[bytes, int]] = deque()
+        self._stamps: Dict[bytes, int] = {}
+        self._clock = 0
+
+        # Keys currently being embedded -> future resolving to the vector
+        self._inflight: Dict[bytes, asyncio.Future] = {}
+        # Detached fetch tasks (strong references until they finish)
+        self._fetch_tasks: Set[asyncio.Task] = set()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: bytes) -> bool:
+        return key in self._entries
+
+    def key(self, text: str) -> bytes:
+        """
+        Content hash used as the cache key in both tiers.
+
+        A 16-byte blake2b digest keeps long (e.g. Korean) texts out of the
+        cache and is scoped to the embedding model.
+        """
+        return hashlib.blake2b(
+            self._key_prefix + text.encode("utf-8"), digest_size=16
+        ).digest()
+
+    async def embed_one(self, text: str, embed_fn: EmbedFn) -> List[float]:
+        """Single-text fast path: memory hits skip all batch bookkeeping."""
+        key = self.key(text)
+        cached = self._entries.get(key)
+        if cached is not None:
+            self.hits += 1
+            self._touch(key)
+            return cached.tolist()
+        return (await self.embed([text], embed_fn, keys=[key]))[0]
+
+    async def embed(
+        self,
+        texts: List[str],
+        embed_fn: EmbedFn,
+        keys: Optional[List[bytes]] = None,
+    ) -> List[List[float]]:
+        """
+        Embed texts, calling embed_fn only for texts not cached or in flight.
+
+        Args:
+            texts: Texts to embed
+            embed_fn: Provider batch call for the remaining texts
+            keys: Precomputed keys (internal)
+
+        Returns:
+            Embedding vectors in the same order as texts
+        """
+        if keys is None:
+            keys = [self.key(text) for text in texts]
+
+        results: List[Optional[List[float]]] = [None] * len(texts)
+        to_fetch: Dict[bytes, List[int]] = {}  # key -> positions, first seen order
+        waiting: List[tuple[int, asyncio.Future]] = []
+
+        for i, key in enumerate(keys):
+            cached = self._entries.get(key)
+            if cached is not None:
+                self.hits += 1
+                self._touch(key)
+                results[i] = cached.tolist()
+            elif key in to_fetch:
+                # Duplicate within this batch: embedded once
+                self.hits += 1
+                to_fetch[key].append(i)
+            elif key in self._inflight:
+                # Already being embedded by a concurrent call
+                self.hits += 1
+                waiting.append((i, self._inflight[key]))
+            else:
+                to_fetch[key] = [i]
+
+        if to_fetch:
+            loop = asyncio.get_running_loop()
+            futures = {key: loop.create_future() for key in to_fetch}
+            self._inflight.update(futures)
+            # The shared call runs as its own task: cancelling this caller
+            # must not cancel the result other callers are waiting on
+            task = asyncio.ensure_future(self._fetch(
+                {key: texts[positions[0]] for key, positions in to_fetch.items()},
+                futures,
+                embed_fn,
+            ))
+            self._fetch_tasks.add(task)
+            task.add_done_callback(self._fetch_tasks.discard)
+            for key, positions in to_fetch.items():
+                waiting.extend((i, futures[key]) for i in positions)
+
+        for i, future in waiting:
+            # shield: a cancelled caller must not cancel the shared future
+            results[i] = await asyncio.shield(future)
+
+        return results
+
+    async def _fetch(
+        self,
+        texts: Dict[bytes, str],
+        futures: Dict[bytes, asyncio.Future],
+        embed_fn: EmbedFn,
+    ) -> None:
+        """
+        Resolve the missing keys once, publishing them through their futures.
+
+        The disk tier is probed before the API. sqlite is blocking, so both
+        disk calls run in a worker thread; the keys are already registered
+        as in flight, so concurrent requests wait instead of probing again.
+        """
+        fetch_keys = list(texts)
+
+        try:
+            if self.disk_store is not None:
+                found = await asyncio.to_thread(self.disk_store.get_many, fetch_keys)
+                for key, vector in found.items():
+                    self.hits += 1
+                    self.disk_hits += 1
+                    self._put(key, vector)
+                    futures[key].set_result(vector.tolist())
+                fetch_keys = [key for key in fetch_keys if key not in found]
+                if not fetch_keys:
+                    return
+
+            self.misses += len(fetch_keys)
+            embeddings = await embed_fn([texts[key] for key in fetch_keys])
+            if len(embeddings) != len(fetch_keys):
+                raise ValueError(
+                    f"Embedding provider returned {len(embeddings)} vectors "
+                    f"for {len(fetch_keys)} texts"
+                )
+            for key, embedding in zip(fetch_keys, embeddings):
+                self._put(key, embedding)
+                futures[key].set_result(as_float_list(embedding))
+        except BaseException as e:
+            # Every unresolved future must fail, or its waiters hang forever
+            for future in futures.values():
+                if future.done():
+                    continue
+                if isinstance(e, asyncio.CancelledError):
+                    future.cancel()
+                else:
+                    future.set_exception(e)
+                    future.exception()  # mark retrieved; waiters re-raise on await
+            if isinstance(e, asyncio.CancelledError):
+                raise
+            # Callers see the error through the futures; nobody awaits this task
+            return
+        finally:
+            for key in futures:
+                self._inflight.pop(key, None)
+
+        if self.disk_store is not None:
+            await asyncio.to_thread(self.disk_store.put_many, list(zip(fetch_keys, embeddings)))
+
+    def _touch(self, key: bytes) -> None:
+        """Update LRU order for cache hit (O(1), superseded entries stay behind)."""
+        self._clock += 1
+        self._stamps[key] = self._clock
+        self._order.append((key, self._clock))
+
+        # Compact once stale entries dominate, keeping the log O(cache size)
+        if len(self._order) > 2 * len(self._stamps) + 64:
+            self._order = deque(
+                entry for entry in self._order
+                if self._stamps.get(entry[0]) == entry[1]
+            )
+
+    def _put(self, key: bytes, value: Sequence[float]) -> None:
+        """Add to cache with LRU eviction."""
+        # Evict least recently used entries if cache full
+        if key not in self._entries:
+            while len(self._entries) >= self.max_size and self._order:
+                oldest, stamp = self._order.popleft()
+                if self._stamps.get(oldest) == stamp:
+                    del self._stamps[oldest]
+                    del self._entries[oldest]
+
+        # Add new entry (stored as a compact float32 array)
+        self._entries[key] = value if isinstance(value, array) else array("f", value)
+        self._touch(key)
+
+    def get_stats(self) -> dict:
+        """Get cache hit/miss statistics."""
+        total = self.hits + self.misses
+        hit_rate = (self.hits / total * 100) if total > 0 else 0
+
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "total_requests": total,
+            "hit_rate_percent": round(hit_rate, 2),
+            "cache_size": len(self._entries),
+            "max_cache_size": self.max_size,
+            "disk_hits": self.disk_hits,
+            "disk_cache_size": self.disk_store.count() if self.disk_store else 0,
+        }
+
+    def clear(self) -> None:
+        """Clear the memory tier and statistics (the disk tier is kept)."""
+        self._entries.clear()
+        self._order.clear()
+        self._stamps.clear()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+
+    def close(self) -> None:
+        """Close the disk tier, if any."""
+        if self.disk_store is not None:
+            self.disk_store.close()
+            self.disk_store = None
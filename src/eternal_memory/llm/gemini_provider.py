@@ -3,6 +3,7 @@ Google Gemini embedding provider implementation.
 """
 
 import asyncio
+from array import array
 from typing import List, Optional
 
 from .base import EmbeddingProvider, EmbeddingError
@@ -12,14 +13,20 @@ class GeminiEmbeddingProvider(EmbeddingProvider):
     """
     Google Gemini embedding provider.
     
-    Uses asyncio.gather for batch processing since Gemini API
-    processes embeddings individually.
+    Sends texts to the batch embedding endpoint in chunks and runs the
+    chunks concurrently with asyncio.gather. Uses the SDK's native async
+    client when available and falls back to a worker thread otherwise.
     """
     
+    # Gemini accepts at most 100 texts per batch request
+    DEFAULT_BATCH_SIZE = 100
+    
     def __init__(
         self,
         api_key: Optional[str] = None,
         model: str = "models/embedding-001",
+        max_concurrency: int = 16,
+        batch_size: int = DEFAULT_BATCH_SIZE,
     ):
         """
         Initialize Gemini embedding provider.
@@ -27,6 +34,8 @@ class GeminiEmbeddingProvider(EmbeddingProvider):
         Args:
             api_key: Google AI API key (defaults to GOOGLE_API_KEY env var)
             model: Embedding model name (default: models/embedding-001)
+            max_concurrency: Maximum embedding requests in flight at once
+            batch_size: Texts per batch request
         """
         try:
             import google.generativeai as genai
@@ -44,51 +53,80 @@ class GeminiEmbeddingProvider(EmbeddingProvider):
         
         self.model = model
         
+        # Native asyncio HTTP when the SDK provides it; older releases are
+        # synchronous only and go through asyncio.to_thread
+        self._async_embed = getattr(genai, "embed_content_async", None)
+        
+        # Bounds in-flight requests; created on first use
+        # so it binds to the running event loop
+        self.max_concurrency = max_concurrency
+        self.batch_size = batch_size
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        
         # Gemini embedding-001 produces 768-dimensional vectors
         self._dimension = 768
     
-    async def batch_embed(self, texts: List[str]) -> List[List[float]]:
+    async def batch_embed(self, texts: List[str]) -> List[array]:
         """
-        Generate embeddings using Gemini API with asyncio.gather.
+        Generate embeddings using Gemini's batch endpoint.
         
-        Gemini doesn't have native batch support, so we use
-        asyncio.gather to process multiple texts concurrently.
+        embed_content accepts a list of texts, so inputs are sent in
+        chunks of batch_size per request; chunks run concurrently with at
+        most max_concurrency requests in flight. Texts are sorted by length
+        before chunking so each request carries similar-sized inputs;
+        results are returned in input order.
         """
         if not texts:
             return []
         
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        
         try:
-            # Create coroutines for each text
-            tasks = [
-                self._embed_single(text) for text in texts
+            order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+            chunks = [
+                order[start:start + self.batch_size]
+                for start in range(0, len(order), self.batch_size)
             ]
             
-            # Execute all tasks concurrently
-            embeddings = await asyncio.gather(*tasks)
+            results = await asyncio.gather(
+                *[self._embed_chunk([texts[i] for i in chunk]) for chunk in chunks]
+            )
             
+            # Scatter back to the original positions
+            embeddings: List[Optional[array]] = [None] * len(texts)
+            for chunk, chunk_embeddings in zip(chunks, results):
+                for i, embedding in zip(chunk, chunk_embeddings):
+                    embeddings[i] = embedding
             return embeddings
             
         except Exception as e:
             raise EmbeddingError(f"Gemini embedding failed: {e}") from e
     
-    async def _embed_single(self, text: str) -> List[float]:
+    async def _embed_chunk(self, chunk: List[str]) -> List[array]:
         """
-        Embed a single text using Gemini API.
+        Embed one chunk of texts in a single API request.
         
-        Note: google-generativeai is synchronous, so we use
-        asyncio.to_thread to avoid blocking.
+        Note: older google-generativeai releases are synchronous, so
+        without embed_content_async we use asyncio.to_thread to avoid blocking.
         """
-        def _sync_embed():
-            result = self.genai.embed_content(
-                model=self.model,
-                content=text,
-                task_type="retrieval_document",
-            )
-            return result["embedding"]
+        async def request():
+            async with self._semaphore:
+                if self._async_embed is not None:
+                    return await self._async_embed(
+                        model=self.model,
+                        content=chunk,
+                        task_type="retrieval_document",
+                    )
+                return await asyncio.to_thread(
+                    self.genai.embed_content,
+                    model=self.model,
+                    content=chunk,
+                    task_type="retrieval_document",
+                )
         
-        # Run sync function in thread pool
-        embedding = await asyncio.to_thread(_sync_embed)
-        return embedding
+        result = await self._with_retry(request)
+        return [array("f", embedding) for embedding in result["embedding"]]
     
     def get_embedding_dimension(self) -> int:
         """Get embedding dimension for Gemini."""
@@ -2,7 +2,11 @@
 OpenAI embedding provider implementation.
 """
 
-from typing import List, Optional
+import asyncio
+import base64
+import sys
+from array import array
+from typing import Any, List, Optional
 from openai import AsyncOpenAI
 
 from .base import EmbeddingProvider, EmbeddingError
@@ -12,14 +16,23 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
     """
     OpenAI embedding provider using text-embedding-ada-002.
     
-    Supports batch embedding natively through OpenAI's API.
+    Supports batch embedding natively through OpenAI's API. Large inputs
+    are packed into token-budgeted sub-batches that are sent concurrently.
     """
     
+    # Stay under the per-request token cap (300k for text-embedding-3)
+    DEFAULT_MAX_TOKENS_PER_REQUEST = 280_000
+    
     def __init__(
         self,
         api_key: Optional[str] = None,
         base_url: Optional[str] = None,
         model: str = "text-embedding-ada-002",
+        chunk_size: int = 1000,
+        max_concurrency: int = 8,
+        max_tokens_per_request: int = DEFAULT_MAX_TOKENS_PER_REQUEST,
+        client: Optional[AsyncOpenAI] = None,
+        http_client: Optional[Any] = None,
     ):
         """
         Initialize OpenAI embedding provider.
@@ -28,9 +41,29 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
             api_key: OpenAI API key (defaults to OPENAI_API_KEY env var)
             base_url: Optional base URL for OpenAI-compatible APIs
             model: Embedding model name (default: text-embedding-ada-002)
+            chunk_size: Maximum texts per request (API limit is 2048)
+            max_concurrency: Maximum requests in flight at once
+            max_tokens_per_request: Estimated token budget per request
+            client: Existing AsyncOpenAI client to share (its connection pool
+                is reused); api_key/base_url are ignored when given
+            http_client: HTTP client for a client created here (e.g. a
+                tuned httpx.AsyncClient); ignored when client is given
+        
+        Shared clients stay open in aclose(): the caller owns them.
         """
-        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url)
+        # Share the caller's client when possible so chat and embedding
+        # requests reuse one keep-alive connection pool. AsyncOpenAI.close()
+        # also closes its HTTP client, so only a fully self-made one is closed.
+        self._owns_client = client is None and http_client is None
+        self.client = client or AsyncOpenAI(
+            api_key=api_key, base_url=base_url, http_client=http_client
+        )
         self.model = model
+        self.chunk_size = chunk_size
+        self.max_concurrency = max_concurrency
+        self.max_tokens_per_request = max_tokens_per_request
+        # Created on first use so it binds to the running event loop
+        self._semaphore: Optional[asyncio.Semaphore] = None
         
         # Model dimensions
         self._dimensions = {
@@ -39,28 +72,118 @@ class OpenAIEmbeddingProvider(EmbeddingProvider):
             "text-embedding-3-large": 3072,
         }
     
-    async def batch_embed(self, texts: List[str]) -> List[List[float]]:
+    async def batch_embed(self, texts: List[str]) -> List[array]:
         """
         Generate embeddings using OpenAI's batch API.
         
         OpenAI natively supports batch embedding by passing a list
-        of strings to the input parameter.
+        of strings to the input parameter. Inputs are packed into
+        sub-batches (see _pack_batches) that run concurrently; results are
+        returned in input order.
         """
         if not texts:
             return []
         
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        
         try:
-            response = await self.client.embeddings.create(
-                model=self.model,
-                input=texts,  # OpenAI accepts list directly
+            batches = self._pack_batches(texts)
+            results = await asyncio.gather(
+                *[self._embed_chunk([texts[i] for i in batch]) for batch in batches]
             )
             
-            # Extract embeddings in order
-            return [item.embedding for item in response.data]
+            # Scatter back to the original positions
+            embeddings: List[Optional[array]] = [None] * len(texts)
+            for batch, batch_embeddings in zip(batches, results):
+                for i, embedding in zip(batch, batch_embeddings):
+                    embeddings[i] = embedding
+            return embeddings
             
         except Exception as e:
             raise EmbeddingError(f"OpenAI embedding failed: {e}") from e
     
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """Conservative token estimate (2 chars/token covers Korean text)."""
+        return len(text) // 2 + 1
+    
+    def _pack_batches(self, texts: List[str]) -> List[List[int]]:
+        """
+        Greedily pack text indices into request-sized batches.
+        
+        Texts are taken longest first and each batch is filled until adding
+        the next text would exceed max_tokens_per_request or chunk_size
+        inputs, so requests carry similar-sized inputs and use the token
+        budget evenly.
+        
+        Returns:
+            Lists of indices into texts, one list per request
+        """
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]), reverse=True)
+        batches: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+        
+        for i in order:
+            tokens = self._estimate_tokens(texts[i])
+            if current and (
+                current_tokens + tokens > self.max_tokens_per_request
+                or len(current) >= self.chunk_size
+            ):
+                batches.append(current)
+                current = []
+                current_tokens = 0
+            current.append(i)
+            current_tokens += tokens
+        
+        if current:
+            batches.append(current)
+        return batches
+    
+    async def _embed_chunk(self, chunk: List[str]) -> List[array]:
+        """
+        Embed one sub-batch in a single API request (retried if transient).
+        
+        SDK retries are disabled for the request: they would sleep while
+        holding a concurrency slot, and _with_retry already retries. The
+        shared client's defaults (used by chat requests) are untouched.
+        """
+        async def request():
+            async with self._semaphore:
+                return await self.client.with_options(max_retries=0).embeddings.create(
+                    model=self.model,
+                    input=chunk,  # OpenAI accepts list directly
+                    encoding_format="base64",
+                )
+        
+        response = await self._with_retry(request)
+        
+        # Extract embeddings in order as packed float32 rows
+        return [self._decode_embedding(item.embedding) for item in response.data]
+    
+    @staticmethod
+    def _decode_embedding(embedding) -> array:
+        """
+        Decode one embedding into a float32 row.
+        
+        base64 payloads are little-endian float32 bytes and are copied
+        straight into the array; a plain float list (servers that ignore
+        encoding_format) is packed as-is.
+        """
+        if isinstance(embedding, str):
+            row = array("f")
+            row.frombytes(base64.b64decode(embedding))
+            if sys.byteorder == "big":
+                row.byteswap()
+            return row
+        return array("f", embedding)
+    
+    async def aclose(self) -> None:
+        """Close the client if this provider created it and its HTTP client."""
+        if self._owns_client:
+            await self.client.close()
+    
     def get_embedding_dimension(self) -> int:
         """Get embedding dimension for the current model."""
         return self._dimensions.get(self.model, 1536)
@@ -0,0 +1,108 @@
+"""
+LLM response cache.
+
+Exact-match TTL cache in front of an LLM call:
+sha256(model, response format, prompt) -> response.
+
+Identical prompts recur when the same conversation buffer is flushed again
+(e.g. after a retry or restart); a hit skips the LLM round-trip entirely.
+Only exact prompts are matched: a prompt that differs at all may ask for
+a different answer.
+"""
+
+import hashlib
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+
+class LLMResponseCache:
+    """
+    TTL-bounded exact-match cache for LLM responses.
+
+    Responses are stored as JSON text and decoded on every hit, so callers
+    may freely mutate what they get back.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 3600.0,
+        max_size: int = 256,
+    ):
+        """
+        Args:
+            ttl_seconds: Entry lifetime
+            max_size: Maximum number of entries (oldest evicted first)
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+
+        # key -> (expires_at, response JSON)
+        self._exact: "OrderedDict[bytes, Tuple[float, str]]" = OrderedDict()
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(prompt: str, model: str = "", response_format: Optional[str] = None) -> bytes:
+        """Exact-match key for a prompt under a model and response format."""
+        return hashlib.sha256(
+            f"{model}\0{response_format or ''}\0{prompt}".encode("utf-8")
+        ).digest()
+
+    async def get_or_compute(
+        self,
+        prompt: str,
+        compute: Callable[[], Awaitable[Any]],
+        model: str = "",
+        response_format: Optional[str] = None,
+    ) -> Any:
+        """
+        Return a cached response for prompt, or compute and cache it.
+
+        Args:
+            prompt: Full prompt (exact-match key)
+            compute: Coroutine factory performing the actual LLM call
+            model: Model name, part of every key
+            response_format: Response format, part of every key
+        """
+        now = time.monotonic()
+        exact_key = self.key(prompt, model, response_format)
+
+        entry = self._exact.get(exact_key)
+        if entry is not None:
+            if entry[0] > now:
+                self.hits += 1
+                self._exact.move_to_end(exact_key)
+                return json.loads(entry[1])
+            del self._exact[exact_key]
+
+        self.misses += 1
+        response = await compute()
+
+        self._exact[exact_key] = (
+            time.monotonic() + self.ttl_seconds,
+            json.dumps(response, ensure_ascii=False),
+        )
+        while len(self._exact) > self.max_size:
+            self._exact.popitem(last=False)
+
+        return response
+
+    def get_stats(self) -> dict:
+        """Get cache hit/miss statistics."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate_percent": round(self.hits / total * 100, 2) if total else 0,
+            "exact_size": len(self._exact),
+        }
+
+    def clear(self) -> None:
+        """Drop all entries and statistics."""
+        self._exact.clear()
+        self.hits = 0
+        self.misses = 0
@@ -0,0 +1,65 @@
+"""
+Response schemas for structured LLM outputs.
+
+Reflection and summary prompts ask the model for a fixed JSON object.
+Decoding straight into these models parses and validates in a single
+pass and fills in defaults for any keys the model leaves out or gets
+wrong.
+"""
+
+from typing import Any, List
+
+from pydantic import BaseModel, ValidationInfo, field_validator
+
+
+class _LenientModel(BaseModel):
+    """
+    Coerces common slips field by field instead of rejecting the reply.
+
+    null falls back to the default, a list meant as text is joined, a lone
+    string meant as a list is wrapped, and any other mistyped value falls
+    back to the default, so one bad field never discards the others.
+    """
+
+    @field_validator("*", mode="before")
+    @classmethod
+    def _coerce(cls, value: Any, info: ValidationInfo) -> Any:
+        field = cls.model_fields[info.field_name]
+        if field.annotation is str:
+            if isinstance(value, str):
+                return value
+            if isinstance(value, list):
+                return " ".join(str(item) for item in value if item is not None)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                return str(value)
+        elif isinstance(value, list):
+            return [str(item) for item in value if item is not None]
+        elif isinstance(value, str):
+            return [value] if value else []
+        return field.get_default(call_default_factory=True)
+
+
+class DailyReflection(_LenientModel):
+    """Structured output of generate_daily_reflection."""
+    summary: str = "No summary available."
+    key_events: List[str] = []
+    sentiment: str = "neutral"
+    insights: str = ""
+
+
+class WeeklySummary(_LenientModel):
+    """Structured output of generate_weekly_summary."""
+    summary: str = "No summary available."
+    themes: List[str] = []
+    patterns: str = ""
+    achievements: List[str] = []
+    advice: str = ""
+
+
+class MonthlySummary(_LenientModel):
+    """Structured output of generate_monthly_summary."""
+    summary: str = "No summary available."
+    keywords: List[str] = []
+    trends: str = ""
+    growth: str = ""
+    goals: List[str] = []
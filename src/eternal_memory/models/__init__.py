@@ -1,7 +1,14 @@
 """Data models package."""
 
-from eternal_memory.models.memory_item import MemoryItem, MemoryType
+from eternal_memory.models.memory_item import MemoryItem, MemoryType, content_hash
 from eternal_memory.models.retrieval import RetrievalResult
 from eternal_memory.models.semantic_triple import SemanticTriple, normalize_predicate
 
-__all__ = ["MemoryItem", "MemoryType", "RetrievalResult", "SemanticTriple", "normalize_predicate"]
+__all__ = [
+    "MemoryItem",
+    "MemoryType",
+    "RetrievalResult",
+    "SemanticTriple",
+    "content_hash",
+    "normalize_predicate",
+]
@@ -0,0 +1,61 @@
+"""
+Lightweight intermediates for LLM extraction output.
+
+Facts and triples parsed from an LLM response live only until they are
+stored. Slotted dataclasses carry them between extraction and the
+database boundary without Pydantic validation or per-instance __dict__;
+they become MemoryItem / SemanticTriple only when persisted.
+"""
+
+from dataclasses import dataclass
+from typing import Optional
+from uuid import UUID
+
+from eternal_memory.models.semantic_triple import SemanticTriple, normalize_predicate
+
+
+@dataclass(slots=True)
+class RawMemoryItem:
+    """A fact as extracted by the LLM, before categorization and storage."""
+    content: str
+    type: str = "fact"
+    importance: float = 0.5
+
+    @classmethod
+    def from_dict(cls, fact: dict) -> "RawMemoryItem":
+        """Build from an extract_facts() entry."""
+        return cls(
+            content=fact.get("content", ""),
+            type=fact.get("type", "fact"),
+            importance=float(fact.get("importance", 0.5)),
+        )
+
+
+@dataclass(slots=True)
+class RawSemanticTriple:
+    """A triple as extracted by the LLM, with its predicate in canonical form."""
+    subject: str
+    predicate: str
+    object: str
+    context: Optional[str] = None
+
+    @classmethod
+    def from_dict(cls, triple: dict) -> "RawSemanticTriple":
+        """Build from an extract_triples() entry."""
+        return cls(
+            subject=triple["subject"],
+            predicate=normalize_predicate(triple["predicate"]),
+            object=triple["object"],
+            context=triple.get("context"),
+        )
+
+    def to_model(self, memory_item_id: UUID, importance: float) -> SemanticTriple:
+        """Convert at the storage boundary (fields are already clean)."""
+        return SemanticTriple.from_trusted(
+            memory_item_id=memory_item_id,
+            subject=self.subject,
+            predicate=self.predicate,
+            object=self.object,
+            context=self.context,
+            importance=importance,
+        )
@@ -0,0 +1,42 @@
+"""
+Identifier generation.
+
+Primary keys are UUIDv7 (RFC 9562): a 48-bit millisecond timestamp followed
+by random bits. New rows therefore sort after existing ones, so inserts
+append to the end of the primary-key B-tree instead of landing on random
+pages as uuid4 keys do. The values are still ordinary 128-bit UUIDs.
+"""
+
+import os
+import threading
+import time
+from uuid import UUID
+
+_VERSION_7 = 0x7 << 76
+_VARIANT_RFC = 0b10 << 62
+_RAND_B_MASK = (1 << 62) - 1
+
+_lock = threading.Lock()
+_last = 0
+
+
+def uuid7() -> UUID:
+    """
+    Generate a time-ordered UUIDv7.
+
+    The 12 rand_a bits carry the sub-millisecond fraction of the clock
+    (RFC 9562, method 3). If the clock has not advanced since the previous
+    ID (coarse timers), the previous value is incremented instead, so IDs
+    from this process are strictly increasing.
+    """
+    global _last
+    ns = time.time_ns()
+    ms, sub_ms = divmod(ns, 1_000_000)
+    fraction = (sub_ms << 12) // 1_000_000
+    rand_b = int.from_bytes(os.urandom(8), "big") & _RAND_B_MASK
+    value = (ms << 80) | _VERSION_7 | (fraction << 64) | _VARIANT_RFC | rand_b
+    with _lock:
+        if value <= _last:
+            value = _last + 1
+        _last = value
+    return UUID(int=value)
@@ -4,12 +4,28 @@ Memory Item Data Model
 Defines the core MemoryItem structure as specified in the eternal_memory_spec.md
 """
 
-from datetime import datetime
+import hashlib
+from datetime import datetime, timezone
 from enum import Enum
 from typing import Optional
-from uuid import UUID, uuid4
+from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+from eternal_memory.models.ids import uuid7
+
+
+def _utcnow() -> datetime:
+    """Timezone-aware current time (columns are TIMESTAMPTZ)."""
+    return datetime.now(timezone.utc)
+
+
+def content_hash(content: str) -> str:
+    """
+    SHA-256 of a memory's normalized content (lower-cased, whitespace
+    collapsed), stored with each item for exact-duplicate lookups.
+    """
+    return hashlib.sha256(" ".join(content.lower().split()).encode("utf-8")).hexdigest()
 
 
 class MemoryType(str, Enum):
@@ -28,7 +44,9 @@ class MemoryItem(BaseModel):
     - Resource (raw data) → Item (extracted fact) → Category (semantic cluster)
     """
     
-    id: UUID = Field(default_factory=uuid4)
+    model_config = ConfigDict(use_enum_values=True, extra="ignore")
+    
+    id: UUID = Field(default_factory=uuid7)
     content: str = Field(..., description="The actual fact/memory content")
     category_path: str = Field(
         ..., 
@@ -58,15 +76,20 @@ class MemoryItem(BaseModel):
         default=None,
         description="Reference to the original resource"
     )
-    created_at: datetime = Field(default_factory=datetime.now)
-    last_accessed: datetime = Field(default_factory=datetime.now)
+    created_at: datetime = Field(default_factory=_utcnow)
+    last_accessed: datetime = Field(default_factory=_utcnow)
     is_active: bool = Field(
         default=True,
         description="Whether this memory is active (not superseded)"
     )
-    
-    class Config:
-        use_enum_values = True
+
+    @classmethod
+    def from_trusted(cls, **data) -> "MemoryItem":
+        """
+        Build from already-validated data (e.g. a database row) without
+        running validation. Defaults are still applied for missing fields.
+        """
+        return cls.model_construct(**data)
 
 
 class Resource(BaseModel):
@@ -77,7 +100,7 @@ class Resource(BaseModel):
     to ensure traceability of extracted facts.
     """
     
-    id: UUID = Field(default_factory=uuid4)
+    id: UUID = Field(default_factory=uuid7)
     uri: str = Field(..., description="File path or URL of the resource")
     modality: str = Field(
         ...,
@@ -87,12 +110,17 @@ class Resource(BaseModel):
         default=None,
         description="Full text content of the resource"
     )
-    created_at: datetime = Field(default_factory=datetime.now)
+    created_at: datetime = Field(default_factory=_utcnow)
     metadata: dict = Field(
         default_factory=dict,
         description="Extra info (sender, app context, etc.)"
     )
 
+    @classmethod
+    def from_trusted(cls, **data) -> "Resource":
+        """Build from trusted data without validation (see MemoryItem.from_trusted)."""
+        return cls.model_construct(**data)
+
 
 class Category(BaseModel):
     """
@@ -102,7 +130,7 @@ class Category(BaseModel):
     summary information for quick context retrieval.
     """
     
-    id: UUID = Field(default_factory=uuid4)
+    id: UUID = Field(default_factory=uuid7)
     name: str = Field(..., description="Category name")
     description: Optional[str] = Field(
         default=None,
@@ -120,4 +148,9 @@ class Category(BaseModel):
         ...,
         description="Full path like 'knowledge/coding/python'"
     )
-    last_accessed: datetime = Field(default_factory=datetime.now)
+    last_accessed: datetime = Field(default_factory=_utcnow)
+
+    @classmethod
+    def from_trusted(cls, **data) -> "Category":
+        """Build from trusted data without validation (see MemoryItem.from_trusted)."""
+        return cls.model_construct(**data)
@@ -45,3 +45,8 @@ class RetrievalResult(BaseModel):
         le=1.0,
         description="Overall confidence in the retrieval results"
     )
+
+    @classmethod
+    def from_trusted(cls, **data) -> "RetrievalResult":
+        """Build from trusted data without validation (see MemoryItem.from_trusted)."""
+        return cls.model_construct(**data)
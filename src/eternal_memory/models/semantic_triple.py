@@ -5,11 +5,33 @@ Implements Subject-Predicate-Object memory structure for entity-level updates.
 Reference: LangMem (LangChain, 2024)
 """
 
-from datetime import datetime
+import re
+import sys
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Optional
-from uuid import UUID, uuid4
+from uuid import UUID
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from eternal_memory.models.ids import uuid7
+
+
+def _utcnow() -> datetime:
+    """Timezone-aware current time (columns are TIMESTAMPTZ)."""
+    return datetime.now(timezone.utc)
+
+
+# Contradicting predicates in canonical form (see normalize_predicate), in
+# both directions so a lookup is a single membership test
+OPPOSITE_PREDICATES = {
+    "likes": "dislikes",
+    "wants": "avoids",
+    "is": "is_not",
+    "can": "cannot",
+}
+OPPOSITE_PREDICATES.update({b: a for a, b in OPPOSITE_PREDICATES.items()})
+_OPPOSITE_PAIRS = frozenset(OPPOSITE_PREDICATES.items())
 
 
 class SemanticTriple(BaseModel):
@@ -20,7 +42,9 @@ class SemanticTriple(BaseModel):
     Example: "User likes apples" → Triple(User, likes, apples)
     """
     
-    id: UUID = Field(default_factory=uuid4)
+    model_config = ConfigDict(use_enum_values=True, extra="ignore")
+    
+    id: UUID = Field(default_factory=uuid7)
     memory_item_id: Optional[UUID] = Field(
         default=None,
         description="Reference to originating MemoryItem"
@@ -53,8 +77,20 @@ class SemanticTriple(BaseModel):
         description="Whether this triple is active (not superseded)"
     )
     
-    created_at: datetime = Field(default_factory=datetime.now)
-    last_accessed: datetime = Field(default_factory=datetime.now)
+    created_at: datetime = Field(default_factory=_utcnow)
+    last_accessed: datetime = Field(default_factory=_utcnow)
+    
+    @field_validator("predicate", mode="before")
+    @classmethod
+    def _canonical_predicate(cls, v):
+        """Store predicates in canonical form ('Loves' -> 'likes')."""
+        return normalize_predicate(v) if isinstance(v, str) else v
+    
+    @field_validator("subject", "object")
+    @classmethod
+    def _intern_entity(cls, v: str) -> str:
+        """Intern entity names; they repeat heavily across triples."""
+        return sys.intern(v)
     
     def to_natural_language(self) -> str:
         """Convert triple to natural language sentence."""
@@ -65,25 +101,19 @@ class SemanticTriple(BaseModel):
     
     def is_opposite_of(self, other: "SemanticTriple") -> bool:
         """Check if this triple contradicts another (e.g., likes vs dislikes)."""
-        if self.subject != other.subject or self.object != other.object:
-            return False
-        
-        opposite_pairs = {
-            ("likes", "dislikes"),
-            ("loves", "hates"),
-            ("wants", "avoids"),
-            ("prefers", "dislikes"),
-            ("is", "is_not"),
-            ("can", "cannot"),
-        }
-        
-        pred_pair = (self.predicate.lower(), other.predicate.lower())
-        rev_pair = (other.predicate.lower(), self.predicate.lower())
-        
-        return pred_pair in opposite_pairs or rev_pair in opposite_pairs
-    
-    class Config:
-        use_enum_values = True
+        return (
+            self.subject == other.subject
+            and self.object == other.object
+            and (self.predicate, other.predicate) in _OPPOSITE_PAIRS
+        )
+
+    @classmethod
+    def from_trusted(cls, **data) -> "SemanticTriple":
+        """
+        Build from already-validated data (e.g. a database row) without
+        running validation; used when hydrating repository rows.
+        """
+        return cls.model_construct(**data)
 
 
 # Predicate normalization mapping
@@ -102,7 +132,16 @@ PREDICATE_ALIASES = {
 }
 
 
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
 def normalize_predicate(predicate: str) -> str:
-    """Normalize predicate to canonical form."""
-    normalized = predicate.lower().strip().replace(" ", "_")
+    """
+    Normalize predicate to canonical form.
+    
+    Runs of whitespace become a single underscore. Results are cached since
+    the same few predicates repeat across all triples.
+    """
+    normalized = _WHITESPACE_RE.sub("_", predicate.strip().lower())
     return PREDICATE_ALIASES.get(normalized, normalized)
@@ -4,14 +4,106 @@ Performance Monitoring System
 Collects and logs pipeline performance metrics using hooks.
 """
 
+import asyncio
+import atexit
 import json
-import logging
+import mmap
+import threading
 import time
-from datetime import datetime
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 from collections import deque
-import statistics
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize one metric record, preferring orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _json_loads(data: str) -> Any:
+    """Parse one metric record, preferring orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+class _P2Quantile:
+    """
+    Streaming quantile estimate in O(1) time and memory.
+    
+    Implements the P² algorithm (Jain & Chlamtac, 1985): five markers track
+    the minimum, p/2, p, (1+p)/2 quantiles and the maximum, and are nudged
+    with a piecewise-parabolic fit as samples arrive. No samples are kept.
+    """
+    
+    def __init__(self, p: float):
+        self.p = p
+        self.count = 0
+        self._heights: List[float] = []
+        self._positions = [0, 1, 2, 3, 4]
+        self._desired = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+        self._increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+    
+    def add(self, x: float) -> None:
+        """Add one observation."""
+        self.count += 1
+        q, n = self._heights, self._positions
+        
+        if self.count <= 5:
+            q.append(x)
+            q.sort()
+            return
+        
+        # Find the cell containing x, extending the extremes if needed
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = 0
+            while x >= q[k + 1]:
+                k += 1
+        
+        for i in range(k + 1, 5):
+            n[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+        
+        # Adjust the three middle markers toward their desired positions
+        for i in (1, 2, 3):
+            d = self._desired[i] - n[i]
+            if (d >= 1 and n[i + 1] - n[i] > 1) or (d <= -1 and n[i - 1] - n[i] < -1):
+                step = 1 if d > 0 else -1
+                height = self._parabolic(i, step)
+                if not q[i - 1] < height < q[i + 1]:
+                    height = q[i] + step * (q[i + step] - q[i]) / (n[i + step] - n[i])
+                q[i] = height
+                n[i] += step
+    
+    def _parabolic(self, i: int, step: int) -> float:
+        q, n = self._heights, self._positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1])
+        )
+    
+    def value(self) -> float:
+        """Current estimate (exact while five or fewer samples were seen)."""
+        if self.count == 0:
+            return 0.0
+        if self.count <= 5:
+            return self._heights[round(self.p * (self.count - 1))]
+        return self._heights[2]
 
 
 class PerformanceMonitor:
@@ -22,10 +114,19 @@ class PerformanceMonitor:
     - Stage-level timing
     - Embedding performance tracking
     - Cache statistics
-    - JSON-formatted logs
+    - JSON-formatted logs (buffered, written in batches)
     - In-memory recent metrics
+    - O(1) summary: running window sums and a streaming p95 estimate
     """
     
+    # Pending lines are written at most FLUSH_INTERVAL seconds after the
+    # first one is recorded, or immediately once FLUSH_BATCH_SIZE pile up
+    FLUSH_INTERVAL = 0.1
+    FLUSH_BATCH_SIZE = 128
+    
+    # How long a log directory listing is reused before globbing again
+    LOG_FILES_TTL = 5.0
+    
     def __init__(self, log_dir: str = "logs", max_recent: int = 100):
         """
         Initialize performance monitor.
@@ -49,26 +150,83 @@ class PerformanceMonitor:
             "cache_misses": 0,
         }
         
-        # Setup JSON logger
-        self._setup_logger()
+        # Running sums over recent_metrics, updated on append/evict so
+        # get_summary never rescans the window
+        self._window_duration_sum = 0.0
+        self._window_facts_sum = 0
+        # p95 of total_duration over all pipelines since start
+        self._p95_duration = _P2Quantile(0.95)
+        
+        # Encoded JSON lines waiting to be written
+        self._pending: List[bytes] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._flush_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # Metrics go to one file per UTC day; rolled over lazily on write
+        self._current_day: Optional[str] = None
+        self._log_fh = None
+        self._closed = False
+        self._log_files_cache: Optional[Tuple[float, List[str]]] = None
+        
+        self._open_log_file()
+        atexit.register(self.close)
     
-    def _setup_logger(self):
-        """Setup JSON logger for metrics."""
-        self.logger = logging.getLogger("eternal_memory.metrics")
-        self.logger.setLevel(logging.INFO)
+    def _open_log_file(self) -> None:
+        """Make sure the current UTC day's JSONL metrics file is open."""
+        today = datetime.now(timezone.utc).strftime('%Y%m%d')
+        if today == self._current_day:
+            return
         
-        # Daily rotating file handler
-        log_file = self.log_dir / f"metrics_{datetime.now().strftime('%Y%m%d')}.jsonl"
-        handler = logging.FileHandler(log_file)
-        handler.setLevel(logging.INFO)
+        if self._log_fh is not None:
+            self._log_fh.close()
+        self._log_files_cache = None  # a new file may be about to appear
+        self._current_day = today
+        self._log_fh = open(
+            self.log_dir / f"metrics_{today}.jsonl", "ab", buffering=1 << 16
+        )
+    
+    def _write(self, metric: Dict[str, Any]) -> None:
+        """
+        Queue a metric line for writing.
+        
+        Lines are coalesced and written by a single deferred flush on the
+        running event loop, so recording never does file I/O per event.
+        """
+        self._pending.append(_json_dumps(metric))
+        if len(self._pending) >= self.FLUSH_BATCH_SIZE:
+            self.flush()
+            return
+        
+        loop = asyncio.get_running_loop()
+        if self._flush_handle is not None and self._flush_loop is not loop:
+            # Scheduled on a loop that has since gone away; it will never fire
+            self.flush()
+        if self._flush_handle is None:
+            self._flush_loop = loop
+            self._flush_handle = loop.call_later(self.FLUSH_INTERVAL, self.flush)
+    
+    def flush(self) -> None:
+        """Write all pending metric lines to the log file."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+            self._flush_loop = None
         
-        # No formatting - we'll write JSON directly
-        handler.setFormatter(logging.Formatter('%(message)s'))
+        if not self._pending or self._closed:
+            return
         
-        # Remove existing handlers to avoid duplicates
-        self.logger.handlers.clear()
-        self.logger.addHandler(handler)
-        self.logger.propagate = False
+        self._open_log_file()
+        self._pending.append(b"")
+        self._log_fh.write(b"\n".join(self._pending))
+        self._pending.clear()
+        self._log_fh.flush()
+    
+    def close(self) -> None:
+        """Flush pending lines and close the log file."""
+        self.flush()
+        self._closed = True
+        if self._log_fh is not None:
+            self._log_fh.close()
     
     async def record_pipeline_execution(self, context: Dict[str, Any]):
         """
@@ -82,16 +240,17 @@ class PerformanceMonitor:
         created_items = context.get("created_items", [])
         batch_embeddings = context.get("batch_embeddings", [])
         
-        # Calculate durations
-        total_duration = time.time() - context.get("start_time", time.time())
+        # Calculate durations (start_time and stage_timers are perf_counter values)
+        now = time.perf_counter()
+        total_duration = now - context.get("start_time", now)
         
         # Build metric record
         metric = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
             "type": "pipeline_execution",
             "total_duration": round(total_duration, 3),
             "stages": {
-                stage: round(time.time() - start, 3)
+                stage: round(now - start, 3)
                 for stage, start in stage_timers.items()
             },
             "facts": {
@@ -110,11 +269,18 @@ class PerformanceMonitor:
         self.stats["total_facts"] += len(created_items)
         self.stats["total_embeddings"] += metric["embeddings"]["count"]
         
-        # Store in memory
+        # Store in memory, keeping the window sums in step with the deque
+        if len(self.recent_metrics) == self.recent_metrics.maxlen:
+            evicted = self.recent_metrics[0]
+            self._window_duration_sum -= evicted["total_duration"]
+            self._window_facts_sum -= evicted["facts"]["stored"]
         self.recent_metrics.append(metric)
+        self._window_duration_sum += metric["total_duration"]
+        self._window_facts_sum += len(created_items)
+        self._p95_duration.add(metric["total_duration"])
         
         # Log to file
-        self.logger.info(json.dumps(metric))
+        self._write(metric)
     
     async def record_embedding_performance(self, context: Dict[str, Any]):
         """Record embedding-specific performance metrics."""
@@ -124,13 +290,13 @@ class PerformanceMonitor:
             return
         
         metric = {
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
             "type": "embedding_batch",
             "count": len(batch_embeddings),
             "stage": "store",
         }
         
-        self.logger.info(json.dumps(metric))
+        self._write(metric)
     
     def get_recent_metrics(self, limit: Optional[int] = None) -> List[Dict]:
         """Get recent metrics from memory."""
@@ -140,10 +306,15 @@ class PerformanceMonitor:
         return metrics
     
     def get_summary(self) -> Dict[str, Any]:
-        """Get aggregated performance summary."""
-        recent = list(self.recent_metrics)
+        """
+        Get aggregated performance summary.
+        
+        Averages cover the recent window; p95_duration is a streaming
+        estimate over every pipeline recorded since startup.
+        """
+        recent_count = len(self.recent_metrics)
         
-        if not recent:
+        if not recent_count:
             return {
                 "total_pipelines": self.stats["total_pipelines"],
                 "total_facts": self.stats["total_facts"],
@@ -152,54 +323,94 @@ class PerformanceMonitor:
                 "avg_facts_per_pipeline": 0,
             }
         
-        # Calculate averages from recent metrics
-        durations = [m["total_duration"] for m in recent if "total_duration" in m]
-        facts_per_pipeline = [m["facts"]["stored"] for m in recent if "facts" in m]
-        
         return {
             "total_pipelines": self.stats["total_pipelines"],
             "total_facts": self.stats["total_facts"],
             "total_embeddings": self.stats["total_embeddings"],
-            "recent_count": len(recent),
-            "avg_duration": round(statistics.mean(durations), 3) if durations else 0,
-            "avg_facts_per_pipeline": round(statistics.mean(facts_per_pipeline), 2) if facts_per_pipeline else 0,
-            "p95_duration": round(statistics.quantiles(durations, n=20)[18], 3) if len(durations) > 10 else 0,
+            "recent_count": recent_count,
+            "avg_duration": round(self._window_duration_sum / recent_count, 3),
+            "avg_facts_per_pipeline": round(self._window_facts_sum / recent_count, 2),
+            "p95_duration": round(self._p95_duration.value(), 3) if self._p95_duration.count > 10 else 0,
         }
     
     def get_log_files(self) -> List[str]:
-        """Get list of available log files."""
-        return sorted([
+        """Get list of available log files (cached for LOG_FILES_TTL seconds)."""
+        now = time.monotonic()
+        if self._log_files_cache is not None:
+            cached_at, files = self._log_files_cache
+            if now - cached_at < self.LOG_FILES_TTL:
+                return list(files)
+        
+        files = sorted([
             f.name for f in self.log_dir.glob("metrics_*.jsonl")
         ], reverse=True)
+        self._log_files_cache = (now, files)
+        return list(files)
     
     def read_log_file(self, filename: str, limit: Optional[int] = None) -> List[Dict]:
-        """Read metrics from a log file."""
+        """
+        Read metrics from a log file.
+        
+        With a limit only the tail of the file is scanned, so showing the
+        last few events does not parse the whole log.
+        """
         log_file = self.log_dir / filename
         
         if not log_file.exists():
             return []
         
+        # Make lines still buffered in memory visible to the reader
+        self.flush()
+        
+        if limit:
+            return self._read_tail(log_file, limit)
+        
         metrics = []
-        with open(log_file, 'r') as f:
+        with open(log_file, 'rb') as f:
             for line in f:
                 try:
-                    metrics.append(json.loads(line.strip()))
+                    metrics.append(_json_loads(line.strip()))
                 except json.JSONDecodeError:
                     continue
         
-        if limit:
-            metrics = metrics[-limit:]
+        return metrics
+    
+    @staticmethod
+    def _read_tail(log_file: Path, limit: int) -> List[Dict]:
+        """Parse the last `limit` valid lines by scanning a memory map backwards."""
+        metrics: List[Dict] = []
+        with open(log_file, 'rb') as f:
+            size = f.seek(0, 2)
+            if size == 0:
+                return metrics
+            
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                end = size
+                while end > 0 and len(metrics) < limit:
+                    start = mm.rfind(b"\n", 0, end - 1) + 1
+                    line = mm[start:end].strip()
+                    end = start
+                    if not line:
+                        continue
+                    try:
+                        metrics.append(_json_loads(line))
+                    except json.JSONDecodeError:
+                        continue
         
+        metrics.reverse()
         return metrics
 
 
 # Global monitor instance
 _monitor: Optional[PerformanceMonitor] = None
+_monitor_lock = threading.Lock()
 
 
 def get_monitor(log_dir: str = "logs") -> PerformanceMonitor:
-    """Get or create global monitor instance."""
+    """Get or create global monitor instance (safe to call from any thread)."""
     global _monitor
     if _monitor is None:
-        _monitor = PerformanceMonitor(log_dir=log_dir)
+        with _monitor_lock:
+            if _monitor is None:
+                _monitor = PerformanceMonitor(log_dir=log_dir)
     return _monitor
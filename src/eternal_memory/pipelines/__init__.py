@@ -3,7 +3,7 @@
 from eternal_memory.pipelines.memorize import MemorizePipeline
 from eternal_memory.pipelines.retrieve import RetrievePipeline
 from eternal_memory.pipelines.consolidate import ConsolidatePipeline
-from eternal_memory.pipelines.memorize import MemorizePipeline
+from eternal_memory.pipelines.predict import PredictPipeline
 from eternal_memory.pipelines.flush import FlushPipeline
 
 __all__ = ["MemorizePipeline", "RetrievePipeline", "ConsolidatePipeline", "PredictPipeline", "FlushPipeline"]
@@ -0,0 +1,77 @@
+"""
+Recent Memory Cache
+
+In-process cache of recently stored or reinforced memories, consulted
+before the content-hash lookup. Users often repeat themselves within a
+session; a hit lets the memorize pipeline reinforce the memory by ID
+without a database round-trip or an embedding call.
+
+Only exact (normalized) content repeats are answered here. Near-duplicates
+are left to the indexed pgvector search: scanning cached vectors in Python
+costs more per miss than that query.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Optional
+from uuid import UUID
+
+from eternal_memory.models.memory_item import MemoryItem
+
+
+def _normalize_content(content: str) -> str:
+    return " ".join(content.lower().split())
+
+
+class RecentMemoryCache:
+    """
+    Bounded cache of recent memories keyed by normalized content.
+
+    Entries are only a hint: callers must fall back to the database when
+    the cached item no longer exists.
+    """
+
+    def __init__(self, max_size: int = 128):
+        """
+        Args:
+            max_size: Maximum number of cached memories (oldest evicted first)
+        """
+        self.max_size = max_size
+
+        # item ID -> (item, normalized content), oldest first
+        self._entries: "OrderedDict[UUID, tuple[MemoryItem, str]]" = OrderedDict()
+        self._by_content: Dict[str, UUID] = {}
+
+        # Statistics
+        self.hits = 0
+        self.misses = 0
+
+    def find_exact(self, content: str) -> Optional[MemoryItem]:
+        """Return a cached memory with the same normalized content, if any."""
+        item_id = self._by_content.get(_normalize_content(content))
+        if item_id is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(item_id)
+        return self._entries[item_id][0]
+
+    def add(self, item: MemoryItem) -> None:
+        """Cache a memory that was just stored or reinforced."""
+        self.discard(item.id)
+        key = _normalize_content(item.content)
+        self._entries[item.id] = (item, key)
+        self._by_content[key] = item.id
+
+        while len(self._entries) > self.max_size:
+            self.discard(next(iter(self._entries)))
+
+    def discard(self, item_id: UUID) -> None:
+        """Forget a memory (e.g. it was deleted or superseded)."""
+        entry = self._entries.pop(item_id, None)
+        if entry is not None and self._by_content.get(entry[1]) == item_id:
+            del self._by_content[entry[1]]
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+        self._by_content.clear()
@@ -5,21 +5,107 @@ Analyzes a buffer of messages to extract durable memories before compaction/dele
 Also extracts immediate user insights for USER.md (near-real-time user profiling).
 """
 
+import asyncio
+import hashlib
+import re
+import time
+from collections import OrderedDict, defaultdict
 from datetime import datetime
-from typing import List, Optional, TYPE_CHECKING
+from typing import Any, Awaitable, Callable, List, Optional, Tuple, TYPE_CHECKING
+from uuid import UUID
 import logging
 
-from eternal_memory.database.repository import MemoryRepository
-from eternal_memory.llm.client import LLMClient
-from eternal_memory.models.memory_item import MemoryItem
-from eternal_memory.pipelines.memorize import MemorizePipeline
-from eternal_memory.vault.markdown_vault import MarkdownVault
-
 if TYPE_CHECKING:
+    # Annotations only: the pipeline is handed these objects, never builds them
     from eternal_memory.agent.user_model import UserModel
+    from eternal_memory.database.repository import MemoryRepository
+    from eternal_memory.llm.client import LLMClient
+    from eternal_memory.llm.response_cache import LLMResponseCache
+    from eternal_memory.models.memory_item import MemoryItem
+    from eternal_memory.pipelines.memorize import MemorizePipeline
+    from eternal_memory.vault.markdown_vault import MarkdownVault
 
 logger = logging.getLogger("eternal_memory.pipelines.flush")
 
+# Static parts of the LLM prompts; the transcript goes between prefix and suffix
+_EXTRACT_PREFIX = """Analyze this conversation transcript and extract specific, enduring facts about the user that should be committed to long-term memory.
+Focus on user preferences, biographical details, and relationships.
+Do NOT extract trivial details or current context that will become irrelevant (like "user wants to write code").
+
+Transcript:
+"""
+_EXTRACT_SUFFIX = """
+
+Respond with a list of facts, one per line.
+If there are no enduring facts to save, respond with "NONE".
+"""
+
+_INSIGHTS_PREFIX = """Analyze this conversation and extract IMMEDIATE facts about the user 
+that should be recorded in their profile for future personalization.
+
+Focus on:
+- Explicit statements: "I am...", "I prefer...", "I work as...", "I don't like..."
+- Dietary restrictions, accessibility needs, or constraints
+- Timezone, language preferences, communication style
+- Current projects or active contexts
+
+Examples of what to capture:
+- "I'm vegan" → Established Preferences: User follows a vegan diet
+- "I work at Samsung" → Core Identity: Works at Samsung
+- "I use TypeScript for everything" → Technical Context: Prefers TypeScript
+
+Conversation:
+"""
+_INSIGHTS_SUFFIX = """
+
+Output JSON with this structure:
+{
+  "insights": [
+    {
+      "section": "Established Preferences",
+      "content": "User follows a vegan diet",
+      "confidence": 0.95,
+      "evidence_count": 1,
+      "source_quote": "I'm vegan"
+    }
+  ]
+}
+
+Valid sections: "Core Identity", "Established Preferences", "Work Patterns", 
+"Communication Style", "Technical Context", "Constraints"
+
+If no significant user facts found, return: {"insights": []}
+Only include facts explicitly stated or strongly implied by the user."""
+
+# One fact per line: optional "- ", "* " or "• " bullet, surrounding blanks trimmed
+_FACT_LINE_RE = re.compile(r"^[ \t]*(?:[-*•][ \t]+)?(\S[^\n]*?)[ \t\r]*$", re.MULTILINE)
+
+
+def _parse_facts(text: str) -> List[str]:
+    """Extract fact lines from an extraction response, skipping "NONE"."""
+    return [
+        fact for fact in (m.group(1) for m in _FACT_LINE_RE.finditer(text))
+        if fact.casefold() != "none"
+    ]
+
+
+# Transcript role labels for the common roles
+_ROLE_LABELS = {"user": "USER", "assistant": "ASSISTANT", "system": "SYSTEM"}
+
+
+def _format_transcript(messages: List[dict]) -> str:
+    """Render messages as "ROLE: content" lines."""
+    labels = _ROLE_LABELS
+    return "\n".join([
+        f"{labels.get(m['role']) or m['role'].upper()}: {m['content']}" for m in messages
+    ])
+
+
+def _prepare_transcript(messages: List[dict]) -> Tuple[str, bytes]:
+    """Transcript text and its dedup digest."""
+    transcript = _format_transcript(messages)
+    return transcript, hashlib.blake2b(transcript.encode("utf-8"), digest_size=16).digest()
+
 
 class FlushPipeline:
     """
@@ -39,21 +125,75 @@ class FlushPipeline:
     IMMEDIATE_CONFIDENCE_THRESHOLD = 0.6
     IMMEDIATE_EVIDENCE_THRESHOLD = 1
     
+    # Recently flushed transcripts remembered for deduplication
+    DEDUP_MAX_ENTRIES = 256
+    
+    # Buffers at least this long are formatted off the event loop
+    TRANSCRIPT_OFFLOAD_MESSAGES = 500
+    
     def __init__(
         self,
-        repository: MemoryRepository,
-        llm_client: LLMClient,
-        vault: MarkdownVault,
-        memorize_pipeline: MemorizePipeline,
+        repository: "MemoryRepository",
+        llm_client: "LLMClient",
+        vault: "MarkdownVault",
+        memorize_pipeline: "MemorizePipeline",
         user_model: Optional["UserModel"] = None,
+        response_cache: Optional["LLMResponseCache"] = None,
+        dedup_ttl_seconds: float = 600.0,
+        stream_extraction: bool = False,
     ):
+        """
+        Args:
+            response_cache: Cache for the extraction and insights LLM calls
+                (exact prompt matches only)
+            dedup_ttl_seconds: How long a flushed transcript is remembered
+                (0 disables transcript deduplication)
+            stream_extraction: Stream the extraction response and store each
+                fact as soon as its line arrives (uses llm.stream_complete)
+        """
         self.repository = repository
         self.llm = llm_client
         self.vault = vault
         self.memorize_pipeline = memorize_pipeline
         self.user_model = user_model
+        self.response_cache = response_cache
+        self.dedup_ttl_seconds = dedup_ttl_seconds
+        self.stream_extraction = stream_extraction
+        
+        # transcript digest -> (expires_at, IDs of the items it produced)
+        self._flush_cache: "OrderedDict[bytes, Tuple[float, List[UUID]]]" = OrderedDict()
+    
+    async def _complete(
+        self,
+        prompt: str,
+        response_format: Optional[str] = None,
+        compute: Optional[Callable[[], Awaitable[Any]]] = None,
+    ):
+        """
+        Run an LLM completion through the response cache, if configured.
+        
+        Only exact prompt matches are served: a transcript that differs at
+        all (e.g. one new message in a sliding window) may hold new facts,
+        so a semantically similar earlier response must never stand in.
+        compute overrides how the completion is produced on a cache miss.
+        """
+        if compute is None:
+            async def compute():
+                if response_format:
+                    return await self.llm.complete(prompt, response_format=response_format)
+                return await self.llm.complete(prompt)
+        
+        if self.response_cache is None:
+            return await compute()
         
-    async def execute(self, messages: List[dict]) -> List[MemoryItem]:
+        return await self.response_cache.get_or_compute(
+            prompt,
+            compute,
+            model=getattr(self.llm, "model", ""),
+            response_format=response_format,
+        )
+    
+    async def execute(self, messages: List[dict]) -> List["MemoryItem"]:
         """
         Execute flush pipeline.
         
@@ -66,59 +206,155 @@ class FlushPipeline:
         if not messages:
             return []
             
-        # 1. Prepare context for LLM
-        transcript = "\n".join([f"{m['role'].upper()}: {m['content']}" for m in messages])
+        # 1. Prepare context for LLM; a large batch flush would otherwise
+        # hold the event loop while its transcript is built and hashed
+        if len(messages) >= self.TRANSCRIPT_OFFLOAD_MESSAGES:
+            transcript, digest = await asyncio.to_thread(_prepare_transcript, messages)
+        else:
+            transcript, digest = _prepare_transcript(messages)
         
-        # 2. Prompt LLM for extraction
-        prompt = f"""Analyze this conversation transcript and extract specific, enduring facts about the user that should be committed to long-term memory.
-Focus on user preferences, biographical details, and relationships.
-Do NOT extract trivial details or current context that will become irrelevant (like "user wants to write code").
-
-Transcript:
-{transcript}
-
-Respond with a list of facts, one per line.
-If there are no enduring facts to save, respond with "NONE".
-"""
+        # Same transcript flushed recently: return what it produced then
+        cached_ids = self._get_flushed(digest)
+        if cached_ids is not None:
+            logger.debug("Transcript already flushed; skipping extraction")
+            return await self.repository.get_memory_items_by_ids(cached_ids) if cached_ids else []
         
-        response = await self.llm.complete(prompt)
+        # 2. Prompt LLM for extraction
+        prompt = _EXTRACT_PREFIX + transcript + _EXTRACT_SUFFIX
         
-        created_items = []
+        # 3. Extract and store facts; the insights prompt reads the same
+        # transcript, so issue both concurrently
+        extraction = self._extract_and_store(prompt)
+        insights_response = None
+        if self.user_model:
+            created_items, insights_response = await asyncio.gather(
+                extraction,
+                self._complete(
+                    self._build_insights_prompt(transcript),
+                    response_format="json_object",
+                ),
+                return_exceptions=True,
+            )
+            if isinstance(created_items, BaseException):
+                raise created_items
+        else:
+            created_items = await extraction
         
-        # 3. Process response
-        if response and response.strip().upper() != "NONE":
-            for line in response.split("\n"):
-                line = line.strip()
-                if not line or line.upper() == "NONE":
-                    continue
-                    
-                # Clean up bullets if present
-                if line.startswith("- "):
-                    line = line[2:]
-                
-                # Use standard memorize pipeline to store this fact
-                # This handles categorization, embedding, and saving
-                item = await self.memorize_pipeline.store_single_memory(
-                    content=line,
-                    metadata={"source": "memory_flush", "timestamp": datetime.now().isoformat()}
-                )
-                created_items.append(item)
-        
-        # 4. Extract immediate user insights to USER.md
+        # 4. Add immediate user insights to USER.md
         if self.user_model:
-            await self._extract_immediate_user_insights(transcript)
+            if isinstance(insights_response, BaseException):
+                logger.error(f"Failed to extract immediate user insights: {insights_response}")
+            else:
+                await self._apply_insights(insights_response)
         
+        self._remember_flushed(digest, [item.id for item in created_items])
         return created_items
     
-    async def _extract_immediate_user_insights(self, transcript: str) -> int:
+    async def _extract_and_store(self, prompt: str) -> List["MemoryItem"]:
+        """
+        Run the extraction prompt and store each extracted fact.
+        
+        Facts are stored concurrently, each dispatched as soon as its line
+        is known; with stream_extraction that is while the LLM is still
+        generating the remaining lines.
+        """
+        tasks: List[asyncio.Task] = []
+        content_locks = defaultdict(asyncio.Lock)
+        streamed = False
+        # Facts of one flush share its timestamp
+        now = datetime.now()
+        timestamp = now.isoformat()
+        
+        def dispatch(text: str) -> None:
+            for fact in _parse_facts(text):
+                tasks.append(asyncio.create_task(
+                    self._store_fact(fact, content_locks, timestamp, now)
+                ))
+        
+        async def stream() -> str:
+            nonlocal streamed
+            streamed = True
+            parts = []
+            pending = ""
+            async for chunk in self.llm.stream_complete(prompt):
+                parts.append(chunk)
+                pending += chunk
+                if "\n" in chunk:
+                    # Dispatch every completed line, keep the partial tail
+                    complete, _, pending = pending.rpartition("\n")
+                    dispatch(complete)
+            dispatch(pending)
+            return "".join(parts)
+        
+        try:
+            response = await self._complete(
+                prompt,
+                compute=stream if self.stream_extraction else None,
+            )
+            # Non-streamed (or cached) responses are dispatched in one go
+            if not streamed and response:
+                dispatch(response)
+        finally:
+            # Let already-dispatched stores finish even if the LLM call failed
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return list(results)
+    
+    async def _store_fact(
+        self, content: str, content_locks: dict, timestamp: str, now: datetime
+    ) -> "MemoryItem":
+        """Store one extracted fact through the standard memorize pipeline."""
+        # Repeats of a fact wait for the first copy, which they then reinforce
+        async with content_locks[" ".join(content.lower().split())]:
+            # This handles categorization, embedding, and saving
+            return await self.memorize_pipeline.store_single_memory(
+                content=content,
+                metadata={"source": "memory_flush", "timestamp": timestamp},
+                now=now,
+            )
+    
+    def _get_flushed(self, digest: bytes) -> Optional[List[UUID]]:
+        """Item IDs produced by a live earlier flush of the same transcript."""
+        entry = self._flush_cache.get(digest)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._flush_cache[digest]
+            return None
+        self._flush_cache.move_to_end(digest)
+        return entry[1]
+    
+    def _remember_flushed(self, digest: bytes, item_ids: List[UUID]) -> None:
+        """Record a completed flush (IDs only, to keep the cache small)."""
+        if self.dedup_ttl_seconds <= 0:
+            return
+        self._flush_cache[digest] = (time.monotonic() + self.dedup_ttl_seconds, item_ids)
+        self._flush_cache.move_to_end(digest)
+        while len(self._flush_cache) > self.DEDUP_MAX_ENTRIES:
+            self._flush_cache.popitem(last=False)
+    
+    @staticmethod
+    def _build_insights_prompt(transcript: str) -> str:
+        """
+        Build the prompt for immediate user insight extraction.
+        
+        Args:
+            transcript: Formatted conversation transcript
+        """
+        return _INSIGHTS_PREFIX + transcript + _INSIGHTS_SUFFIX
+
+    async def _apply_insights(self, response: dict) -> int:
         """
-        Extract immediate user insights from conversation and add to USER.md.
+        Filter extracted user insights and add them to USER.md.
         
         Uses a lower quality threshold for "in the moment" capture.
         The daily profile_reflection job will validate and strengthen these later.
         
         Args:
-            transcript: Formatted conversation transcript
+            response: Parsed JSON response to the insights prompt
             
         Returns:
             Number of insights added
@@ -126,45 +362,7 @@ If there are no enduring facts to save, respond with "NONE".
         if not self.user_model:
             return 0
         
-        # Prompt for immediate user facts
-        prompt = f"""Analyze this conversation and extract IMMEDIATE facts about the user 
-that should be recorded in their profile for future personalization.
-
-Focus on:
-- Explicit statements: "I am...", "I prefer...", "I work as...", "I don't like..."
-- Dietary restrictions, accessibility needs, or constraints
-- Timezone, language preferences, communication style
-- Current projects or active contexts
-
-Examples of what to capture:
-- "I'm vegan" → Established Preferences: User follows a vegan diet
-- "I work at Samsung" → Core Identity: Works at Samsung
-- "I use TypeScript for everything" → Technical Context: Prefers TypeScript
-
-Conversation:
-{transcript}
-
-Output JSON with this structure:
-{{
-  "insights": [
-    {{
-      "section": "Established Preferences",
-      "content": "User follows a vegan diet",
-      "confidence": 0.95,
-      "evidence_count": 1,
-      "source_quote": "I'm vegan"
-    }}
-  ]
-}}
-
-Valid sections: "Core Identity", "Established Preferences", "Work Patterns", 
-"Communication Style", "Technical Context", "Constraints"
-
-If no significant user facts found, return: {{"insights": []}}
-Only include facts explicitly stated or strongly implied by the user."""
-
         try:
-            response = await self.llm.complete(prompt, response_format="json_object")
             insights = response.get("insights", [])
             
             if not insights:
@@ -187,28 +385,18 @@ Only include facts explicitly stated or strongly implied by the user."""
             if not filtered_insights:
                 return 0
             
-            # Add to USER.md with adjusted thresholds
-            # We need to temporarily lower the UserModel thresholds
-            original_min_confidence = self.user_model.MIN_CONFIDENCE
-            original_min_evidence = self.user_model.MIN_EVIDENCE
+            # Add to USER.md with the lower immediate-capture thresholds
+            added = await self.user_model.batch_update(
+                filtered_insights,
+                min_confidence=self.IMMEDIATE_CONFIDENCE_THRESHOLD,
+                min_evidence=self.IMMEDIATE_EVIDENCE_THRESHOLD,
+            )
             
-            try:
-                # Temporarily lower thresholds for immediate capture
-                self.user_model.MIN_CONFIDENCE = self.IMMEDIATE_CONFIDENCE_THRESHOLD
-                self.user_model.MIN_EVIDENCE = self.IMMEDIATE_EVIDENCE_THRESHOLD
-                
-                added = await self.user_model.batch_update(filtered_insights)
-                
-                if added > 0:
-                    logger.info(f"🧠 Immediate capture: added {added} user insights to USER.md")
-                
-                return added
-                
-            finally:
-                # Restore original thresholds
-                self.user_model.MIN_CONFIDENCE = original_min_confidence
-                self.user_model.MIN_EVIDENCE = original_min_evidence
+            if added > 0:
+                logger.info(f"🧠 Immediate capture: added {added} user insights to USER.md")
+            
+            return added
                 
         except Exception as e:
-            logger.error(f"Failed to extract immediate user insights: {e}")
+            logger.error(f"Failed to apply immediate user insights: {e}")
             return 0
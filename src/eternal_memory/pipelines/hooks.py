@@ -6,7 +6,8 @@ enabling observability, logging, and custom logic injection.
 """
 
 import logging
-from typing import Callable, Dict, List, Any, Optional
+from collections import defaultdict
+from typing import Callable, Dict, List, Any, Optional, Tuple
 import asyncio
 
 logger = logging.getLogger("eternal_memory.hooks")
@@ -22,7 +23,8 @@ class PipelineHookManager:
     Features:
     - Before/After hooks for any stage
     - Wildcard support ("*") for all stages
-    - Async hook execution
+    - Async hook execution (concurrent by default, sequential per manager
+      or per call)
     - Context passing between hooks and pipeline
     
     Example:
@@ -35,9 +37,20 @@ class PipelineHookManager:
         >>> await hooks.execute_before("extract", {"text": "..."})
     """
     
-    def __init__(self):
-        self.before_hooks: Dict[str, List[Callable]] = {}
-        self.after_hooks: Dict[str, List[Callable]] = {}
+    def __init__(self, sequential: bool = False):
+        """
+        Args:
+            sequential: Default for execute_before/after; True awaits each
+                hook before starting the next (for hooks relying on order)
+        """
+        self.sequential = sequential
+        self.before_hooks: Dict[str, List[Callable]] = defaultdict(list)
+        self.after_hooks: Dict[str, List[Callable]] = defaultdict(list)
+        
+        # stage -> ((hook, is_wildcard), ...) in dispatch order; rebuilt
+        # lazily after any registration change
+        self._before_chain_cache: Dict[str, Tuple[Tuple[Callable, bool], ...]] = {}
+        self._after_chain_cache: Dict[str, Tuple[Tuple[Callable, bool], ...]] = {}
     
     def register_before(self, stage: str, hook: Callable) -> None:
         """
@@ -47,9 +60,8 @@ class PipelineHookManager:
             stage: Stage name (e.g., "extract", "store") or "*" for all stages
             hook: Async callable that accepts context dict
         """
-        if stage not in self.before_hooks:
-            self.before_hooks[stage] = []
         self.before_hooks[stage].append(hook)
+        self._before_chain_cache.clear()  # a wildcard hook affects every stage
         logger.debug(f"Registered before hook for stage: {stage}")
     
     def register_after(self, stage: str, hook: Callable) -> None:
@@ -60,9 +72,8 @@ class PipelineHookManager:
             stage: Stage name (e.g., "extract", "store") or "*" for all stages
             hook: Async callable that accepts context dict
         """
-        if stage not in self.after_hooks:
-            self.after_hooks[stage] = []
         self.after_hooks[stage].append(hook)
+        self._after_chain_cache.clear()  # a wildcard hook affects every stage
         logger.debug(f"Registered after hook for stage: {stage}")
     
     def before(self, stage: str):
@@ -93,53 +104,97 @@ class PipelineHookManager:
             return func
         return decorator
     
-    async def execute_before(self, stage: str, context: Dict[str, Any]) -> None:
+    async def execute_before(
+        self,
+        stage: str,
+        context: Dict[str, Any],
+        sequential: Optional[bool] = None,
+    ) -> None:
         """
         Execute all before hooks for a stage.
         
-        Runs hooks in registration order. Wildcard hooks ("*") run first.
+        Hooks run concurrently; each is started in registration order with
+        wildcard hooks ("*") first, so hooks that do not await keep that
+        order. Pass sequential=True to await each hook before starting the next.
         
         Args:
             stage: Current pipeline stage
             context: Mutable context dict shared across hooks and pipeline
+            sequential: Run hooks one at a time in order (default: the
+                manager's setting)
         """
-        # Execute wildcard hooks first
-        for hook in self.before_hooks.get("*", []):
-            try:
-                await hook(stage, context)
-            except Exception as e:
-                logger.error(f"Before hook failed for stage '{stage}': {e}", exc_info=True)
-        
-        # Execute stage-specific hooks
-        for hook in self.before_hooks.get(stage, []):
-            try:
-                await hook(context)
-            except Exception as e:
-                logger.error(f"Before hook failed for stage '{stage}': {e}", exc_info=True)
+        chain = self._before_chain_cache.get(stage)
+        if chain is None:
+            chain = self._before_chain_cache[stage] = (
+                tuple((hook, True) for hook in self.before_hooks.get("*", ()))
+                + tuple((hook, False) for hook in self.before_hooks.get(stage, ()))
+            )
+        await self._run_hooks("Before", stage, context, chain, sequential)
     
-    async def execute_after(self, stage: str, context: Dict[str, Any]) -> None:
+    async def execute_after(
+        self,
+        stage: str,
+        context: Dict[str, Any],
+        sequential: Optional[bool] = None,
+    ) -> None:
         """
         Execute all after hooks for a stage.
         
-        Runs hooks in registration order. Stage-specific hooks run before wildcards.
+        Hooks run concurrently; each is started in registration order with
+        stage-specific hooks before wildcards. Pass sequential=True to await
+        each hook before starting the next.
         
         Args:
             stage: Current pipeline stage
             context: Mutable context dict shared across hooks and pipeline
+            sequential: Run hooks one at a time in order (default: the
+                manager's setting)
         """
-        # Execute stage-specific hooks first
-        for hook in self.after_hooks.get(stage, []):
-            try:
-                await hook(context)
-            except Exception as e:
-                logger.error(f"After hook failed for stage '{stage}': {e}", exc_info=True)
+        chain = self._after_chain_cache.get(stage)
+        if chain is None:
+            chain = self._after_chain_cache[stage] = (
+                tuple((hook, False) for hook in self.after_hooks.get(stage, ()))
+                + tuple((hook, True) for hook in self.after_hooks.get("*", ()))
+            )
+        await self._run_hooks("After", stage, context, chain, sequential)
+    
+    async def _run_hooks(
+        self,
+        kind: str,
+        stage: str,
+        context: Dict[str, Any],
+        chain: Tuple[Tuple[Callable, bool], ...],
+        sequential: Optional[bool],
+    ) -> None:
+        """Run a dispatch chain, logging (not raising) hook failures."""
+        if sequential is None:
+            sequential = self.sequential
+        if sequential or len(chain) < 2:
+            for hook, is_wildcard in chain:
+                try:
+                    if is_wildcard:
+                        await hook(stage, context)
+                    else:
+                        await hook(context)
+                except Exception as e:
+                    logger.error(f"{kind} hook failed for stage '{stage}': {e}", exc_info=True)
+            return
         
-        # Execute wildcard hooks last
-        for hook in self.after_hooks.get("*", []):
-            try:
-                await hook(stage, context)
-            except Exception as e:
-                logger.error(f"After hook failed for stage '{stage}': {e}", exc_info=True)
+        results = await asyncio.gather(
+            *(
+                hook(stage, context) if is_wildcard else hook(context)
+                for hook, is_wildcard in chain
+            ),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(
+                    f"{kind} hook failed for stage '{stage}': {result}",
+                    exc_info=result,
+                )
+            elif isinstance(result, BaseException):
+                raise result
     
     def clear_hooks(self, stage: Optional[str] = None) -> None:
         """
@@ -154,6 +209,8 @@ class PipelineHookManager:
         else:
             self.before_hooks.clear()
             self.after_hooks.clear()
+        self._before_chain_cache.clear()
+        self._after_chain_cache.clear()
     
     def get_hook_count(self, stage: Optional[str] = None) -> Dict[str, int]:
         """Get count of registered hooks."""
@@ -8,19 +8,47 @@ Implements the memory storage pipeline as specified in Section 5.1:
 4. Append to corresponding Markdown file
 """
 
-from datetime import datetime
-from typing import List, Optional
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple, TYPE_CHECKING
 from uuid import uuid4
+import asyncio
+import logging
+import re
 import time
 
-from eternal_memory.database.repository import MemoryRepository
-from eternal_memory.llm.client import LLMClient
-from eternal_memory.models.memory_item import Category, MemoryItem, MemoryType, Resource
-from eternal_memory.models.semantic_triple import SemanticTriple
-from eternal_memory.vault.markdown_vault import MarkdownVault
+from eternal_memory.models._raw import RawMemoryItem, RawSemanticTriple
+from eternal_memory.models.memory_item import (
+    Category,
+    MemoryItem,
+    MemoryType,
+    Resource,
+    content_hash,
+)
+from eternal_memory.pipelines.dedup_cache import RecentMemoryCache
 from eternal_memory.pipelines.hooks import PipelineHookManager
+from eternal_memory.vault.markdown_vault import VaultBatch
 from eternal_memory.config import LLMConfig
 
+if TYPE_CHECKING:
+    from eternal_memory.database.repository import MemoryRepository
+    from eternal_memory.llm.client import LLMClient
+    from eternal_memory.vault.markdown_vault import MarkdownVault
+
+logger = logging.getLogger("eternal_memory.pipelines.memorize")
+
+# Greetings and acknowledgements that never carry a fact
+_TRIVIAL_INPUT = re.compile(
+    r"(?:hi|hello|hey|ok(?:ay)?|yes|yeah|yep|no|nope|sure|cool|nice|great|lol|bye"
+    r"|thanks?(?: you)?|thx|good (?:morning|night))[\s!.?]*",
+    re.IGNORECASE,
+)
+
+
+def _resource_uri(metadata: dict, now: datetime) -> str:
+    """The caller's resource URI, or a conversation URI stamped with now."""
+    return metadata["uri"] if "uri" in metadata else f"conversation/{now.isoformat()}"
+
 
 class MemorizePipeline:
     """
@@ -31,11 +59,26 @@ class MemorizePipeline:
     Vector DB Storage → Markdown Sync
     """
     
+    # Minimum similarity at which a new fact reinforces an existing memory
+    DUPLICATE_THRESHOLD = 0.95
+    
+    # Recently stored/reinforced memories checked (by exact content) before
+    # the content-hash lookup
+    RECENT_CACHE_SIZE = 128
+    
+    # Category paths resolved without a DB lookup (LRU)
+    CATEGORY_CACHE_SIZE = 256
+    
+    # Streamed facts are looked up and embedded in micro-batches of up to
+    # this many facts, or of whatever arrived within the delay (seconds)
+    PREPARE_BATCH_SIZE = 8
+    PREPARE_BATCH_DELAY = 0.2
+    
     def __init__(
         self,
-        repository: MemoryRepository,
-        llm_client: LLMClient,
-        vault: MarkdownVault,
+        repository: "MemoryRepository",
+        llm_client: "LLMClient",
+        vault: "MarkdownVault",
         enable_monitoring: bool = True,
         llm_config: Optional[LLMConfig] = None,
     ):
@@ -44,6 +87,16 @@ class MemorizePipeline:
         self.vault = vault
         self.llm_config = llm_config or LLMConfig()
         
+        # Serializes category creation between concurrently stored facts.
+        # Keyed by top-level segment: paths that can share a missing
+        # ancestor always share their root, other trees are created in parallel
+        self._category_locks = defaultdict(asyncio.Lock)
+        # path -> Category; categories are never renamed or deleted while
+        # the pipeline lives (a reset rebuilds it), so entries stay valid
+        self._category_cache: "OrderedDict[str, Category]" = OrderedDict()
+        
+        self.recent_memories = RecentMemoryCache(max_size=self.RECENT_CACHE_SIZE)
+        
         # Initialize hook system
         self.hooks = PipelineHookManager()
         self._register_default_hooks()
@@ -71,18 +124,31 @@ class MemorizePipeline:
         """
         metadata = metadata or {}
         created_items: List[MemoryItem] = []
+        # One clock read for every resource URI and timeline entry of this call
+        now = datetime.now()
+        
+        # Blank, trivial or too short to hold a fact: log it, skip the LLM round-trip
+        stripped = text.strip()
+        if (
+            not stripped
+            or len(stripped) < self.llm_config.min_extract_chars
+            or _TRIVIAL_INPUT.fullmatch(stripped)
+        ):
+            if stripped:
+                await self.vault.append_to_timeline(text, now)
+            return []
         
         # Initialize pipeline context
         context = {
             "text": text,
             "metadata": metadata,
             "created_items": created_items,
-            "start_time": time.time(),
+            "start_time": time.perf_counter(),
         }
         
         # 1. Create resource entry for traceability
         resource = Resource(
-            uri=metadata.get("uri", f"conversation/{datetime.now().isoformat()}"),
+            uri=_resource_uri(metadata, now),
             modality=metadata.get("modality", "conversation"),
             content=text,
             metadata=metadata,
@@ -93,11 +159,43 @@ class MemorizePipeline:
         # 2. Extract facts using LLM (No longer needs all category_paths)
         await self.hooks.execute_before("extract", context)
         
-        extracted_facts = await self.llm.extract_facts(text, [])
+        # Facts are streamed: the exact-repeat lookup and embedding of each
+        # micro-batch start while the LLM is still generating later facts
+        extracted_facts = []
+        raw_facts: List[RawMemoryItem] = []
+        prepare_tasks = []
+        pending: List[RawMemoryItem] = []
+        loop = asyncio.get_running_loop()
+        pending_since = 0.0
+        try:
+            async for fact in self.llm.stream_extract_facts(text, []):
+                extracted_facts.append(fact)
+                raw = RawMemoryItem.from_dict(fact)
+                if not raw.content:
+                    continue
+                if not pending:
+                    pending_since = loop.time()
+                pending.append(raw)
+                if (
+                    len(pending) >= self.PREPARE_BATCH_SIZE
+                    or loop.time() - pending_since >= self.PREPARE_BATCH_DELAY
+                ):
+                    prepare_tasks.append(asyncio.create_task(self._prepare_facts(pending)))
+                    raw_facts.extend(pending)
+                    pending = []
+            if pending:
+                prepare_tasks.append(asyncio.create_task(self._prepare_facts(pending)))
+                raw_facts.extend(pending)
+            prepared = await asyncio.gather(*prepare_tasks)
+        except BaseException:
+            for task in prepare_tasks:
+                task.cancel()
+            await asyncio.gather(*prepare_tasks, return_exceptions=True)
+            raise
         
         if not extracted_facts:
             # No meaningful facts extracted, still log to timeline
-            await self.vault.append_to_timeline(text, datetime.now())
+            await self.vault.append_to_timeline(text, now)
             context["extracted_facts"] = []
             await self.hooks.execute_after("extract", context)
             return []
@@ -105,44 +203,135 @@ class MemorizePipeline:
         context["extracted_facts"] = extracted_facts
         await self.hooks.execute_after("extract", context)
         
-        # 3. Batch embed all facts at once (Performance optimization)
-        # This reduces API calls from N to 1, saving ~70% cost and ~5x speed
-        fact_contents = [fact.get("content", "") for fact in extracted_facts if fact.get("content")]
-        
-        if not fact_contents:
+        if not raw_facts:
             return []
         
-        # Single batch API call instead of N individual calls
-        batch_embeddings = await self.llm.batch_generate_embeddings(fact_contents)
-        context["batch_embeddings"] = batch_embeddings
+        # 3. Facts were embedded per micro-batch; exact repeats of stored
+        # memories were matched by content and have no embedding
+        matches: List[List[MemoryItem]] = []
+        batch_embeddings: List[Optional[List[float]]] = []
+        for batch_matches, embeddings in prepared:
+            matches.extend(batch_matches)
+            batch_embeddings.extend(embeddings)
+        to_embed = [i for i, embedding in enumerate(batch_embeddings) if embedding is not None]
+        if to_embed:
+            context["batch_embeddings"] = [batch_embeddings[i] for i in to_embed]
+        
+        # One LLM importance rating for every fact that may be stored,
+        # overlapped with the duplicate search
+        importance_task = None
+        to_rate = [i for i in to_embed if raw_facts[i].importance == 0.5]
+        if self.llm_config.use_llm_importance and to_rate:
+            importance_task = asyncio.create_task(
+                self._batch_rate_importance([raw_facts[i].content for i in to_rate])
+            )
         
         # 4. Process each extracted fact with pre-computed embeddings
         await self.hooks.execute_before("store", context)
         
-        for i, fact in enumerate(extracted_facts):
-            content = fact.get("content", "")
-            if not content:
-                continue
-            
-            # Smart Categorization using pre-computed embedding
-            item = await self.store_single_memory(
-                content=content,
-                fact_type=fact.get("type", "fact"),
-                importance=float(fact.get("importance", 0.5)),
-                metadata={"resource_id": str(resource.id)},
-                skip_resource=True,  # Resource already created
-                precomputed_embedding=batch_embeddings[i]  # Pass pre-computed embedding
+        # Near-duplicate detection: a single indexed round-trip for every
+        # fact that was not an exact repeat
+        if to_embed:
+            found = await self.repository.vector_search_batch(
+                query_embeddings=[batch_embeddings[i] for i in to_embed],
+                limit=1,
+                threshold=self.DUPLICATE_THRESHOLD,
             )
-            created_items.append(item)
+            for i, items in zip(to_embed, found):
+                matches[i] = items
+                if items:
+                    self.recent_memories.add(items[0])
+        
+        results: List[Optional[MemoryItem]] = [None] * len(raw_facts)
+        duplicates = {}  # existing item ID -> (existing item, fact indices)
+        new_facts = []
+        for i, fact in enumerate(raw_facts):
+            if matches[i]:
+                existing = matches[i][0]
+                duplicates.setdefault(existing.id, (existing, []))[1].append(i)
+            else:
+                new_facts.append(i)
+        
+        # Facts are independent, so their DB/vault I/O is overlapped.
+        # Facts with the same normalized content are serialized so the
+        # later one sees the earlier insert and reinforces it instead.
+        content_locks = defaultdict(asyncio.Lock)
+        # Vault appends of every fact, written with one append per file
+        vault_batch = VaultBatch()
+        
+        importances = {}
+        if importance_task is not None:
+            importances = dict(zip(to_rate, await importance_task))
+        
+        async def store(i: int, checked: bool) -> MemoryItem:
+            fact = raw_facts[i]
+            async with content_locks[" ".join(fact.content.lower().split())]:
+                # Smart Categorization using pre-computed embedding
+                return await self.store_single_memory(
+                    content=fact.content,
+                    fact_type=fact.type,
+                    importance=fact.importance,
+                    precomputed_importance=importances.get(i),
+                    metadata={"resource_id": str(resource.id)},
+                    skip_resource=True,  # Resource already created
+                    precomputed_embedding=batch_embeddings[i],  # Pass pre-computed embedding
+                    skip_duplicate_check=checked,
+                    vault_batch=vault_batch,
+                    now=now,
+                )
+        
+        seen_contents = set()
+        store_calls = []
+        for i in new_facts:
+            key = " ".join(raw_facts[i].content.lower().split())
+            # Only the first copy of a fact was checked against the DB as it
+            # will be; later copies must look again to find that insert
+            store_calls.append(store(i, key not in seen_contents))
+            seen_contents.add(key)
+        
+        outcomes = await asyncio.gather(
+            self._reinforce_duplicates(list(duplicates.values()), vault_batch),
+            *store_calls,
+            return_exceptions=True,
+        )
+        
+        missing = outcomes[0]
+        if isinstance(missing, BaseException):
+            logger.error(f"Failed to reinforce duplicate facts: {missing}")
+            missing = set()
+        else:
+            for existing, indices in duplicates.values():
+                if existing.id not in missing:
+                    for i in indices:
+                        results[i] = existing
+        
+        # Cached matches that no longer exist: store those facts normally
+        retry = [i for item_id in missing for i in duplicates[item_id][1]]
+        retried = await asyncio.gather(
+            *(store(i, False) for i in retry),
+            return_exceptions=True,
+        )
+        
+        for i, result in zip(new_facts + retry, outcomes[1:] + list(retried)):
+            if isinstance(result, BaseException):
+                logger.error(f"Failed to store fact '{raw_facts[i].content[:50]}': {result}")
+            else:
+                results[i] = result
+        
+        created_items.extend(item for item in results if item is not None)
         
         context["created_items"] = created_items
         await self.hooks.execute_after("store", context)
         
-        # 5. Update timeline
-        await self.vault.append_to_timeline(
+        # 5. Update timeline, then write all queued vault appends
+        vault_batch.append_to_timeline(
             f"Stored {len(created_items)} memories from: {text[:100]}...",
-            datetime.now(),
+            now,
         )
+        try:
+            await self.vault.apply_batch(vault_batch)
+        except Exception as e:
+            logger.error(f"Failed to write memories to the vault: {e}")
         
         return created_items
 
@@ -155,22 +344,33 @@ class MemorizePipeline:
         importance: float,
         resource_id: uuid4,
         embedding: Optional[List[float]] = None,
+        vault_batch: Optional[VaultBatch] = None,
+        created_at: Optional[datetime] = None,
     ) -> MemoryItem:
-        """Process and store a single fact (no LLM extraction)."""
+        """
+        Process and store a single fact (no LLM extraction).
+        
+        With vault_batch, the Markdown write is queued there for the
+        caller to apply instead of being written immediately.
+        created_at (timezone-aware) stamps the item's creation and last
+        access; by default the current time is used.
+        """
         # Get or create category
         category = await self._ensure_category(category_path)
         
         # Create memory item
+        stamps = {} if created_at is None else {"created_at": created_at, "last_accessed": created_at}
         memory_item = MemoryItem(
             content=content,
             category_path=category_path,
             type=MemoryType(fact_type),
             importance=importance,
             source_resource_id=resource_id,
+            **stamps,
         )
         
         # Generate embedding if not provided
-        if not embedding:
+        if embedding is None:
             embedding = await self.llm.generate_embedding(content)
         
         # Save to database
@@ -181,12 +381,20 @@ class MemorizePipeline:
         )
         
         # Sync to Markdown vault
-        await self.vault.append_to_category(
-            category_path=category_path,
-            content=content,
-            memory_type=memory_item.type,
-            timestamp=memory_item.created_at,
-        )
+        if vault_batch is not None:
+            vault_batch.append_to_category(
+                category_path=category_path,
+                content=content,
+                memory_type=memory_item.type,
+                timestamp=memory_item.created_at,
+            )
+        else:
+            await self.vault.append_to_category(
+                category_path=category_path,
+                content=content,
+                memory_type=memory_item.type,
+                timestamp=memory_item.created_at,
+            )
         
         return memory_item
 
@@ -199,81 +407,108 @@ class MemorizePipeline:
         metadata: Optional[dict] = None,
         skip_resource: bool = False,
         precomputed_embedding: Optional[List[float]] = None,
+        skip_duplicate_check: bool = False,
+        vault_batch: Optional[VaultBatch] = None,
+        now: Optional[datetime] = None,
+        precomputed_importance: Optional[float] = None,
     ) -> MemoryItem:
-        """Store a single memory directly with smart categorization."""
+        """
+        Store a single memory directly with smart categorization.
+        
+        skip_duplicate_check is for callers that already searched for a
+        duplicate of this content (e.g. execute's batched search).
+        precomputed_importance replaces the LLM rating (e.g. execute's
+        batched rating).
+        vault_batch queues this call's vault appends (see process_fact).
+        now is the caller's timestamp for the resource URI, timeline and
+        the item's created_at, so a batch shares one clock read.
+        """
         metadata = metadata or {}
+        now = now or datetime.now()
         
-        # 1. Create resource if needed
-        resource_id = metadata.get("resource_id")
-        if not skip_resource:
-            resource = Resource(
-                uri=metadata.get("uri", f"conversation/{datetime.now().isoformat()}"),
-                modality=metadata.get("modality", "conversation"),
-                content=content,
-                metadata=metadata,
-            )
-            await self.repository.create_resource(resource)
-            resource_id = resource.id
-        
-        # 2. Check for duplicates (using pre-calculated or new embedding)
+        # 1. Check for duplicates (using pre-calculated or new embedding)
         if precomputed_embedding is not None:
             embedding = precomputed_embedding
         else:
+            if not skip_duplicate_check:
+                # Exact repeat: reinforce without paying for an embedding
+                exact = self.recent_memories.find_exact(content)
+                if exact is None:
+                    digest = content_hash(content)
+                    found = await self.repository.get_memory_items_by_content_hashes([digest])
+                    exact = found.get(digest)
+                if exact is not None:
+                    if await self._reinforce(exact, vault_batch):
+                        return exact
+                    self.recent_memories.discard(exact.id)  # deleted since found
             embedding = await self.llm.generate_embedding(content)
         
-        similar_items = await self.repository.vector_search(
-            query_embedding=embedding,
-            limit=1,
-            threshold=0.95
-        )
+        # The duplicate search, category search and importance rating only
+        # need the embedding, so they run concurrently; the latter two are
+        # cancelled if the fact turns out to be a duplicate
+        dedup_task = None
+        if not skip_duplicate_check:
+            dedup_task = asyncio.create_task(self.repository.vector_search(
+                query_embedding=embedding,
+                limit=1,
+                threshold=self.DUPLICATE_THRESHOLD
+            ))
         
-        if similar_items:
-            existing = similar_items[0]
-            
-            # Reinforcement Logic:
-            # If the same fact is mentioned again, increase its importance
-            # Formula: min(1.0, current_importance + 0.1)
-            new_importance = min(1.0, existing.importance + 0.1)
-            
-            new_count = await self.repository.reinforce_memory_item(existing.id, new_importance)
-            
-            # Update local object to reflect changes
-            existing.importance = new_importance
-            existing.mention_count = new_count
-            existing.last_accessed = datetime.now()
-            
-            # Sync update to vault file
-            await self.vault.update_memory_in_file(
-                category_path=existing.category_path,
-                content=existing.content,
-                new_importance=new_importance,
-                mention_count=new_count
-            )
-            
-            return existing
-
-        # 3. Smart Categorization (if no path provided)
+        # 2. Smart Categorization (if no path provided)
+        category_task = None
         if not category_path:
             # Find candidate categories semantically
-            candidates = await self.repository.vector_search_categories(
+            category_task = asyncio.create_task(self.repository.vector_search_categories_with_scores(
                 query_embedding=embedding,
                 limit=5,
                 threshold=0.2
-            )
-            candidate_paths = [c.path for c in candidates]
+            ))
+        
+        # 3. LLM-based importance rating if enabled
+        # (only rate if using default importance, not already set)
+        importance_task = None
+        if precomputed_importance is not None:
+            importance = precomputed_importance
+        elif self.llm_config.use_llm_importance and importance == 0.5:
+            importance_task = asyncio.create_task(self._rate_importance(content))
+        
+        tasks = [task for task in (dedup_task, category_task, importance_task) if task]
+        try:
+            if dedup_task is not None:
+                similar_items = await dedup_task
+                if similar_items:
+                    existing = similar_items[0]
+                    await self._reinforce(existing, vault_batch)
+                    self.recent_memories.add(existing)
+                    return existing
             
-            # Let LLM refine the path
-            category_path = await self.llm.suggest_category(content, candidate_paths)
-
-        # 4. LLM-based importance rating if enabled
-        final_importance = importance
-        if self.llm_config.use_llm_importance and importance == 0.5:
-            # Only rate if using default importance (not already set)
-            try:
-                final_importance = await self.llm.rate_importance(content)
-            except Exception as e:
-                # Fallback to default on error
-                final_importance = 0.5
+            if category_task is not None:
+                candidates = await category_task
+                if candidates and candidates[0][1] >= self.llm_config.category_auto_threshold:
+                    # Semantic search is already confident
+                    category_path = candidates[0][0].path
+                else:
+                    # Let LLM refine the path
+                    candidate_paths = [category.path for category, _ in candidates]
+                    category_path = await self.llm.suggest_category(content, candidate_paths)
+            
+            final_importance = await importance_task if importance_task else importance
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        
+        # 4. Create the resource, only now that the fact is known to be new
+        resource_id = metadata.get("resource_id")
+        if not skip_resource:
+            resource = Resource(
+                uri=_resource_uri(metadata, now),
+                modality=metadata.get("modality", "conversation"),
+                content=content,
+                metadata=metadata,
+            )
+            await self.repository.create_resource(resource)
+            resource_id = resource.id
         
         # 5. Process and persist
         item = await self.process_fact(
@@ -282,8 +517,11 @@ class MemorizePipeline:
             fact_type=fact_type,
             importance=final_importance,
             resource_id=resource_id,
-            embedding=embedding
+            embedding=embedding,
+            vault_batch=vault_batch,
+            created_at=now.astimezone(timezone.utc),
         )
+        self.recent_memories.add(item)
         
         # 6. MemGPT-style supersede: Check for contradicting memories
         if self.llm_config.use_memory_supersede:
@@ -295,28 +533,39 @@ class MemorizePipeline:
                     threshold=0.85  # Lower than duplicate threshold (0.95)
                 )
                 
-                for candidate in similar_candidates:
-                    # Skip self and duplicates (already handled above)
-                    if candidate.id == item.id:
-                        continue
-                    
-                    # Ask LLM if this is an update/correction
-                    relation = await self.llm.is_update_or_correction(
-                        new_content=content,
-                        existing_content=candidate.content,
-                        model_override=self.llm_config.get_supersede_model(),
-                    )
-                    
-                    if relation == "UPDATE":
-                        # Mark old memory as superseded by new
-                        await self.repository.supersede_memory_item(
-                            old_item_id=candidate.id,
-                            new_item_id=item.id,
+                # Skip self and duplicates (already handled above)
+                candidates = [c for c in similar_candidates if c.id != item.id]
+                
+                # Ask LLM if each is an update/correction, all at once
+                relations = await asyncio.gather(
+                    *(
+                        self.llm.is_update_or_correction(
+                            new_content=content,
+                            existing_content=candidate.content,
+                            model_override=self.llm_config.get_supersede_model(),
                         )
+                        for candidate in candidates
+                    ),
+                    return_exceptions=True,
+                )
+                superseded = [
+                    candidate for candidate, relation in zip(candidates, relations)
+                    if relation == "UPDATE"
+                ]
+                
+                if superseded:
+                    # Mark old memories as superseded by new
+                    await self.repository.supersede_memory_items(
+                        old_item_ids=[candidate.id for candidate in superseded],
+                        new_item_id=item.id,
+                    )
+                    for candidate in superseded:
+                        self.recent_memories.discard(candidate.id)
                         # Log to timeline
-                        await self.vault.append_to_timeline(
+                        await self._append_to_timeline(
                             f"🔄 Superseded: '{candidate.content[:50]}...' → '{content[:50]}...'",
-                            datetime.now(),
+                            now,
+                            vault_batch,
                         )
             except Exception as e:
                 # Supersede is optional, don't fail the whole operation
@@ -335,12 +584,8 @@ class MemorizePipeline:
                     
                     for triple_dict in triple_dicts:
                         # Create triple object
-                        triple = SemanticTriple(
+                        triple = RawSemanticTriple.from_dict(triple_dict).to_model(
                             memory_item_id=item.id,
-                            subject=triple_dict["subject"],
-                            predicate=triple_dict["predicate"],
-                            object=triple_dict["object"],
-                            context=triple_dict.get("context"),
                             importance=final_importance,
                         )
                         
@@ -360,9 +605,10 @@ class MemorizePipeline:
                                     old_triple_id=conflict.id,
                                     new_triple_id=triple.id,
                                 )
-                                await self.vault.append_to_timeline(
+                                await self._append_to_timeline(
                                     f"🔀 Triple superseded: ({conflict.subject}, {conflict.predicate}, {conflict.object}) → {triple.object}",
-                                    datetime.now(),
+                                    now,
+                                    vault_batch,
                                 )
                             elif triple.is_opposite_of(conflict):
                                 # Opposite predicate (likes vs dislikes)
@@ -370,9 +616,10 @@ class MemorizePipeline:
                                     old_triple_id=conflict.id,
                                     new_triple_id=triple.id,
                                 )
-                                await self.vault.append_to_timeline(
+                                await self._append_to_timeline(
                                     f"🔀 Contradicting triple: {conflict.predicate} → {triple.predicate}",
-                                    datetime.now(),
+                                    now,
+                                    vault_batch,
                                 )
                         
                         # Generate embeddings for the object
@@ -399,59 +646,250 @@ class MemorizePipeline:
         
         # 8. Update timeline
         if not skip_resource:
-            await self.vault.append_to_timeline(
+            await self._append_to_timeline(
                 f"Stored memory: {content[:100]}...",
-                datetime.now(),
+                now,
+                vault_batch,
             )
         
         return item
     
+    async def _rate_importance(self, content: str) -> float:
+        """LLM importance rating, falling back to the default on error."""
+        try:
+            return await self.llm.rate_importance(content)
+        except Exception:
+            return 0.5
+    
+    async def _prepare_facts(
+        self, facts: List[RawMemoryItem]
+    ) -> Tuple[List[List[MemoryItem]], List[Optional[List[float]]]]:
+        """
+        Match exact repeats of stored memories and embed the other facts.
+        
+        Returns per-fact duplicate matches and embeddings; a fact matched
+        by content (recent memories first, then one content-hash lookup)
+        has no embedding, as it is never compared by vector.
+        """
+        matches: List[List[MemoryItem]] = [[] for _ in facts]
+        unknown = []
+        for i, fact in enumerate(facts):
+            cached = self.recent_memories.find_exact(fact.content)
+            if cached is not None:
+                matches[i] = [cached]
+            else:
+                unknown.append(i)
+        
+        to_embed = []
+        if unknown:
+            hashes = {i: content_hash(facts[i].content) for i in unknown}
+            by_hash = await self.repository.get_memory_items_by_content_hashes(
+                list(set(hashes.values()))
+            )
+            for i in unknown:
+                if hashes[i] in by_hash:
+                    matches[i] = [by_hash[hashes[i]]]
+                else:
+                    to_embed.append(i)
+        
+        # Single batch API call instead of one per fact
+        embeddings: List[Optional[List[float]]] = [None] * len(facts)
+        if to_embed:
+            computed = await self.llm.batch_generate_embeddings(
+                [facts[i].content for i in to_embed]
+            )
+            for i, embedding in zip(to_embed, computed):
+                embeddings[i] = embedding
+        return matches, embeddings
+    
+    async def _batch_rate_importance(self, contents: List[str]) -> List[float]:
+        """Batched LLM importance rating, falling back to the default on error."""
+        try:
+            return await self.llm.batch_rate_importance(contents)
+        except Exception as e:
+            logger.warning(f"Batch importance rating failed: {e}")
+            return [0.5] * len(contents)
+    
+    async def _append_to_timeline(
+        self, content: str, timestamp: datetime, vault_batch: Optional[VaultBatch]
+    ) -> None:
+        """Timeline append, queued on vault_batch when one is given."""
+        if vault_batch is not None:
+            vault_batch.append_to_timeline(content, timestamp)
+        else:
+            await self.vault.append_to_timeline(content, timestamp)
+    
+    async def _reinforce(
+        self, existing: MemoryItem, vault_batch: Optional[VaultBatch] = None
+    ) -> bool:
+        """
+        Reinforce a memory that a new fact duplicates.
+        
+        With vault_batch, the vault update is queued there (see
+        _sync_reinforcement).
+        
+        Returns:
+            False if the memory no longer exists
+        """
+        # Reinforcement Logic:
+        # If the same fact is mentioned again, increase its importance
+        # Formula: min(1.0, current_importance + 0.1)
+        new_importance = min(1.0, existing.importance + 0.1)
+        
+        new_count = await self.repository.reinforce_memory_item(existing.id, new_importance)
+        if not new_count:
+            return False
+        
+        await self._sync_reinforcement(existing, new_importance, new_count, vault_batch)
+        return True
+    
+    async def _reinforce_duplicates(
+        self, duplicates: List[tuple], vault_batch: Optional[VaultBatch] = None
+    ) -> set:
+        """
+        Reinforce existing memories matched by several new facts at once.
+        
+        Args:
+            duplicates: (existing item, indices of the facts matching it)
+            vault_batch: Queue for the vault updates (see _sync_reinforcement)
+            
+        Returns:
+            IDs of matched memories that no longer exist
+        """
+        if not duplicates:
+            return set()
+        
+        # Each mention adds 0.1 importance, as in store_single_memory
+        importances = [
+            min(1.0, existing.importance + 0.1 * len(indices))
+            for existing, indices in duplicates
+        ]
+        new_counts = await self.repository.reinforce_memory_items_bulk(
+            item_ids=[existing.id for existing, _ in duplicates],
+            importances=importances,
+            increments=[len(indices) for _, indices in duplicates],
+        )
+        
+        missing = {existing.id for existing, _ in duplicates if existing.id not in new_counts}
+        for item_id in missing:
+            self.recent_memories.discard(item_id)
+        
+        await asyncio.gather(*(
+            self._sync_reinforcement(existing, importance, new_counts[existing.id], vault_batch)
+            for (existing, _), importance in zip(duplicates, importances)
+            if existing.id in new_counts
+        ))
+        return missing
+    
+    async def _sync_reinforcement(
+        self,
+        existing: MemoryItem,
+        new_importance: float,
+        new_count: int,
+        vault_batch: Optional[VaultBatch] = None,
+    ) -> None:
+        """
+        Reflect a reinforcement on the local object and in the vault file.
+        
+        With vault_batch the file update is queued behind the batch's
+        appends: the memory may have been stored earlier in the same batch,
+        and its line is not written yet.
+        """
+        existing.importance = new_importance
+        existing.mention_count = new_count
+        existing.last_accessed = datetime.now(timezone.utc)
+        
+        if vault_batch is not None:
+            vault_batch.update_memory_in_file(
+                category_path=existing.category_path,
+                content=existing.content,
+                new_importance=new_importance,
+                mention_count=new_count,
+            )
+            return
+        await self.vault.update_memory_in_file(
+            category_path=existing.category_path,
+            content=existing.content,
+            new_importance=new_importance,
+            mention_count=new_count
+        )
+    
     async def _ensure_category(self, path: str, parent_id: Optional[int] = None) -> Category:
         """
         Ensure category exists by path, creating all parent categories if needed.
         Uses batch embedding for all new categories in the path.
         """
+        cached = self._get_cached_category(path)
+        if cached:
+            return cached
+        
         # Already exists?
         existing = await self.repository.get_category_by_path(path)
         if existing:
+            self._cache_category(existing)
             return existing
         
-        # Split path and identify new categories
+        async with self._category_locks[path.split("/", 1)[0]]:
+            # Created by another fact while this one waited for the lock?
+            cached = self._get_cached_category(path)
+            if cached:
+                return cached
+            category = await self._create_category_path(path, parent_id)
+            if category:
+                self._cache_category(category)
+            return category
+    
+    def _get_cached_category(self, path: str) -> Optional[Category]:
+        """Cached category for path, if any (marks it recently used)."""
+        category = self._category_cache.get(path)
+        if category is not None:
+            self._category_cache.move_to_end(path)
+        return category
+    
+    def _cache_category(self, category: Category) -> None:
+        """Remember a category, evicting the least recently used."""
+        self._category_cache[category.path] = category
+        self._category_cache.move_to_end(category.path)
+        while len(self._category_cache) > self.CATEGORY_CACHE_SIZE:
+            self._category_cache.popitem(last=False)
+    
+    async def _create_category_path(self, path: str, parent_id: Optional[int]) -> Category:
+        """Create the missing categories along path (caller holds the root's lock)."""
         parts = path.split("/")
-        new_category_names = []
-        new_category_paths = []
-        parent_id = parent_id
-        
-        # First pass: identify which categories need to be created
-        for i in range(len(parts)):
-            current_path = "/".join(parts[:i+1])
-            existing = await self.repository.get_category_by_path(current_path)
-            
-            if existing:
-                parent_id = existing.id
-            else:
-                new_category_names.append(parts[i])
-                new_category_paths.append(current_path)
+        prefixes = ["/".join(parts[:i + 1]) for i in range(len(parts))]
         
-        # Batch embed all new categories at once
-        if new_category_names:
-            cat_embeddings = await self.llm.batch_generate_embeddings(new_category_names)
-            
-            # Second pass: create categories with pre-computed embeddings
-            for j, (name, path_str) in enumerate(zip(new_category_names, new_category_paths)):
-                category = Category(
-                    name=name,
-                    path=path_str,
-                    parent_id=parent_id,
-                )
-                await self.repository.create_category(category, embedding=cat_embeddings[j])
-                
-                # Create corresponding markdown file
-                await self.vault.ensure_category_file(path_str)
-                
+        # One lookup for every level of the path
+        existing = {
+            category.path: category
+            for category in await self.repository.get_categories_by_paths(prefixes)
+        }
+        if path in existing:
+            return existing[path]
+        
+        # Identify missing categories, threading parent IDs top-down
+        new_categories = []
+        for name, prefix in zip(parts, prefixes):
+            if prefix in existing:
+                parent_id = existing[prefix].id
+            else:
+                category = Category(name=name, path=prefix, parent_id=parent_id)
+                new_categories.append(category)
                 parent_id = category.id
         
-        return await self.repository.get_category_by_path(path)
+        # Batch embed all new categories at once, then insert them together
+        cat_embeddings = await self.llm.batch_generate_embeddings(
+            [category.name for category in new_categories]
+        )
+        created = await self.repository.create_categories_bulk(new_categories, cat_embeddings)
+        
+        # Create corresponding markdown files
+        await asyncio.gather(*(
+            self.vault.ensure_category_file(category.path) for category in new_categories
+        ))
+        
+        # The leaf is last; its ID is the stored one even if a concurrent
+        # writer inserted the path first
+        return created[-1]
     
     def _register_default_hooks(self) -> None:
         """Register built-in hooks for logging and performance tracking."""
@@ -463,12 +901,12 @@ class MemorizePipeline:
         async def track_stage_start(stage: str, context: dict):
             if "stage_timers" not in context:
                 context["stage_timers"] = {}
-            context["stage_timers"][stage] = time.time()
+            context["stage_timers"][stage] = time.perf_counter()
         
         @self.hooks.after("*")
         async def track_stage_end(stage: str, context: dict):
             if "stage_timers" in context and stage in context["stage_timers"]:
-                elapsed = time.time() - context["stage_timers"][stage]
+                elapsed = time.perf_counter() - context["stage_timers"][stage]
                 logger.debug(f"[Pipeline] {stage} completed in {elapsed:.3f}s")
         
         # Extraction validation hook
@@ -484,7 +922,7 @@ class MemorizePipeline:
         @self.hooks.after("store")
         async def log_storage_complete(context: dict):
             items = context.get("created_items", [])
-            total_time = time.time() - context.get("start_time", time.time())
+            total_time = time.perf_counter() - context.get("start_time", time.perf_counter())
             logger.info(f"Stored {len(items)} items in {total_time:.2f}s")
     
     def _register_monitoring_hooks(self) -> None:
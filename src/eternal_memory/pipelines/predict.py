@@ -7,13 +7,24 @@ Implements proactive context prediction as specified in Section 5.3 and 5.4:
 - Generate context for system prompt injection
 """
 
+import asyncio
+from collections import Counter
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 
 from eternal_memory.database.repository import MemoryRepository
 from eternal_memory.llm.client import LLMClient
 from eternal_memory.vault.markdown_vault import MarkdownVault
 
+# Session label per hour of day (0-23)
+_HOUR_LABELS = (
+    ("Late night session",) * 6
+    + ("Morning work session",) * 6
+    + ("Afternoon work session",) * 6
+    + ("Evening session",) * 4
+    + ("Late night session",) * 2
+)
+
 
 class PredictPipeline:
     """
@@ -47,29 +58,28 @@ class PredictPipeline:
         Returns:
             Context string for system prompt injection
         """
-        # 1. Get recent memory access patterns
-        recent_items = await self.repository.get_recent_items(limit=10)
+        # 1. Get recent memory access patterns and categories (independent)
+        recent_items, categories = await asyncio.gather(
+            self.repository.get_recent_items(limit=10),
+            self.repository.get_all_categories(),
+        )
         
         # 2. Extract patterns from recent accesses
-        patterns = self._extract_patterns(recent_items, current_context)
+        now = datetime.now()
+        patterns = self._extract_patterns(recent_items, current_context, now)
         
         # 3. Get relevant category summaries
-        categories = await self.repository.get_all_categories()
-        active_categories = [
-            c for c in categories
-            if c.path in [item.category_path for item in recent_items]
-        ]
-        
-        # 4. Predict next intent using LLM
-        predicted_context = await self.llm.predict_next_intent(
-            current_context=current_context,
-            recent_patterns=patterns,
-        )
-        
-        # 5. Preload relevant memories
-        preloaded_context = await self._preload_relevant_memories(
-            predicted_context,
-            active_categories,
+        recent_paths = {item.category_path for item in recent_items}
+        active_categories = [c for c in categories if c.path in recent_paths]
+        
+        # 4. Predict next intent using LLM, while
+        # 5. preloading memories of the active categories
+        predicted_context, preloaded_context = await asyncio.gather(
+            self.llm.predict_next_intent(
+                current_context=current_context,
+                recent_patterns=patterns,
+            ),
+            self._preload_relevant_memories(active_categories),
         )
         
         # 6. Format final context string
@@ -77,84 +87,70 @@ class PredictPipeline:
             predicted_context,
             preloaded_context,
             current_context,
+            now,
         )
     
     def _extract_patterns(
         self,
         recent_items: List,
         current_context: dict,
+        now: Optional[datetime] = None,
     ) -> List[str]:
         """
         Extract behavioral patterns from recent memory accesses.
         """
-        patterns = []
-        
         # Time-based patterns
-        current_hour = datetime.now().hour
-        if 6 <= current_hour < 12:
-            patterns.append("Morning work session")
-        elif 12 <= current_hour < 18:
-            patterns.append("Afternoon work session")
-        elif 18 <= current_hour < 22:
-            patterns.append("Evening session")
-        else:
-            patterns.append("Late night session")
-        
-        # Category patterns
-        category_counts = {}
+        patterns = [_HOUR_LABELS[(now or datetime.now()).hour]]
+        
+        # Category and memory type patterns, counted in one pass
+        category_counts = Counter()
+        type_counts = Counter()
         for item in recent_items:
-            cat = item.category_path.split("/")[0] if item.category_path else "other"
-            category_counts[cat] = category_counts.get(cat, 0) + 1
+            category_counts[item.category_path.split("/", 1)[0] if item.category_path else "other"] += 1
+            type_counts[item.type] += 1
         
         if category_counts:
-            dominant_category = max(category_counts, key=category_counts.get)
+            dominant_category = category_counts.most_common(1)[0][0]
             patterns.append(f"Currently focused on: {dominant_category}")
         
-        # Memory type patterns
-        type_counts = {}
-        for item in recent_items:
-            type_counts[item.type] = type_counts.get(item.type, 0) + 1
-        
         if type_counts:
-            dominant_type = max(type_counts, key=type_counts.get)
+            dominant_type = type_counts.most_common(1)[0][0]
             patterns.append(f"Recent activity type: {dominant_type}")
         
         # App context if available
         if "open_apps" in current_context:
-            apps = current_context["open_apps"]
-            if "code" in str(apps).lower() or "vscode" in str(apps).lower():
+            apps = str(current_context["open_apps"]).lower()
+            if "code" in apps:  # also matches "vscode"
                 patterns.append("User appears to be coding")
-            if "browser" in str(apps).lower():
+            if "browser" in apps:
                 patterns.append("User is browsing")
         
         return patterns
     
     async def _preload_relevant_memories(
         self,
-        predicted_context: str,
         active_categories: List,
     ) -> List[str]:
         """
-        Preload memories that might be relevant based on predictions.
+        Preload memories from the categories the user is active in.
+        
+        An item found through more than one category is included once.
         """
-        preloaded = []
-        
-        # Get items from active categories
-        for category in active_categories[:3]:  # Limit to 3 categories
-            items = await self.repository.get_items_by_category(
-                category_path=category.path,
-                limit=3,
-            )
-            for item in items:
-                preloaded.append(item.content)
-        
-        return preloaded
+        # Get items from active categories in a single query
+        items = await self.repository.get_items_for_categories(
+            [category.path for category in active_categories[:3]],  # Limit to 3 categories
+            per_category_limit=3,
+        )
+        
+        unique = {item.id: item.content for item in items}
+        return list(unique.values())
     
     def _format_injection_context(
         self,
         predicted_context: str,
         preloaded_memories: List[str],
         current_context: dict,
+        now: Optional[datetime] = None,
     ) -> str:
         """
         Format the final context string for system prompt injection.
@@ -165,7 +161,7 @@ class PredictPipeline:
         parts.append(f"[Predicted Intent] {predicted_context}")
         
         # Add time context
-        now = datetime.now()
+        now = now or datetime.now()
         parts.append(f"[Current Time] {now.strftime('%Y-%m-%d %H:%M')}")
         
         # Add preloaded memories
@@ -11,8 +11,13 @@ Hierarchical Filtering (Hybrid MemGPT + Triple):
 - MemoryItems without triples are used as fallback
 """
 
-from typing import Dict, List, Literal, Optional, Set
-from uuid import UUID
+import asyncio
+import hashlib
+import logging
+import time
+from array import array
+from collections import OrderedDict
+from typing import List, Literal, Optional, Set, Tuple
 
 from eternal_memory.config import LLMConfig, ScoringConfig
 from eternal_memory.database.repository import MemoryRepository
@@ -22,6 +27,8 @@ from eternal_memory.models.semantic_triple import SemanticTriple
 from eternal_memory.models.retrieval import RetrievalResult
 from eternal_memory.vault.markdown_vault import MarkdownVault
 
+logger = logging.getLogger("eternal_memory.pipelines.retrieve")
+
 
 class RetrievePipeline:
     """
@@ -38,6 +45,19 @@ class RetrievePipeline:
     3. MemoryItems without triples are used as fallback
     """
     
+    # Evolved queries kept per (query, conversation context) (LRU);
+    # query embeddings are cached by the LLM client
+    EVOLVED_QUERY_CACHE_SIZE = 512
+    
+    # Results of identical retrievals are reused this long (seconds), e.g.
+    # for re-asks and pagination; writes through the engine clear them
+    RESULT_CACHE_TTL = 30.0
+    RESULT_CACHE_SIZE = 128
+    
+    # Fast-mode context snippets are cut to this many characters, as the
+    # suggested context ends up in prompts
+    QUICK_CONTEXT_ITEM_CHARS = 300
+    
     def __init__(
         self,
         repository: MemoryRepository,
@@ -51,6 +71,12 @@ class RetrievePipeline:
         self.vault = vault
         self.scoring = scoring_config or ScoringConfig()
         self.llm_config = llm_config or LLMConfig()
+        
+        self._evolved_queries: "OrderedDict[bytes, str]" = OrderedDict()
+        # (mode, query, evolved query, settings) -> (expires_at, result)
+        self._results: "OrderedDict[tuple, Tuple[float, RetrievalResult]]" = OrderedDict()
+        # Speculative query embeddings left to finish (they only fill the cache)
+        self._background_embeddings: Set[asyncio.Task] = set()
     
     async def execute(
         self,
@@ -70,17 +96,102 @@ class RetrievePipeline:
             RetrievalResult with items and context
         """
         # 1. Query Evolution - clarify vague queries
-        evolved_query = await self.llm.evolve_query(query, conversation_context)
+        evolved_query, embedding_task = await self._evolve_query(query, conversation_context)
+        
+        # 2. Identical recent retrieval: skip embedding, search and reasoning
+        key = (
+            mode, query, evolved_query,
+            tuple(self.scoring.model_dump().values()), self.llm_config.use_semantic_triples,
+        )
+        now = time.monotonic()
+        entry = self._results.get(key)
+        if entry is not None:
+            if entry[0] > now:
+                if embedding_task is not None:
+                    self._finish_in_background(embedding_task)
+                self._results.move_to_end(key)
+                return entry[1].model_copy(deep=True)  # callers may mutate results
+            del self._results[key]
+        
+        if embedding_task is not None:
+            embedding = await embedding_task
+        else:
+            embedding = await self.llm.generate_embedding(evolved_query)
+        # Packed float32 once: every search binds it without a per-float conversion
+        query_embedding = array("f", embedding)
         
         if mode == "fast":
-            return await self._fast_retrieval(query, evolved_query)
+            result = await self._fast_retrieval(query, evolved_query, query_embedding)
         else:
-            return await self._deep_retrieval(query, evolved_query)
+            result = await self._deep_retrieval(query, evolved_query, query_embedding)
+        
+        self._results[key] = (time.monotonic() + self.RESULT_CACHE_TTL, result.model_copy(deep=True))
+        while len(self._results) > self.RESULT_CACHE_SIZE:
+            self._results.popitem(last=False)
+        return result
+    
+    def clear_result_cache(self) -> None:
+        """Forget cached retrieval results (call after memories change)."""
+        self._results.clear()
+    
+    def _finish_in_background(self, task: "asyncio.Task[List[float]]") -> None:
+        """
+        Let an unused speculative embedding finish instead of cancelling it.
+        
+        It only fills the embedding cache, and concurrent requests for the
+        same text may be waiting on the same provider call.
+        """
+        self._background_embeddings.add(task)
+        task.add_done_callback(self._on_background_embedding_done)
+    
+    def _on_background_embedding_done(self, task: asyncio.Task) -> None:
+        """Drop a finished speculative embedding and log its failure, if any."""
+        self._background_embeddings.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.debug("Speculative query embedding failed", exc_info=task.exception())
+    
+    async def _evolve_query(
+        self,
+        query: str,
+        conversation_context: str,
+    ) -> Tuple[str, Optional["asyncio.Task[List[float]]"]]:
+        """
+        Evolve the query, cached per query and conversation context.
+        
+        On a cache miss the original query is embedded meanwhile, as
+        evolution often leaves it unchanged; that embedding task is
+        returned when it is usable, else None (it still finishes in the
+        background and fills the embedding cache).
+        """
+        key = hashlib.blake2b(
+            f"{query}\0{conversation_context}".encode("utf-8"), digest_size=16
+        ).digest()
+        evolved_query = self._evolved_queries.get(key)
+        if evolved_query is not None:
+            self._evolved_queries.move_to_end(key)
+            return evolved_query, None
+        
+        embedding_task = asyncio.create_task(self.llm.generate_embedding(query))
+        try:
+            evolved_query = await self.llm.evolve_query(query, conversation_context)
+        except BaseException:
+            self._finish_in_background(embedding_task)
+            raise
+        
+        self._evolved_queries[key] = evolved_query
+        if len(self._evolved_queries) > self.EVOLVED_QUERY_CACHE_SIZE:
+            self._evolved_queries.popitem(last=False)
+        
+        if evolved_query == query:
+            return evolved_query, embedding_task
+        self._finish_in_background(embedding_task)
+        return evolved_query, None
     
     async def _fast_retrieval(
         self,
         original_query: str,
         evolved_query: str,
+        query_embedding: array,
     ) -> RetrievalResult:
         """
         Fast mode: Generative Agents-style search with Hierarchical Filtering.
@@ -93,37 +204,18 @@ class RetrievePipeline:
         2. Triple results take precedence (more precise, entity-level)
         3. MemoryItems without triples are used as fallback
         """
-        # Generate query embedding
-        query_embedding = await self.llm.generate_embedding(evolved_query)
-        
-        # Use Generative Agents-style search with configurable weights
-        memory_items = await self.repository.generative_agents_search(
-            query_embedding=query_embedding,
+        # Generative Agents-style search with configurable weights,
+        # hierarchically filtered if semantic triples are enabled
+        all_items, context_prefix = await self._search(
+            query_embedding,
             limit=10,
-            alpha_relevance=self.scoring.alpha_relevance,
-            alpha_recency=self.scoring.alpha_recency,
-            alpha_importance=self.scoring.alpha_importance,
-            recency_decay_factor=self.scoring.recency_decay_factor,
             min_relevance_threshold=self.scoring.min_relevance_threshold,
         )
         
-        # Apply Hierarchical Filtering if semantic triples are enabled
-        if self.llm_config.use_semantic_triples:
-            filtered_items, triple_context = await self._apply_hierarchical_filter(
-                memory_items=memory_items,
-                query_embedding=query_embedding,
-            )
-            all_items = filtered_items
-            context_prefix = triple_context
-        else:
-            all_items = memory_items
-            context_prefix = ""
-        
         # Get related categories
-        related_categories: Set[str] = set()
-        for item in all_items:
-            if item.category_path:
-                related_categories.add(item.category_path)
+        related_categories: Set[str] = {
+            item.category_path for item in all_items if item.category_path
+        }
         
         # Generate quick context suggestion with triple context prefix
         suggested_context = self._generate_quick_context(all_items, context_prefix)
@@ -141,6 +233,7 @@ class RetrievePipeline:
         self,
         original_query: str,
         evolved_query: str,
+        query_embedding: array,
     ) -> RetrievalResult:
         """
         Deep mode: LLM reasoning over DB results with Hierarchical Filtering.
@@ -150,46 +243,29 @@ class RetrievePipeline:
         - When semantic triples enabled: includes precise triple facts
         - STRICTLY DB-ONLY: No access to Markdown files
         """
-        # 1. High-recall Generative Agents search
-        query_embedding = await self.llm.generate_embedding(evolved_query)
-        initial_results = await self.repository.generative_agents_search(
-            query_embedding=query_embedding,
+        # 1. High-recall Generative Agents search, with
+        # 2. Hierarchical Filtering if semantic triples are enabled
+        filtered_results, triple_context = await self._search(
+            query_embedding,
             limit=20,  # Higher limit for deep mode
-            alpha_relevance=self.scoring.alpha_relevance,
-            alpha_recency=self.scoring.alpha_recency,
-            alpha_importance=self.scoring.alpha_importance,
-            recency_decay_factor=self.scoring.recency_decay_factor,
             min_relevance_threshold=self.scoring.min_relevance_threshold * 0.8,  # Lower threshold for deep mode
         )
         
-        # 2. Apply Hierarchical Filtering if semantic triples are enabled
-        if self.llm_config.use_semantic_triples:
-            filtered_results, triple_context = await self._apply_hierarchical_filter(
-                memory_items=initial_results,
-                query_embedding=query_embedding,
-            )
-        else:
-            filtered_results = initial_results
-            triple_context = ""
-        
         # 3. Identify relevant categories from results
-        relevant_categories: Set[str] = set()
-        for item in filtered_results:
-            if item.category_path:
-                relevant_categories.add(item.category_path)
+        relevant_categories: Set[str] = {
+            item.category_path for item in filtered_results if item.category_path
+        }
         
         # 4. LLM reasoning to synthesize answer
-        # Include triple context as high-precision facts
-        item_contents = []
-        if triple_context:
-            item_contents.append(f"[High-precision entity facts]: {triple_context}")
-        item_contents.extend([item.content for item in filtered_results])
-        
+        # Triple context goes last as high-precision facts: it changes with
+        # every query, so it must not break the prompt's cacheable prefix.
         # We pass empty category summaries to focus strict attention on specific facts
         reasoned_answer = await self.llm.reason_from_context(
             query=evolved_query,
-            context_items=item_contents,
-            category_summaries=[], 
+            # Distinct memories can share content; send each text once
+            context_items=list(dict.fromkeys(item.content for item in filtered_results)),
+            category_summaries=[],
+            entity_facts=triple_context or None,
         )
         
         return RetrievalResult(
@@ -201,31 +277,6 @@ class RetrievePipeline:
             confidence_score=0.85 if triple_context else (0.8 if filtered_results else 0.3),
         )
     
-    def _merge_results(
-        self,
-        vector_results: List[MemoryItem],
-        keyword_results: List[MemoryItem],
-    ) -> List[MemoryItem]:
-        """
-        Merge vector and keyword search results, removing duplicates.
-        """
-        seen_ids = set()
-        merged = []
-        
-        # Prioritize vector results
-        for item in vector_results:
-            if item.id not in seen_ids:
-                seen_ids.add(item.id)
-                merged.append(item)
-        
-        # Add keyword results not already present
-        for item in keyword_results:
-            if item.id not in seen_ids:
-                seen_ids.add(item.id)
-                merged.append(item)
-        
-        return merged
-    
     def _generate_quick_context(
         self, 
         items: List[MemoryItem], 
@@ -250,7 +301,11 @@ class RetrievePipeline:
         # Take top 3 items for context
         if items:
             top_items = items[:3]
-            memory_parts = [item.content for item in top_items]
+            limit = self.QUICK_CONTEXT_ITEM_CHARS
+            memory_parts = [
+                item.content if len(item.content) <= limit else item.content[:limit] + "..."
+                for item in top_items
+            ]
             if memory_parts:
                 parts.append("Relevant context: " + "; ".join(memory_parts))
         
@@ -266,76 +321,65 @@ class RetrievePipeline:
         avg_confidence = sum(item.confidence for item in items) / len(items)
         return min(avg_confidence, 1.0)
     
-    async def _apply_hierarchical_filter(
+    async def _search(
         self,
-        memory_items: List[MemoryItem],
-        query_embedding: List[float],
-    ) -> tuple[List[MemoryItem], str]:
+        query_embedding: array,
+        limit: int,
+        min_relevance_threshold: float,
+    ) -> Tuple[List[MemoryItem], str]:
         """
-        Apply Hierarchical Filtering for hybrid MemGPT + Triple architecture.
+        Generative Agents search with Hierarchical Filtering when semantic
+        triples are enabled (hybrid MemGPT + Triple architecture).
         
         Strategy:
-        1. Search for relevant triples semantically
-        2. For MemoryItems with triples: use active triple content instead
-        3. For MemoryItems without triples: use original content (fallback)
+        1. Search for relevant triples semantically, concurrently with the
+           memory search (they only share the query embedding)
+        2. Items whose triples are all inactive (outdated info) are
+           excluded by the memory search itself
+        3. Items without triples are kept (fallback)
         4. Triple context is prefixed for higher precision
         
-        Args:
-            memory_items: Retrieved memory items from generative_agents_search
-            query_embedding: Query embedding for triple search
-            
         Returns:
-            Tuple of (filtered_items, triple_context_string)
+            Tuple of (items, triple_context_string)
         """
-        # Search for relevant triples
-        triples = await self.repository.search_triples_semantic(
+        search = self.repository.generative_agents_search(
             query_embedding=query_embedding,
-            limit=15,
-            threshold=0.4,
-            active_only=True,
+            limit=limit,
+            alpha_relevance=self.scoring.alpha_relevance,
+            alpha_recency=self.scoring.alpha_recency,
+            alpha_importance=self.scoring.alpha_importance,
+            recency_decay_factor=self.scoring.recency_decay_factor,
+            min_relevance_threshold=min_relevance_threshold,
+            exclude_outdated_triples=self.llm_config.use_semantic_triples,
+            cascade_dim=self.scoring.cascade_dim,
+            cascade_candidates=self.scoring.cascade_candidates,
+            quantized_prefilter=self.scoring.use_quantized_prefilter,
         )
+        if not self.llm_config.use_semantic_triples:
+            return await search, ""
         
-        if not triples:
-            # No relevant triples found, return memory items as-is
-            return memory_items, ""
-        
-        # Build mappings
-        # Map: memory_item_id -> list of active triples
-        triple_by_memory: Dict[UUID, List[SemanticTriple]] = {}
-        for triple in triples:
-            if triple.memory_item_id:
-                if triple.memory_item_id not in triple_by_memory:
-                    triple_by_memory[triple.memory_item_id] = []
-                triple_by_memory[triple.memory_item_id].append(triple)
-        
-        # Set of memory IDs that have been "covered" by triples
-        covered_memory_ids: Set[UUID] = set(triple_by_memory.keys())
-        
-        # Build triple context (high precision facts)
-        triple_statements = []
+        memory_items, triples = await asyncio.gather(
+            search,
+            self.repository.search_triples_semantic(
+                query_embedding=query_embedding,
+                limit=15,
+                threshold=0.4,
+                active_only=True,
+            ),
+        )
+        return memory_items, self._triple_context(triples)
+    
+    @staticmethod
+    def _triple_context(triples: List[SemanticTriple]) -> str:
+        """High-precision facts: the first 5 distinct triple statements."""
+        seen: Set[str] = set()
+        unique_statements = []
         for triple in triples:
-            # Convert triple to natural language
-            triple_statements.append(triple.to_natural_language())
-        
-        # Deduplicate and limit
-        unique_statements = list(dict.fromkeys(triple_statements))[:5]
-        triple_context = "; ".join(unique_statements)
-        
-        # Filter memory items:
-        # - Exclude items whose ALL triples are inactive (outdated info)
-        # - Keep items without triples (fallback)
-        filtered_items = []
-        for item in memory_items:
-            if item.id in covered_memory_ids:
-                # This memory has triples - check if any are active
-                item_triples = triple_by_memory.get(item.id, [])
-                if any(t.is_active for t in item_triples):
-                    # Has active triples, but we already have precision from triple context
-                    # Still include for category/metadata, but mark as covered
-                    filtered_items.append(item)
-            else:
-                # No triples for this memory - use original content (fallback)
-                filtered_items.append(item)
-        
-        return filtered_items, triple_context
+            statement = triple.to_natural_language()
+            if statement not in seen:
+                seen.add(statement)
+                unique_statements.append(statement)
+                if len(unique_statements) == 5:
+                    break
+        return "; ".join(unique_statements)
 
@@ -478,7 +478,7 @@ async def job_lazy_triple_extraction(system: "EternalMemorySystem"):
     
     try:
         # Import here to avoid circular imports
-        from eternal_memory.models.semantic_triple import SemanticTriple
+        from eternal_memory.models._raw import RawSemanticTriple
         
         # 1. Check if semantic triples are enabled
         if not system.config.llm.use_semantic_triples:
@@ -511,12 +511,8 @@ async def job_lazy_triple_extraction(system: "EternalMemorySystem"):
                 
                 for triple_dict in triple_dicts:
                     # Create triple object
-                    triple = SemanticTriple(
+                    triple = RawSemanticTriple.from_dict(triple_dict).to_model(
                         memory_item_id=item.id,
-                        subject=triple_dict["subject"],
-                        predicate=triple_dict["predicate"],
-                        object=triple_dict["object"],
-                        context=triple_dict.get("context"),
                         importance=item.importance,
                     )
                     
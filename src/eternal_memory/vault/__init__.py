@@ -1,5 +1,5 @@
 """Markdown Memory Vault package."""
 
-from eternal_memory.vault.markdown_vault import MarkdownVault
+from eternal_memory.vault.markdown_vault import MarkdownVault, VaultBatch
 
-__all__ = ["MarkdownVault"]
+__all__ = ["MarkdownVault", "VaultBatch"]
@@ -5,16 +5,64 @@ Implements the human-readable Markdown storage as specified in Section 2.3.
 All memories are stored in the ~/.openclaw/memory/ directory.
 """
 
+import asyncio
 import os
+from collections import defaultdict
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 import aiofiles
 
 from eternal_memory.security.sanitizer import Sanitizer
 
 
+class VaultBatch:
+    """
+    Vault appends collected during one operation, written together by
+    MarkdownVault.apply_batch() with one write per file.
+    """
+    
+    def __init__(self):
+        # category path -> (content, memory_type, timestamp), in order
+        self.category_entries: Dict[str, List[Tuple[str, str, datetime]]] = defaultdict(list)
+        self.timeline_entries: List[Tuple[str, datetime]] = []
+        # category path -> {content: (importance, mention count)}
+        self.memory_updates: Dict[str, Dict[str, Tuple[float, int]]] = defaultdict(dict)
+    
+    def append_to_category(
+        self,
+        category_path: str,
+        content: str,
+        memory_type: str,
+        timestamp: datetime,
+    ) -> None:
+        """Queue a MarkdownVault.append_to_category()."""
+        self.category_entries[category_path].append((content, memory_type, timestamp))
+    
+    def append_to_timeline(self, content: str, timestamp: datetime) -> None:
+        """Queue a MarkdownVault.append_to_timeline()."""
+        self.timeline_entries.append((content, timestamp))
+    
+    def update_memory_in_file(
+        self,
+        category_path: str,
+        content: str,
+        new_importance: float,
+        mention_count: int,
+    ) -> None:
+        """
+        Queue a MarkdownVault.update_memory_in_file().
+        
+        Updates are applied after the appends, so a memory stored earlier
+        in the same batch is found; the highest mention count wins.
+        """
+        updates = self.memory_updates[category_path]
+        queued = updates.get(content)
+        if queued is None or mention_count >= queued[1]:
+            updates[content] = (new_importance, mention_count)
+
+
 class MarkdownVault:
     """
     Manages the Markdown Memory Vault for human-readable storage.
@@ -45,6 +93,10 @@ class MarkdownVault:
         self.storage_path = self.base_path / "db_data"
         self.config_path = self.base_path / "config"
         self.sanitizer = Sanitizer()
+        
+        # Per-file locks: concurrent pipeline tasks may append to a file
+        # while another rewrites it, which would drop the appended line
+        self._file_locks: Dict[Path, asyncio.Lock] = defaultdict(asyncio.Lock)
     
     async def initialize(self) -> None:
         """
@@ -143,21 +195,33 @@ consolidation:
         
         Timeline files are organized by month: timeline/2026-01.md
         """
-        filename = timestamp.strftime("%Y-%m") + ".md"
-        filepath = self.memory_path / "timeline" / filename
-        
-        # Sanitize content
-        safe_content = self.sanitizer.sanitize(content)
-        
-        # Create file if doesn't exist
-        if not filepath.exists():
-            async with aiofiles.open(filepath, "w") as f:
-                await f.write(f"# Timeline - {timestamp.strftime('%B %Y')}\n\n")
+        await self.append_to_timeline_bulk([(content, timestamp)])
+    
+    async def append_to_timeline_bulk(self, entries: Iterable[Tuple[str, datetime]]) -> None:
+        """
+        Append several timeline entries with one write per month file.
         
-        # Append entry
-        entry = f"- [{timestamp.strftime('%Y-%m-%d %H:%M')}] {safe_content}\n"
-        async with aiofiles.open(filepath, "a") as f:
-            await f.write(entry)
+        Args:
+            entries: (content, timestamp) tuples, in file order
+        """
+        by_file: Dict[Path, List[str]] = {}
+        headers: Dict[Path, str] = {}
+        for content, timestamp in entries:
+            filename = timestamp.strftime("%Y-%m") + ".md"
+            filepath = self.memory_path / "timeline" / filename
+            
+            # Sanitize content
+            safe_content = self.sanitizer.sanitize(content)
+            
+            by_file.setdefault(filepath, []).append(
+                f"- [{timestamp.strftime('%Y-%m-%d %H:%M')}] {safe_content}\n"
+            )
+            headers.setdefault(filepath, f"# Timeline - {timestamp.strftime('%B %Y')}\n\n")
+        
+        for filepath, lines in by_file.items():
+            async with self._file_locks[filepath]:
+                # Header is written only when this creates the file
+                await self._append(filepath, "".join(lines), header=headers[filepath])
     
     async def ensure_category_file(self, category_path: str) -> Path:
         """
@@ -177,12 +241,14 @@ consolidation:
         
         # Create file if doesn't exist
         if not filepath.exists():
-            filepath.parent.mkdir(parents=True, exist_ok=True)
-            async with aiofiles.open(filepath, "w") as f:
-                await f.write(f"# {parts[-1].title()}\n\n")
-                await f.write(f"Category: `{category_path}`\n\n")
-                await f.write("## Summary\n\n(Auto-generated summary will appear here)\n\n")
-                await f.write("## Memories\n\n")
+            async with self._file_locks[filepath]:
+                if not filepath.exists():
+                    filepath.parent.mkdir(parents=True, exist_ok=True)
+                    async with aiofiles.open(filepath, "w") as f:
+                        await f.write(f"# {parts[-1].title()}\n\n")
+                        await f.write(f"Category: `{category_path}`\n\n")
+                        await f.write("## Summary\n\n(Auto-generated summary will appear here)\n\n")
+                        await f.write("## Memories\n\n")
         
         return filepath
     
@@ -199,37 +265,38 @@ consolidation:
         """
         filepath = await self.ensure_category_file(category_path)
         
-        async with aiofiles.open(filepath, "r") as f:
-            lines = await f.readlines()
-        
-        updated = False
-        new_lines = []
-        
-        # Simple content matching logic - look for the line containing the content
-        # Note: This is fragile if content contains MD characters, but sufficient for V1
-        for line in lines:
-            if content in line:
-                # Keep the timestamp and type emoji, update the suffix
-                # Existing: - 📝 [2024-01-31] I love apples
-                # New:      - 📝 [2024-01-31] I love apples (x2)
+        async with self._file_locks[filepath]:
+            async with aiofiles.open(filepath, "r") as f:
+                lines = await f.readlines()
+        
+            updated = False
+            new_lines = []
+        
+            # Simple content matching logic - look for the line containing the content
+            # Note: This is fragile if content contains MD characters, but sufficient for V1
+            for line in lines:
+                if content in line:
+                    # Keep the timestamp and type emoji, update the suffix
+                    # Existing: - 📝 [2024-01-31] I love apples
+                    # New:      - 📝 [2024-01-31] I love apples (x2)
                 
-                # Check if already has count
-                base_line = line.strip()
-                if " (x" in base_line and base_line.endswith(")"):
-                    # Strip existing count: ".... (x2)" -> "...."
-                    base_line = base_line.rsplit(" (x", 1)[0]
+                    # Check if already has count
+                    base_line = line.strip()
+                    if " (x" in base_line and base_line.endswith(")"):
+                        # Strip existing count: ".... (x2)" -> "...."
+                        base_line = base_line.rsplit(" (x", 1)[0]
                 
-                if mention_count > 1:
-                    new_lines.append(f"{base_line} (x{mention_count})\n")
+                    if mention_count > 1:
+                        new_lines.append(f"{base_line} (x{mention_count})\n")
+                    else:
+                        new_lines.append(f"{base_line}\n")
+                    updated = True
                 else:
-                    new_lines.append(f"{base_line}\n")
-                updated = True
-            else:
-                new_lines.append(line)
+                    new_lines.append(line)
         
-        if updated:
-            async with aiofiles.open(filepath, "w") as f:
-                await f.writelines(new_lines)
+            if updated:
+                async with aiofiles.open(filepath, "w") as f:
+                    await f.writelines(new_lines)
                 
         return updated
 
@@ -243,8 +310,79 @@ consolidation:
         """
         Append a memory to a category file.
         """
+        await self.append_to_category_bulk(category_path, [(content, memory_type, timestamp)])
+    
+    async def append_to_category_bulk(
+        self,
+        category_path: str,
+        entries: Iterable[Tuple[str, str, datetime]],
+    ) -> None:
+        """
+        Append several memories to a category file in a single write.
+        
+        Args:
+            category_path: Category whose file receives the entries
+            entries: (content, memory_type, timestamp) tuples, in file order
+        """
+        text = "".join(
+            self._format_category_entry(content, memory_type, timestamp)
+            for content, memory_type, timestamp in entries
+        )
+        if not text:
+            return
+        
         filepath = await self.ensure_category_file(category_path)
         
+        async with self._file_locks[filepath]:
+            await self._append(filepath, text)
+    
+    async def apply_batch(self, batch: VaultBatch) -> None:
+        """Write everything queued in batch, one append per file."""
+        await asyncio.gather(
+            *(
+                self.append_to_category_bulk(path, entries)
+                for path, entries in batch.category_entries.items()
+            ),
+            self.append_to_timeline_bulk(batch.timeline_entries),
+        )
+        # Then the updates, which may target lines appended just now
+        await asyncio.gather(*(
+            self._update_memories_in_file(path, updates)
+            for path, updates in batch.memory_updates.items()
+        ))
+    
+    async def _update_memories_in_file(
+        self,
+        category_path: str,
+        updates: Dict[str, Tuple[float, int]],
+    ) -> None:
+        """Apply queued updates to one category file, one at a time."""
+        for content, (new_importance, mention_count) in updates.items():
+            await self.update_memory_in_file(
+                category_path=category_path,
+                content=content,
+                new_importance=new_importance,
+                mention_count=mention_count,
+            )
+    
+    @staticmethod
+    async def _append(filepath: Path, text: str, header: str = "") -> None:
+        """
+        Append text to a file in a single worker-thread hop.
+        
+        aiofiles dispatches open, write and close to the thread pool
+        separately; appends are small, so one blocking call is cheaper.
+        """
+        def append() -> None:
+            with open(filepath, "a") as f:
+                if header and f.tell() == 0:
+                    f.write(header)
+                f.write(text)
+        
+        await asyncio.to_thread(append)
+    
+    def _format_category_entry(self, content: str, memory_type: str, timestamp: datetime) -> str:
+        """Format one category file line."""
         # Sanitize content
         safe_content = self.sanitizer.sanitize(content)
         
@@ -256,10 +394,7 @@ consolidation:
             "plan": "🎯",
         }.get(memory_type, "📝")
         
-        entry = f"- {type_emoji} [{timestamp.strftime('%Y-%m-%d')}] {safe_content}\n"
-        
-        async with aiofiles.open(filepath, "a") as f:
-            await f.write(entry)
+        return f"- {type_emoji} [{timestamp.strftime('%Y-%m-%d')}] {safe_content}\n"
     
     async def read_category_file(self, category_path: str) -> Optional[str]:
         """
@@ -283,25 +418,26 @@ consolidation:
         """
         filepath = await self.ensure_category_file(category_path)
         
-        async with aiofiles.open(filepath, "r") as f:
-            content = await f.read()
+        async with self._file_locks[filepath]:
+            async with aiofiles.open(filepath, "r") as f:
+                content = await f.read()
         
-        # Replace summary section
-        safe_summary = self.sanitizer.sanitize(summary)
+            # Replace summary section
+            safe_summary = self.sanitizer.sanitize(summary)
         
-        # Find and replace summary section
-        if "## Summary" in content:
-            parts = content.split("## Summary")
-            before = parts[0]
-            after_parts = parts[1].split("##", 1)
-            after = "##" + after_parts[1] if len(after_parts) > 1 else ""
+            # Find and replace summary section
+            if "## Summary" in content:
+                parts = content.split("## Summary")
+                before = parts[0]
+                after_parts = parts[1].split("##", 1)
+                after = "##" + after_parts[1] if len(after_parts) > 1 else ""
             
-            new_content = f"{before}## Summary\n\n{safe_summary}\n\n{after}"
-        else:
-            new_content = content
+                new_content = f"{before}## Summary\n\n{safe_summary}\n\n{after}"
+            else:
+                new_content = content
         
-        async with aiofiles.open(filepath, "w") as f:
-            await f.write(new_content)
+            async with aiofiles.open(filepath, "w") as f:
+                await f.write(new_content)
     
     async def archive_items(
         self,
@@ -0,0 +1,13 @@
+"""
+Shared test helpers.
+"""
+
+from unittest.mock import MagicMock
+
+
+def stream_of(facts):
+    """stream_extract_facts stand-in yielding the given facts."""
+    async def stream(text, existing_categories):
+        for fact in facts:
+            yield fact
+    return MagicMock(side_effect=stream)
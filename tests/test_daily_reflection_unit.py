@@ -136,6 +136,50 @@ class TestDailyReflectionLogic:
         assert result["sentiment"] == "neutral"
         assert result["key_events"] == []
 
+    @pytest.mark.asyncio
+    async def test_generate_daily_reflection_fills_missing_keys(self):
+        """Keys omitted by the model fall back to schema defaults."""
+        from eternal_memory.llm.client import LLMClient
+        
+        client = LLMClient(api_key="mock-key", model="gpt-4o-mini")
+        
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = '{"summary": "짧은 하루", "extra": 1}'
+        mock_response.usage = None
+        
+        client.client = AsyncMock()
+        client.client.chat.completions.create = AsyncMock(return_value=mock_response)
+        
+        result = await client.generate_daily_reflection(["test"], "2026-01-31")
+        
+        assert result == {
+            "summary": "짧은 하루",
+            "key_events": [],
+            "sentiment": "neutral",
+            "insights": "",
+        }
+
+    @pytest.mark.asyncio
+    async def test_generate_daily_reflection_coerces_wrong_types(self):
+        """A key_events string is wrapped in a list; the other fields are kept."""
+        from eternal_memory.llm.client import LLMClient
+        
+        client = LLMClient(api_key="mock-key", model="gpt-4o-mini")
+        
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = '{"summary": "x", "key_events": "not a list"}'
+        mock_response.usage = None
+        
+        client.client = AsyncMock()
+        client.client.chat.completions.create = AsyncMock(return_value=mock_response)
+        
+        result = await client.generate_daily_reflection(["test"], "2026-01-31")
+        
+        assert result["summary"] == "x"
+        assert result["key_events"] == ["not a list"]
+
     @pytest.mark.asyncio
     async def test_job_daily_reflection_skips_when_no_memories(self):
         """Test that daily reflection job handles empty memories gracefully."""
@@ -0,0 +1,41 @@
+"""
+Unit Tests for RecentMemoryCache
+
+Tests in-process duplicate detection for recently stored memories.
+"""
+
+from eternal_memory.models.memory_item import MemoryItem
+from eternal_memory.pipelines.dedup_cache import RecentMemoryCache
+
+
+class TestRecentMemoryCache:
+    """Tests for RecentMemoryCache."""
+
+    def test_exact_content_repeat_is_found(self):
+        """A repeat with different case/spacing hits; other content misses."""
+        cache = RecentMemoryCache()
+        item = MemoryItem(content="I like  tea", category_path="personal")
+        cache.add(item)
+
+        assert cache.find_exact("i like tea") is item
+        assert cache.find_exact("Tea is what I like") is None
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    def test_oldest_entries_are_evicted(self):
+        """The cache keeps at most max_size memories."""
+        cache = RecentMemoryCache(max_size=2)
+        items = [MemoryItem(content=f"fact {i}", category_path="c") for i in range(3)]
+        for item in items:
+            cache.add(item)
+
+        assert cache.find_exact("fact 0") is None
+        assert cache.find_exact("fact 2") is items[2]
+
+    def test_discard_forgets_item(self):
+        """Discarded memories are no longer returned."""
+        cache = RecentMemoryCache()
+        item = MemoryItem(content="I like tea", category_path="personal")
+        cache.add(item)
+        cache.discard(item.id)
+
+        assert cache.find_exact("I like tea") is None
@@ -7,6 +7,15 @@ Verifies that embedding caching works correctly and reduces API calls.
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 from eternal_memory.llm.client import LLMClient
+from eternal_memory.llm.disk_cache import SQLiteEmbeddingStore
+
+
+def make_client(**kwargs) -> LLMClient:
+    """LLMClient whose embedding requests reach the patchable client.client."""
+    client = LLMClient(api_key="test-key", **kwargs)
+    # The provider requests through with_options(max_retries=0), a copy
+    client.client.with_options = MagicMock(return_value=client.client)
+    return client
 
 
 class TestEmbeddingCache:
@@ -15,7 +24,7 @@ class TestEmbeddingCache:
     @pytest.mark.asyncio
     async def test_cache_hit(self):
         """Test that repeated queries use cache."""
-        client = LLMClient(api_key="test-key", enable_embedding_cache=True)
+        client = make_client(enable_embedding_cache=True)
         
         # Mock the OpenAI client
         mock_embedding = [0.1, 0.2, 0.3] * 512  # 1536 dims
@@ -31,30 +40,30 @@ class TestEmbeddingCache:
         text = "내가 좋아하는 과일이 뭐였지?"
         result1 = await client.generate_embedding(text)
         
-        assert result1 == mock_embedding
+        assert result1 == pytest.approx(mock_embedding, rel=1e-6)  # float32 rows
         assert client.client.embeddings.create.call_count == 1
-        assert client._cache_misses == 1
-        assert client._cache_hits == 0
+        assert client._embedding_cache.misses == 1
+        assert client._embedding_cache.hits == 0
         
         # Second call - should use cache
         result2 = await client.generate_embedding(text)
         
-        assert result2 == mock_embedding
+        assert result2 == pytest.approx(mock_embedding, rel=1e-6)  # cached as float32
         assert client.client.embeddings.create.call_count == 1  # No new call!
-        assert client._cache_misses == 1
-        assert client._cache_hits == 1
+        assert client._embedding_cache.misses == 1
+        assert client._embedding_cache.hits == 1
         
         # Third call - still cached
         result3 = await client.generate_embedding(text)
         
-        assert result3 == mock_embedding
+        assert result3 == pytest.approx(mock_embedding, rel=1e-6)  # cached as float32
         assert client.client.embeddings.create.call_count == 1
-        assert client._cache_hits == 2
+        assert client._embedding_cache.hits == 2
     
     @pytest.mark.asyncio
     async def test_cache_miss(self):
         """Test that different queries call API."""
-        client = LLMClient(api_key="test-key", enable_embedding_cache=True)
+        client = make_client(enable_embedding_cache=True)
         
         # Mock different embeddings
         mock_embedding1 = [0.1] * 1536
@@ -72,16 +81,16 @@ class TestEmbeddingCache:
         result1 = await client.generate_embedding("사과")
         result2 = await client.generate_embedding("바나나")
         
-        assert result1 == mock_embedding1
-        assert result2 == mock_embedding2
+        assert result1 == pytest.approx(mock_embedding1, rel=1e-6)
+        assert result2 == pytest.approx(mock_embedding2, rel=1e-6)
         assert client.client.embeddings.create.call_count == 2
-        assert client._cache_misses == 2
-        assert client._cache_hits == 0
+        assert client._embedding_cache.misses == 2
+        assert client._embedding_cache.hits == 0
     
     @pytest.mark.asyncio
     async def test_lru_eviction(self):
         """Test that LRU eviction works when cache is full."""
-        client = LLMClient(api_key="test-key", enable_embedding_cache=True, max_cache_size=3)
+        client = make_client(enable_embedding_cache=True, max_cache_size=3)
         
         # Mock embeddings
         client.client.embeddings = AsyncMock()
@@ -98,21 +107,21 @@ class TestEmbeddingCache:
         await client.generate_embedding("text3")
         
         assert len(client._embedding_cache) == 3
-        assert client._cache_misses == 3
+        assert client._embedding_cache.misses == 3
         
         # Add 4th item - should evict "text1"
         await client.generate_embedding("text4")
         
         assert len(client._embedding_cache) == 3
-        assert "text1" not in client._embedding_cache
-        assert "text2" in client._embedding_cache
-        assert "text3" in client._embedding_cache
-        assert "text4" in client._embedding_cache
+        assert client._embedding_cache.key("text1") not in client._embedding_cache
+        assert client._embedding_cache.key("text2") in client._embedding_cache
+        assert client._embedding_cache.key("text3") in client._embedding_cache
+        assert client._embedding_cache.key("text4") in client._embedding_cache
     
     @pytest.mark.asyncio
     async def test_cache_stats(self):
         """Test cache statistics reporting."""
-        client = LLMClient(api_key="test-key", enable_embedding_cache=True)
+        client = make_client(enable_embedding_cache=True)
         
         client.client.embeddings = AsyncMock()
         client.client.embeddings.create = AsyncMock(
@@ -140,10 +149,54 @@ class TestEmbeddingCache:
         assert stats["hit_rate_percent"] == 66.67
         assert stats["cache_size"] == 1
     
+    @pytest.mark.asyncio
+    async def test_lru_eviction_respects_recent_hits(self):
+        """A cache hit protects an entry from the next eviction."""
+        client = LLMClient(api_key="test-key", max_cache_size=2)
+        client._embedding_provider.batch_embed = AsyncMock(return_value=[[0.5] * 8])
+        
+        await client.generate_embedding("a")
+        await client.generate_embedding("b")
+        for _ in range(100):  # many hits must not grow the LRU log unboundedly
+            await client.generate_embedding("a")
+        await client.generate_embedding("c")
+        
+        assert client._embedding_cache.key("a") in client._embedding_cache
+        assert client._embedding_cache.key("b") not in client._embedding_cache
+        assert client._embedding_cache.key("c") in client._embedding_cache
+        assert len(client._embedding_cache._order) <= 2 * len(client._embedding_cache) + 64
+    
+    @pytest.mark.asyncio
+    async def test_cache_stores_compact_float32(self):
+        """Cached vectors are packed float32 arrays; callers still get lists."""
+        from array import array
+        
+        client = LLMClient(api_key="test-key")
+        client._embedding_provider.batch_embed = AsyncMock(return_value=[[0.25] * 1536])
+        
+        await client.generate_embedding("compact")
+        cached = client._embedding_cache._entries[client._embedding_cache.key("compact")]
+        result = await client.generate_embedding("compact")
+        
+        assert isinstance(cached, array) and cached.typecode == "f"
+        assert isinstance(result, list)
+        assert result == [0.25] * 1536
+    
+    def test_cache_key_is_fixed_size_digest(self):
+        """Cache keys are 16-byte hashes regardless of text length."""
+        client = LLMClient(api_key="test-key")
+        
+        short_key = client._embedding_cache.key("짧은")
+        long_key = client._embedding_cache.key("아주 긴 문장입니다. " * 200)
+        
+        assert len(short_key) == len(long_key) == 16
+        assert short_key == client._embedding_cache.key("짧은")
+        assert short_key != long_key
+    
     @pytest.mark.asyncio
     async def test_cache_disabled(self):
         """Test that caching can be disabled."""
-        client = LLMClient(api_key="test-key", enable_embedding_cache=False)
+        client = make_client(enable_embedding_cache=False)
         
         mock_embedding = [0.1] * 1536
         client.client.embeddings = AsyncMock()
@@ -165,7 +218,7 @@ class TestEmbeddingCache:
     @pytest.mark.asyncio
     async def test_clear_cache(self):
         """Test cache clearing."""
-        client = LLMClient(api_key="test-key", enable_embedding_cache=True)
+        client = make_client(enable_embedding_cache=True)
         
         client.client.embeddings = AsyncMock()
         client.client.embeddings.create = AsyncMock(
@@ -180,14 +233,214 @@ class TestEmbeddingCache:
         await client.generate_embedding("query2")
         
         assert len(client._embedding_cache) == 2
-        assert client._cache_misses == 2
+        assert client._embedding_cache.misses == 2
         
         # Clear cache
         client.clear_embedding_cache()
         
         assert len(client._embedding_cache) == 0
-        assert client._cache_hits == 0
-        assert client._cache_misses == 0
+        assert client._embedding_cache.hits == 0
+        assert client._embedding_cache.misses == 0
+
+
+class TestEmbeddingDeduplication:
+    """Tests for duplicate and concurrent requests of the same text."""
+    
+    @pytest.mark.asyncio
+    async def test_duplicate_texts_in_batch_embedded_once(self):
+        """Identical texts in one batch reach the provider only once."""
+        client = LLMClient(api_key="test-key")
+        client._embedding_provider.batch_embed = AsyncMock(return_value=[[1.0], [2.0]])
+        
+        results = await client.batch_generate_embeddings(["a", "b", "a"])
+        
+        assert results == [[1.0], [2.0], [1.0]]
+        client._embedding_provider.batch_embed.assert_awaited_once_with(["a", "b"])
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_inflight_call(self):
+        """Concurrent requests for the same text share one provider call."""
+        import asyncio
+        
+        client = LLMClient(api_key="test-key")
+        release = asyncio.Event()
+        calls = []
+        
+        async def slow_embed(texts):
+            calls.append(list(texts))
+            await release.wait()
+            return [[float(len(t))] for t in texts]
+        
+        client._embedding_provider.batch_embed = slow_embed
+        first = asyncio.create_task(client.generate_embedding("shared"))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(client.batch_generate_embeddings(["shared", "other"]))
+        await asyncio.sleep(0)
+        release.set()
+        
+        assert await first == [6.0]
+        assert await second == [[6.0], [5.0]]
+        assert calls == [["shared"], ["other"]]
+    
+    @pytest.mark.asyncio
+    async def test_inflight_failure_propagates_to_waiters(self):
+        """A failed shared call raises in every waiting request."""
+        import asyncio
+        
+        client = LLMClient(api_key="test-key")
+        release = asyncio.Event()
+        
+        async def failing_embed(texts):
+            await release.wait()
+            raise RuntimeError("provider down")
+        
+        client._embedding_provider.batch_embed = failing_embed
+        first = asyncio.create_task(client.generate_embedding("x"))
+        await asyncio.sleep(0)
+        second = asyncio.create_task(client.generate_embedding("x"))
+        await asyncio.sleep(0)
+        release.set()
+        
+        with pytest.raises(RuntimeError):
+            await first
+        with pytest.raises(RuntimeError):
+            await second
+        assert not client._embedding_cache._inflight
+    
+    @pytest.mark.asyncio
+    async def test_short_provider_response_fails_all_waiters(self):
+        """Too few vectors raise instead of leaving waiters on the missing texts blocked."""
+        import asyncio
+        
+        client = LLMClient(api_key="test-key")
+        release = asyncio.Event()
+        
+        async def short_embed(texts):
+            await release.wait()
+            return [[1.0]]  # one vector for two texts
+        
+        client._embedding_provider.batch_embed = short_embed
+        batch = asyncio.create_task(client.batch_generate_embeddings(["a", "b"]))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(client.generate_embedding("b"))
+        await asyncio.sleep(0)
+        release.set()
+        
+        with pytest.raises(ValueError):
+            await batch
+        with pytest.raises(ValueError):
+            await asyncio.wait_for(waiter, timeout=1)
+        assert not client._embedding_cache._inflight
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_owner_does_not_cancel_waiters(self):
+        """Cancelling the request that started a shared call leaves its waiters served."""
+        import asyncio
+        
+        client = LLMClient(api_key="test-key")
+        release = asyncio.Event()
+        calls = []
+        
+        async def slow_embed(texts):
+            calls.append(list(texts))
+            await release.wait()
+            return [[1.0] for _ in texts]
+        
+        client._embedding_provider.batch_embed = slow_embed
+        owner = asyncio.create_task(client.generate_embedding("q"))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(client.generate_embedding("q"))
+        await asyncio.sleep(0)
+        owner.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        
+        assert await asyncio.wait_for(waiter, timeout=1) == [1.0]
+        assert owner.cancelled()
+        assert calls == [["q"]]
+        assert not client._embedding_cache._inflight
+        # The finished call still fills the cache
+        assert await client.generate_embedding("q") == [1.0]
+        assert calls == [["q"]]
+
+
+class TestDiskEmbeddingCache:
+    """Tests for the persistent SQLite embedding tier."""
+    
+    @pytest.mark.asyncio
+    async def test_survives_restart(self, tmp_path):
+        """Embeddings written by one client are served to the next from disk."""
+        cache_path = str(tmp_path / "embed_cache.sqlite")
+        mock_embedding = [0.5, 0.25, 0.125] * 512
+        
+        client1 = LLMClient(api_key="test-key", cache_path=cache_path)
+        client1._embedding_provider.batch_embed = AsyncMock(return_value=[mock_embedding])
+        await client1.generate_embedding("persist me")
+        client1._embedding_cache.close()
+        
+        client2 = LLMClient(api_key="test-key", cache_path=cache_path)
+        client2._embedding_provider.batch_embed = AsyncMock()
+        result = await client2.generate_embedding("persist me")
+        
+        assert result == mock_embedding
+        client2._embedding_provider.batch_embed.assert_not_called()
+        assert client2.get_cache_stats()["disk_hits"] == 1
+        assert client2._embedding_cache.misses == 0
+    
+    @pytest.mark.asyncio
+    async def test_partial_disk_hit(self, tmp_path):
+        """Only texts missing from disk are sent to the provider."""
+        cache_path = str(tmp_path / "embed_cache.sqlite")
+        client = LLMClient(api_key="test-key", cache_path=cache_path)
+        client._embedding_provider.batch_embed = AsyncMock(return_value=[[1.0] * 4])
+        await client.generate_embedding("cached")
+        client.clear_embedding_cache()  # drop the memory tier only
+        
+        client._embedding_provider.batch_embed = AsyncMock(return_value=[[2.0] * 4])
+        results = await client.batch_generate_embeddings(["cached", "fresh"])
+        
+        assert results == [[1.0] * 4, [2.0] * 4]
+        client._embedding_provider.batch_embed.assert_called_once_with(["fresh"])
+    
+    @pytest.mark.asyncio
+    async def test_disk_tier_runs_off_the_event_loop(self, tmp_path):
+        """sqlite calls run in worker threads; concurrent requests probe disk once."""
+        import asyncio
+        import threading
+        
+        client = LLMClient(api_key="test-key", cache_path=str(tmp_path / "embed_cache.sqlite"))
+        client._embedding_provider.batch_embed = AsyncMock(return_value=[[1.0] * 4])
+        store = client._embedding_cache.disk_store
+        threads = []
+        
+        def record(method):
+            def wrapper(*args):
+                threads.append(threading.get_ident())
+                return method(*args)
+            return wrapper
+        
+        store.get_many = record(store.get_many)
+        store.put_many = record(store.put_many)
+        
+        results = await asyncio.gather(
+            client.generate_embedding("text"), client.generate_embedding("text")
+        )
+        
+        assert results == [[1.0] * 4, [1.0] * 4]
+        assert len(threads) == 2  # one probe, one write
+        assert threading.get_ident() not in threads
+        client._embedding_provider.batch_embed.assert_awaited_once()
+    
+    def test_store_evicts_least_recently_touched(self, tmp_path):
+        """The store trims itself back to max_entries."""
+        store = SQLiteEmbeddingStore(str(tmp_path / "s.sqlite"), max_entries=2)
+        store.EVICTION_CHECK_INTERVAL = 1
+        store.put_many([(b"a", [1.0]), (b"b", [2.0])])
+        store.get_many([b"a"])  # refresh "a"
+        store.put_many([(b"c", [3.0])])
+        
+        assert store.count() == 2
+        assert set(store.get_many([b"a", b"b", b"c"])) == {b"a", b"c"}
 
 
 if __name__ == "__main__":
@@ -0,0 +1,266 @@
+"""
+Unit Tests for Embedding Providers
+
+Tests provider batching logic with mocked SDK clients. Does not require API keys.
+"""
+
+import asyncio
+import sys
+import types
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+
+@pytest.fixture
+def fake_genai(monkeypatch):
+    """Install a fake google.generativeai module that embeds text as [len(text)]."""
+    genai = types.ModuleType("google.generativeai")
+    genai.configure = MagicMock()
+    genai.calls = []
+
+    def embed_content(model, content, task_type):
+        genai.calls.append(content)
+        if isinstance(content, list):
+            return {"embedding": [[float(len(c))] for c in content]}
+        return {"embedding": [float(len(content))]}
+
+    genai.embed_content = embed_content
+    google = types.ModuleType("google")
+    google.generativeai = genai
+    monkeypatch.setitem(sys.modules, "google", google)
+    monkeypatch.setitem(sys.modules, "google.generativeai", genai)
+    return genai
+
+
+class TestGeminiEmbeddingProvider:
+    """Tests for GeminiEmbeddingProvider."""
+
+    @pytest.mark.asyncio
+    async def test_batch_embed_preserves_input_order(self, fake_genai):
+        """Results line up with the input texts regardless of dispatch order."""
+        from eternal_memory.llm.gemini_provider import GeminiEmbeddingProvider
+
+        provider = GeminiEmbeddingProvider(api_key="test-key")
+        texts = ["ccc", "a", "bbbb", "dd"]
+
+        result = await provider.batch_embed(texts)
+
+        assert [list(row) for row in result] == [[3.0], [1.0], [4.0], [2.0]]
+
+    @pytest.mark.asyncio
+    async def test_batch_embed_bounds_concurrency(self, fake_genai, monkeypatch):
+        """No more than max_concurrency requests are in flight."""
+        from eternal_memory.llm.gemini_provider import GeminiEmbeddingProvider
+
+        in_flight = 0
+        peak = 0
+
+        async def fake_to_thread(func, *args, **kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return func(*args, **kwargs)
+
+        monkeypatch.setattr(asyncio, "to_thread", fake_to_thread)
+        provider = GeminiEmbeddingProvider(api_key="test-key", max_concurrency=2, batch_size=1)
+
+        await provider.batch_embed([f"text {i}" for i in range(8)])
+
+        assert peak <= 2
+
+    @pytest.mark.asyncio
+    async def test_batch_embed_sends_chunks(self, fake_genai):
+        """Texts are sent batch_size at a time instead of one request each."""
+        from eternal_memory.llm.gemini_provider import GeminiEmbeddingProvider
+
+        provider = GeminiEmbeddingProvider(api_key="test-key", batch_size=3)
+        texts = ["x" * n for n in range(1, 8)]
+
+        result = await provider.batch_embed(texts)
+
+        assert [list(row) for row in result] == [[float(n)] for n in range(1, 8)]
+        assert sorted(len(call) for call in fake_genai.calls) == [1, 3, 3]
+
+    @pytest.mark.asyncio
+    async def test_batch_embed_prefers_native_async(self, fake_genai, monkeypatch):
+        """embed_content_async is awaited directly instead of using a worker thread."""
+        from eternal_memory.llm.gemini_provider import GeminiEmbeddingProvider
+
+        async def embed_content_async(model, content, task_type):
+            return {"embedding": [[float(len(c))] for c in content]}
+
+        fake_genai.embed_content_async = embed_content_async
+        to_thread = AsyncMock()
+        monkeypatch.setattr(asyncio, "to_thread", to_thread)
+        provider = GeminiEmbeddingProvider(api_key="test-key")
+
+        result = await provider.batch_embed(["aa", "b"])
+
+        assert [list(row) for row in result] == [[2.0], [1.0]]
+        to_thread.assert_not_called()
+
+
+class TestOpenAIEmbeddingProvider:
+    """Tests for OpenAIEmbeddingProvider."""
+
+    @staticmethod
+    def _mock_client():
+        """MagicMock client whose with_options() returns the same mock."""
+        client = MagicMock()
+        client.with_options.return_value = client
+        return client
+
+    @staticmethod
+    def _fake_create(calls):
+        async def create(model, input, **kwargs):
+            calls.append(list(input))
+            await asyncio.sleep(0)
+            return MagicMock(data=[MagicMock(embedding=[float(len(t))]) for t in input])
+        return create
+
+    @pytest.mark.asyncio
+    async def test_batch_embed_splits_into_chunks(self):
+        """Large inputs are sent as several concurrent sub-batches, in order."""
+        from eternal_memory.llm.openai_provider import OpenAIEmbeddingProvider
+
+        provider = OpenAIEmbeddingProvider(api_key="test-key", chunk_size=2)
+        calls = []
+        provider.client = self._mock_client()
+        provider.client.embeddings.create = self._fake_create(calls)
+        texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+
+        result = await provider.batch_embed(texts)
+
+        assert [list(row) for row in result] == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+        assert calls == [["eeeee", "dddd"], ["ccc", "bb"], ["a"]]
+
+    @pytest.mark.asyncio
+    async def test_batch_embed_returns_packed_float32_rows(self):
+        """Rows come back as contiguous float32 arrays."""
+        from array import array
+        from eternal_memory.llm.openai_provider import OpenAIEmbeddingProvider
+
+        provider = OpenAIEmbeddingProvider(api_key="test-key")
+        provider.client = self._mock_client()
+        provider.client.embeddings.create = self._fake_create([])
+
+        result = await provider.batch_embed(["abc"])
+
+        assert isinstance(result[0], array) and result[0].typecode == "f"
+
+    @pytest.mark.asyncio
+    async def test_batch_embed_decodes_base64_payloads(self):
+        """Embeddings are requested as base64 and decoded to float32 rows."""
+        import base64
+        import struct
+        from eternal_memory.llm.openai_provider import OpenAIEmbeddingProvider
+
+        payload = base64.b64encode(struct.pack("<3f", 0.5, -1.0, 2.25)).decode()
+        provider = OpenAIEmbeddingProvider(api_key="test-key")
+        provider.client = self._mock_client()
+        provider.client.embeddings.create = AsyncMock(
+            return_value=MagicMock(data=[MagicMock(embedding=payload)])
+        )
+
+        result = await provider.batch_embed(["abc"])
+
+        assert list(result[0]) == [0.5, -1.0, 2.25]
+        kwargs = provider.client.embeddings.create.call_args.kwargs
+        assert kwargs["encoding_format"] == "base64"
+
+    @pytest.mark.asyncio
+    async def test_requests_disable_sdk_retries(self):
+        """Only _with_retry retries: the SDK's own retries are off per request."""
+        from eternal_memory.llm.openai_provider import OpenAIEmbeddingProvider
+
+        provider = OpenAIEmbeddingProvider(api_key="test-key")
+        provider.client = self._mock_client()
+        provider.client.embeddings.create = self._fake_create([])
+
+        await provider.batch_embed(["abc"])
+
+        provider.client.with_options.assert_called_with(max_retries=0)
+
+    def test_pack_batches_respects_token_budget(self):
+        """Batches never exceed the estimated token budget."""
+        from eternal_memory.llm.openai_provider import OpenAIEmbeddingProvider
+
+        provider = OpenAIEmbeddingProvider(api_key="test-key", max_tokens_per_request=60)
+        texts = ["x" * 100, "y" * 10, "z" * 60, "w" * 10]  # ~51, 6, 31, 6 tokens
+
+        batches = provider._pack_batches(texts)
+
+        assert batches == [[0], [2, 1, 3]]
+
+    @pytest.mark.asyncio
+    async def test_batch_embed_wraps_errors(self):
+        """API failures surface as EmbeddingError."""
+        from eternal_memory.llm.base import EmbeddingError
+        from eternal_memory.llm.openai_provider import OpenAIEmbeddingProvider
+
+        provider = OpenAIEmbeddingProvider(api_key="test-key")
+        provider.client = self._mock_client()
+        provider.client.embeddings.create = AsyncMock(side_effect=RuntimeError("boom"))
+
+        with pytest.raises(EmbeddingError):
+            await provider.batch_embed(["text"])
+
+
+class _StatusError(Exception):
+    """Exception shaped like an SDK HTTP error."""
+
+    def __init__(self, status_code, retry_after=None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        headers = {"retry-after": retry_after} if retry_after is not None else {}
+        self.response = MagicMock(status_code=status_code, headers=headers)
+
+
+class TestEmbeddingRetry:
+    """Tests for EmbeddingProvider._with_retry."""
+
+    @pytest.fixture
+    def provider(self):
+        from eternal_memory.llm.openai_provider import OpenAIEmbeddingProvider
+        return OpenAIEmbeddingProvider(api_key="test-key")
+
+    @pytest.mark.asyncio
+    async def test_retries_rate_limit_honoring_retry_after(self, provider, monkeypatch):
+        """429s are retried, sleeping at least Retry-After seconds."""
+        sleeps = []
+
+        async def fake_sleep(delay):
+            sleeps.append(delay)
+
+        monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+        request = AsyncMock(side_effect=[_StatusError(429, retry_after="7"), "ok"])
+
+        result = await provider._with_retry(request)
+
+        assert result == "ok"
+        assert request.await_count == 2
+        assert sleeps and sleeps[0] >= 7
+
+    @pytest.mark.asyncio
+    async def test_does_not_retry_client_errors(self, provider):
+        """Non-transient errors propagate immediately."""
+        request = AsyncMock(side_effect=_StatusError(400))
+
+        with pytest.raises(_StatusError):
+            await provider._with_retry(request)
+
+        assert request.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self, provider, monkeypatch):
+        """Persistent 5xx errors are re-raised once retries are exhausted."""
+        monkeypatch.setattr(asyncio, "sleep", AsyncMock())
+        request = AsyncMock(side_effect=_StatusError(503))
+
+        with pytest.raises(_StatusError):
+            await provider._with_retry(request, max_retries=2)
+
+        assert request.await_count == 3
@@ -9,6 +9,8 @@ from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 from datetime import datetime
 
+from tests.conftest import stream_of
+
 
 class TestMemorizeLogic:
     """Unit tests for memorize pipeline logic."""
@@ -25,14 +27,17 @@ class TestMemorizeLogic:
         vault = AsyncMock()
         
         # Setup LLM to return extracted facts
-        llm.extract_facts.return_value = [
+        llm.stream_extract_facts = stream_of([
             {"content": "User likes Python", "type": "preference", "importance": 0.7}
-        ]
+        ])
         llm.generate_embedding.return_value = [0.1] * 1536
         llm.suggest_category.return_value = "personal/preferences"
         
         # Setup repo
         repo.vector_search.return_value = []  # No duplicates
+        repo.vector_search_batch.return_value = [[]]
+        repo.get_memory_items_by_content_hashes.return_value = {}
+        repo.vector_search_categories_with_scores.return_value = []
         repo.get_category_by_path.return_value = Category(
             id=uuid4(), name="preferences", path="personal/preferences"
         )
@@ -44,9 +49,9 @@ class TestMemorizeLogic:
         
         # Verify
         assert len(items) == 1
-        llm.extract_facts.assert_called_once()
+        llm.stream_extract_facts.assert_called_once()
         repo.create_memory_item.assert_called_once()
-        vault.append_to_category.assert_called_once()
+        vault.apply_batch.assert_called_once()
 
     @pytest.mark.asyncio
     async def test_memorize_handles_empty_extraction(self):
@@ -58,7 +63,7 @@ class TestMemorizeLogic:
         vault = AsyncMock()
         
         # LLM returns no facts
-        llm.extract_facts.return_value = []
+        llm.stream_extract_facts = stream_of([])
         
         pipeline = MemorizePipeline(repo, llm, vault)
         items = await pipeline.execute("Just random chit-chat")
@@ -96,7 +101,148 @@ class TestRetrieveLogic:
         # Verify
         assert result.retrieval_mode == "fast"
         assert len(result.items) >= 0
-        llm.generate_embedding.assert_called_once()
+        llm.generate_embedding.assert_called_with("programming preferences")
+
+    @pytest.mark.asyncio
+    async def test_retrieve_reuses_embedding_of_unchanged_query(self):
+        """The original query is embedded during evolution and reused if unchanged."""
+        from eternal_memory.pipelines.retrieve import RetrievePipeline
+        
+        repo = AsyncMock()
+        llm = AsyncMock()
+        llm.generate_embedding.return_value = [0.1] * 4
+        llm.evolve_query.return_value = "What do I like?"
+        llm.reason_from_context.return_value = "Nothing yet."
+        repo.generative_agents_search.return_value = []
+        
+        pipeline = RetrievePipeline(repo, llm, AsyncMock())
+        await pipeline.execute("What do I like?", mode="deep")
+        
+        llm.generate_embedding.assert_awaited_once_with("What do I like?")
+        assert list(repo.generative_agents_search.call_args.kwargs["query_embedding"]) == pytest.approx([0.1] * 4)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_retrievals_of_same_query_both_complete(self):
+        """A retrieval dropping its speculative embedding does not abort a concurrent one."""
+        import asyncio
+        from eternal_memory.llm.client import LLMClient
+        from eternal_memory.pipelines.retrieve import RetrievePipeline
+        
+        llm = LLMClient(api_key="test-key")
+        calls = []
+        
+        async def slow_embed(texts):
+            calls.append(list(texts))
+            await asyncio.sleep(0.01)
+            return [[0.1] * 4 for _ in texts]
+        
+        async def evolve(query, context):
+            await asyncio.sleep(0.005)
+            return f"{query} ({context})" if context else query
+        
+        llm._embedding_provider.batch_embed = slow_embed
+        llm.evolve_query = evolve
+        llm.reason_from_context = AsyncMock(return_value="Nothing yet.")
+        repo = AsyncMock()
+        repo.generative_agents_search.return_value = []
+        pipeline = RetrievePipeline(repo, llm, AsyncMock())
+        
+        # The first call starts the shared embedding of the raw query, then
+        # evolves it to a different query and drops its own wait
+        evolving = asyncio.create_task(
+            pipeline.execute("Where was that?", mode="deep", conversation_context="Tokyo trip")
+        )
+        await asyncio.sleep(0)
+        unchanged = asyncio.create_task(pipeline.execute("Where was that?", mode="deep"))
+        
+        results = await asyncio.wait_for(asyncio.gather(evolving, unchanged), timeout=1)
+        
+        assert [r.query_evolved for r in results] == ["Where was that? (Tokyo trip)", None]
+        assert ["Where was that?"] in calls
+        assert repo.generative_agents_search.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_retrieve_caches_evolved_queries(self):
+        """The same query in the same conversation is evolved once."""
+        from eternal_memory.pipelines.retrieve import RetrievePipeline
+        
+        repo = AsyncMock()
+        llm = AsyncMock()
+        llm.generate_embedding.return_value = [0.1] * 4
+        llm.evolve_query.return_value = "Where did I stay in Tokyo?"
+        llm.reason_from_context.return_value = "Nothing yet."
+        repo.generative_agents_search.return_value = []
+        
+        pipeline = RetrievePipeline(repo, llm, AsyncMock())
+        await pipeline.execute("Where was that?", mode="deep", conversation_context="Tokyo trip")
+        await pipeline.execute("Where was that?", mode="deep", conversation_context="Tokyo trip")
+        await pipeline.execute("Where was that?", mode="deep", conversation_context="Seoul trip")
+        
+        assert llm.evolve_query.await_count == 2
+        # Every call evolved to the same query, so the first result is reused
+        repo.generative_agents_search.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_retrieve_results_cached_until_cleared(self):
+        """Identical retrievals reuse a copy of the result until the cache is cleared."""
+        from eternal_memory.pipelines.retrieve import RetrievePipeline
+        
+        repo = AsyncMock()
+        llm = AsyncMock()
+        llm.generate_embedding.return_value = [0.1] * 4
+        llm.evolve_query.side_effect = lambda query, context: query
+        llm.reason_from_context.return_value = "You like tea."
+        repo.generative_agents_search.return_value = []
+        
+        pipeline = RetrievePipeline(repo, llm, AsyncMock())
+        first = await pipeline.execute("What do I drink?", mode="deep")
+        first.suggested_context = "changed by caller"
+        second = await pipeline.execute("What do I drink?", mode="deep")
+        await pipeline.execute("What do I drink?", mode="fast")
+        pipeline.clear_result_cache()
+        await pipeline.execute("What do I drink?", mode="deep")
+        
+        assert second.suggested_context == "You like tea."
+        assert repo.generative_agents_search.await_count == 3
+        assert llm.reason_from_context.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_hierarchical_search_filters_in_sql_and_prefixes_triples(self):
+        """Outdated items are excluded by the memory search; distinct triples form the context."""
+        from eternal_memory.pipelines.retrieve import RetrievePipeline
+        from eternal_memory.models.memory_item import MemoryItem
+        from eternal_memory.models.semantic_triple import SemanticTriple
+        
+        item = MemoryItem(content="Lives in Seoul", category_path="personal")
+        triples = [
+            SemanticTriple(memory_item_id=item.id, subject="User", predicate="lives_in", object="Seoul"),
+            SemanticTriple(memory_item_id=item.id, subject="User", predicate="lives_in", object="Seoul"),
+            SemanticTriple(memory_item_id=item.id, subject="User", predicate="likes", object="tea"),
+        ]
+        repo = AsyncMock()
+        repo.generative_agents_search.return_value = [item]
+        repo.search_triples_semantic.return_value = triples
+        
+        pipeline = RetrievePipeline(repo, AsyncMock(), AsyncMock())
+        pipeline.llm_config.use_semantic_triples = True
+        items, context = await pipeline._search([0.1] * 4, limit=10, min_relevance_threshold=0.0)
+        
+        assert items == [item]
+        assert context == "User resides in Seoul; User likes tea"
+        assert repo.generative_agents_search.call_args.kwargs["exclude_outdated_triples"] is True
+
+    def test_quick_context_cuts_long_snippets(self):
+        """Fast-mode context keeps short memories whole and cuts long ones."""
+        from eternal_memory.pipelines.retrieve import RetrievePipeline
+        from eternal_memory.models.memory_item import MemoryItem
+        
+        pipeline = RetrievePipeline(AsyncMock(), AsyncMock(), AsyncMock())
+        pipeline.QUICK_CONTEXT_ITEM_CHARS = 10
+        items = [MemoryItem(content=c, category_path="personal") for c in ("Likes tea", "x" * 50)]
+        
+        context = pipeline._generate_quick_context(items)
+        
+        assert context == "Relevant context: Likes tea; " + "x" * 10 + "..."
 
     @pytest.mark.asyncio
     async def test_retrieve_deep_mode_uses_reasoning(self):
@@ -195,6 +341,76 @@ class TestPredictLogic:
         assert isinstance(context, str)
         llm.predict_next_intent.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_preload_skips_items_seen_in_another_category(self):
+        """An item returned for two active categories is preloaded once."""
+        from eternal_memory.pipelines.predict import PredictPipeline
+        from eternal_memory.models.memory_item import Category, MemoryItem
+        
+        shared = MemoryItem(content="Uses pytest", category_path="knowledge/python")
+        other = MemoryItem(content="Likes tea", category_path="knowledge")
+        repo = AsyncMock()
+        repo.get_items_for_categories.return_value = [shared, other, shared]
+        categories = [Category(name="knowledge", path="knowledge"), Category(name="python", path="knowledge/python")]
+        
+        preloaded = await PredictPipeline(repo, AsyncMock(), AsyncMock())._preload_relevant_memories(categories)
+        
+        assert preloaded == ["Uses pytest", "Likes tea"]
+        repo.get_items_for_categories.assert_awaited_once_with(
+            ["knowledge", "knowledge/python"], per_category_limit=3
+        )
+
+    def test_extract_patterns_finds_dominant_category_and_type(self):
+        """The session label and the most frequent root category and memory type are reported."""
+        from eternal_memory.pipelines.predict import PredictPipeline
+        from eternal_memory.models.memory_item import MemoryItem
+        
+        items = [
+            MemoryItem(content="a", category_path="knowledge/python", type="fact"),
+            MemoryItem(content="b", category_path="personal", type="preference"),
+            MemoryItem(content="c", category_path="knowledge/rust", type="preference"),
+        ]
+        
+        patterns = PredictPipeline(AsyncMock(), AsyncMock(), AsyncMock())._extract_patterns(
+            items, {"open_apps": ["VSCode", "Browser"]}, datetime(2026, 1, 31, 21, 30)
+        )
+        
+        assert patterns[0] == "Evening session"
+        assert "Currently focused on: knowledge" in patterns
+        assert any(p.startswith("Recent activity type:") and "preference" in p for p in patterns)
+        assert patterns[-2:] == ["User appears to be coding", "User is browsing"]
+
+    @pytest.mark.asyncio
+    async def test_predict_overlaps_independent_calls(self):
+        """Intent prediction runs alongside the memory preload."""
+        import asyncio
+        from eternal_memory.pipelines.predict import PredictPipeline
+        from eternal_memory.models.memory_item import Category, MemoryItem
+        
+        repo = AsyncMock()
+        llm = AsyncMock()
+        in_flight = 0
+        peak = 0
+        
+        async def slow(result):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return result
+        
+        item = MemoryItem(content="Uses pytest", category_path="knowledge")
+        repo.get_recent_items = lambda limit: slow([item])
+        repo.get_all_categories = lambda: slow([Category(name="knowledge", path="knowledge")])
+        repo.get_items_for_categories = lambda category_paths, per_category_limit: slow([item])
+        llm.predict_next_intent = lambda **kwargs: slow("Writing tests")
+        
+        context = await PredictPipeline(repo, llm, AsyncMock()).execute({})
+        
+        assert peak == 2
+        assert "Writing tests" in context and "Uses pytest" in context
+
 
 class TestSystemInitialization:
     """Unit tests for system initialization logic."""
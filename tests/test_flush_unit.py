@@ -70,7 +70,7 @@ class TestFlushPipeline:
     async def test_execute_cleans_bullet_points(self, pipeline):
         """Test that bullet points are stripped from facts."""
         pipeline.llm.complete.return_value = "- Fact 1\r\n- Fact 2"
-        pipeline.memorize_pipeline.store_single_memory.side_effect = lambda content, metadata: MagicMock(content=content)
+        pipeline.memorize_pipeline.store_single_memory.side_effect = lambda content, metadata, **kwargs: MagicMock(content=content)
         
         items = await pipeline.execute([{"role": "user", "content": "msg"}])
         
@@ -78,5 +78,196 @@ class TestFlushPipeline:
         assert items[0].content == "Fact 1"
         assert items[1].content == "Fact 2"
 
+    @pytest.mark.asyncio
+    async def test_execute_reuses_cached_response(self, pipeline):
+        """Re-flushing the same transcript is answered from the response cache."""
+        from eternal_memory.llm.response_cache import LLMResponseCache
+
+        pipeline.response_cache = LLMResponseCache()
+        pipeline.dedup_ttl_seconds = 0  # exercise the response cache itself
+        pipeline.llm.complete.return_value = "- Fact 1"
+        pipeline.memorize_pipeline.store_single_memory.side_effect = lambda content, metadata, **kwargs: MagicMock(content=content)
+        messages = [{"role": "user", "content": "msg"}]
+
+        await pipeline.execute(messages)
+        items = await pipeline.execute(messages)
+
+        pipeline.llm.complete.assert_called_once()
+        assert [item.content for item in items] == ["Fact 1"]
+
+    @pytest.mark.asyncio
+    async def test_execute_never_reuses_response_for_different_transcript(self, pipeline):
+        """A transcript with one new message is extracted again, not served from cache."""
+        from eternal_memory.llm.response_cache import LLMResponseCache
+
+        pipeline.response_cache = LLMResponseCache()
+        pipeline.llm.complete.side_effect = ["- Lives in Seoul", "- Moved to Berlin"]
+        pipeline.memorize_pipeline.store_single_memory.side_effect = lambda content, metadata, **kwargs: MagicMock(content=content)
+        first = [{"role": "user", "content": "I live in Seoul"}]
+
+        await pipeline.execute(first)
+        items = await pipeline.execute(first + [{"role": "user", "content": "I moved to Berlin"}])
+
+        assert pipeline.llm.complete.await_count == 2
+        assert [item.content for item in items] == ["Moved to Berlin"]
+
+    @pytest.mark.asyncio
+    async def test_execute_runs_insight_extraction_concurrently(self, pipeline):
+        """The extraction and insights prompts are in flight at the same time."""
+        import asyncio
+
+        both_started = asyncio.Event()
+        in_flight = []
+
+        async def complete(prompt, response_format=None):
+            in_flight.append(response_format)
+            if len(in_flight) == 2:
+                both_started.set()
+            await asyncio.wait_for(both_started.wait(), timeout=1)
+            if response_format == "json_object":
+                return {"insights": [{"section": "Core Identity", "content": "Lives in Seoul", "confidence": 0.9}]}
+            return "- User lives in Seoul"
+
+        pipeline.llm.complete.side_effect = complete
+        pipeline.user_model = MagicMock(MIN_CONFIDENCE=0.8, MIN_EVIDENCE=2)
+        pipeline.user_model.batch_update = AsyncMock(return_value=1)
+
+        items = await pipeline.execute([{"role": "user", "content": "I live in Seoul"}])
+
+        assert len(items) == 1
+        pipeline.user_model.batch_update.assert_awaited_once()
+        assert pipeline.user_model.batch_update.call_args.kwargs == {
+            "min_confidence": pipeline.IMMEDIATE_CONFIDENCE_THRESHOLD,
+            "min_evidence": pipeline.IMMEDIATE_EVIDENCE_THRESHOLD,
+        }
+        assert pipeline.user_model.MIN_CONFIDENCE == 0.8
+
+    @pytest.mark.asyncio
+    async def test_insights_failure_does_not_fail_flush(self, pipeline):
+        """A failing insights call is logged; extracted facts are still stored."""
+        async def complete(prompt, response_format=None):
+            if response_format == "json_object":
+                raise RuntimeError("boom")
+            return "- Fact 1"
+
+        pipeline.llm.complete.side_effect = complete
+        pipeline.user_model = MagicMock()
+        pipeline.user_model.batch_update = AsyncMock()
+
+        items = await pipeline.execute([{"role": "user", "content": "msg"}])
+
+        assert len(items) == 1
+        pipeline.user_model.batch_update.assert_not_awaited()
+
+    def test_format_transcript_labels_roles(self):
+        """Known and unknown roles are upper-cased into transcript labels."""
+        from eternal_memory.pipelines.flush import _format_transcript
+
+        transcript = _format_transcript([
+            {"role": "user", "content": "hi"},
+            {"role": "tool", "content": "{}"},
+        ])
+
+        assert transcript == "USER: hi\nTOOL: {}"
+
+    @pytest.mark.asyncio
+    async def test_repeated_transcript_skips_extraction(self, pipeline):
+        """Re-flushing an unchanged buffer returns the earlier items by ID."""
+        pipeline.llm.complete.return_value = "- Fact 1"
+        item = MagicMock(content="Fact 1")
+        pipeline.memorize_pipeline.store_single_memory.return_value = item
+        pipeline.repository.get_memory_items_by_ids.return_value = [item]
+        messages = [{"role": "user", "content": "msg"}]
+
+        await pipeline.execute(messages)
+        items = await pipeline.execute(messages)
+
+        pipeline.llm.complete.assert_called_once()
+        pipeline.memorize_pipeline.store_single_memory.assert_called_once()
+        pipeline.repository.get_memory_items_by_ids.assert_awaited_once_with([item.id])
+        assert items == [item]
+
+    @pytest.mark.asyncio
+    async def test_changed_transcript_is_extracted_again(self, pipeline):
+        """A transcript with new messages is not served from the dedup cache."""
+        pipeline.llm.complete.return_value = "NONE"
+
+        await pipeline.execute([{"role": "user", "content": "msg"}])
+        await pipeline.execute([{"role": "user", "content": "msg"}, {"role": "user", "content": "more"}])
+
+        assert pipeline.llm.complete.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_streamed_facts_are_stored_before_generation_ends(self, pipeline):
+        """With streaming, a fact is stored while later lines are still pending."""
+        import asyncio
+
+        first_stored = asyncio.Event()
+
+        async def stream_complete(prompt):
+            yield "- Fact "
+            yield "1\n- Fa"
+            await asyncio.wait_for(first_stored.wait(), timeout=1)
+            yield "ct 2"
+
+        async def store(content, metadata, **kwargs):
+            first_stored.set()
+            return MagicMock(content=content)
+
+        pipeline.stream_extraction = True
+        pipeline.llm.stream_complete = stream_complete
+        pipeline.memorize_pipeline.store_single_memory.side_effect = store
+
+        items = await pipeline.execute([{"role": "user", "content": "msg"}])
+
+        assert [item.content for item in items] == ["Fact 1", "Fact 2"]
+        pipeline.llm.complete.assert_not_called()
+
+    def test_parse_facts_strips_bullets_and_none(self):
+        """Bullets and blank/NONE lines are removed from extraction output."""
+        from eternal_memory.pipelines.flush import _parse_facts
+
+        text = "- User likes tea  \r\n\n* Lives in Seoul\n• Has a cat\nNone\n-5 is a number\n"
+
+        assert _parse_facts(text) == ["User likes tea", "Lives in Seoul", "Has a cat", "-5 is a number"]
+        assert _parse_facts("  NONE  ") == []
+
+    @pytest.mark.asyncio
+    async def test_large_transcript_prepared_off_event_loop(self, pipeline, monkeypatch):
+        """Long buffers are formatted in a worker thread with the same result."""
+        import threading
+        from eternal_memory.pipelines import flush
+
+        threads = []
+        prepare = flush._prepare_transcript
+
+        def spy(messages):
+            threads.append(threading.current_thread())
+            return prepare(messages)
+
+        monkeypatch.setattr(flush, "_prepare_transcript", spy)
+        pipeline.TRANSCRIPT_OFFLOAD_MESSAGES = 2
+        pipeline.llm.complete.return_value = "NONE"
+
+        await pipeline.execute([{"role": "user", "content": "a"}])
+        await pipeline.execute([{"role": "user", "content": "a"}, {"role": "user", "content": "b"}])
+
+        assert threads[0] is threading.current_thread()
+        assert threads[1] is not threading.current_thread()
+        assert "USER: a\nUSER: b" in pipeline.llm.complete.call_args.args[0]
+
+    @pytest.mark.asyncio
+    async def test_facts_share_one_flush_timestamp(self, pipeline):
+        """Every fact of a flush is stored with the same timestamp."""
+        pipeline.llm.complete.return_value = "- Fact 1\n- Fact 2"
+        pipeline.memorize_pipeline.store_single_memory.return_value = MagicMock()
+
+        await pipeline.execute([{"role": "user", "content": "msg"}])
+
+        calls = pipeline.memorize_pipeline.store_single_memory.call_args_list
+        assert calls[0].kwargs["now"] is calls[1].kwargs["now"]
+        assert calls[0].kwargs["metadata"]["timestamp"] == calls[0].kwargs["now"].isoformat()
+        assert calls[1].kwargs["metadata"]["timestamp"] == calls[0].kwargs["metadata"]["timestamp"]
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -177,6 +177,93 @@ async def test_clear_hooks():
     assert hooks.get_hook_count()["total"] == 0
 
 
+@pytest.mark.asyncio
+async def test_hooks_run_concurrently():
+    """Test that I/O-bound hooks for a stage overlap."""
+    hooks = PipelineHookManager()
+    
+    @hooks.after("*")
+    async def slow_wildcard(stage, context):
+        await asyncio.sleep(0.1)
+    
+    @hooks.after("store")
+    async def slow_stage(context):
+        await asyncio.sleep(0.1)
+    
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    await hooks.execute_after("store", {})
+    
+    assert loop.time() - start < 0.19
+
+
+@pytest.mark.asyncio
+async def test_sequential_hooks_keep_order():
+    """Test that sequential=True finishes each hook before the next."""
+    hooks = PipelineHookManager()
+    
+    executed = []
+    
+    @hooks.before("*")
+    async def wildcard(stage, context):
+        await asyncio.sleep(0.01)
+        executed.append("wildcard")
+    
+    @hooks.before("extract")
+    async def stage_hook(context):
+        executed.append("stage")
+    
+    await hooks.execute_before("extract", {}, sequential=True)
+    
+    assert executed == ["wildcard", "stage"]
+
+
+@pytest.mark.asyncio
+async def test_sequential_manager_default():
+    """Test that a sequential manager keeps order unless a call overrides it."""
+    hooks = PipelineHookManager(sequential=True)
+    
+    executed = []
+    
+    @hooks.before("*")
+    async def wildcard(stage, context):
+        await asyncio.sleep(0.01)
+        executed.append("wildcard")
+    
+    @hooks.before("extract")
+    async def stage_hook(context):
+        executed.append("stage")
+    
+    await hooks.execute_before("extract", {})
+    await hooks.execute_before("extract", {}, sequential=False)
+    
+    assert executed == ["wildcard", "stage", "stage", "wildcard"]
+
+
+@pytest.mark.asyncio
+async def test_hooks_registered_after_dispatch_are_picked_up():
+    """Test that the cached dispatch chain is rebuilt after registration."""
+    hooks = PipelineHookManager()
+    
+    executed = []
+    
+    @hooks.before("extract")
+    async def first(context):
+        executed.append("first")
+    
+    await hooks.execute_before("extract", {})
+    
+    @hooks.before("*")
+    async def late_wildcard(stage, context):
+        executed.append(f"wildcard:{stage}")
+    
+    await hooks.execute_before("extract", {})
+    hooks.clear_hooks("extract")
+    await hooks.execute_before("extract", {})
+    
+    assert executed == ["first", "wildcard:extract", "first", "wildcard:extract"]
+
+
 if __name__ == "__main__":
     # Run tests manually
     asyncio.run(test_hook_registration())
@@ -186,4 +273,8 @@ if __name__ == "__main__":
     asyncio.run(test_performance_tracking())
     asyncio.run(test_hook_count())
     asyncio.run(test_clear_hooks())
+    asyncio.run(test_hooks_run_concurrently())
+    asyncio.run(test_sequential_hooks_keep_order())
+    asyncio.run(test_sequential_manager_default())
+    asyncio.run(test_hooks_registered_after_dispatch_are_picked_up())
     print("✅ All hook system tests passed!")
@@ -104,6 +104,23 @@ class TestLLMClient:
         assert "summary" in result
         assert isinstance(result["key_events"], list)
 
+    @pytest.mark.asyncio
+    async def test_daily_reflection_survives_one_mistyped_field(self, mock_llm_client):
+        """A null or mistyped field falls back alone; the rest of the reply is kept."""
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = '{"summary": "Busy day.", "key_events": null, "sentiment": "positive", "insights": ["Sleeps late.", "Likes tea."]}'
+        mock_llm_client.client.chat.completions.create = AsyncMock(return_value=mock_response)
+        
+        result = await mock_llm_client.generate_daily_reflection(["memory"], "2026-01-31")
+        
+        assert result == {
+            "summary": "Busy day.",
+            "key_events": [],
+            "sentiment": "positive",
+            "insights": "Sleeps late. Likes tea.",
+        }
+
     @pytest.mark.asyncio
     async def test_generate_weekly_summary_returns_structure(self, mock_llm_client):
         """Test generating a weekly summary."""
@@ -158,6 +175,271 @@ class TestLLMClient:
         
         assert "python" in result
 
+    @pytest.mark.asyncio
+    async def test_usage_callback_does_not_block_caller(self, mock_llm_client):
+        """Slow async usage callbacks run in the background."""
+        import asyncio
+        
+        release = asyncio.Event()
+        recorded = []
+        
+        async def slow_callback(model, prompt_tokens, completion_tokens, total_tokens):
+            await release.wait()
+            recorded.append((model, total_tokens))
+        
+        mock_llm_client.usage_callback = slow_callback
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "summary"
+        mock_response.usage = MagicMock(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+        mock_llm_client.client.chat.completions.create = AsyncMock(return_value=mock_response)
+        
+        result = await mock_llm_client.summarize_category("knowledge", ["fact"])
+        
+        assert result == "summary"
+        assert recorded == []
+        
+        release.set()
+        await mock_llm_client.flush_usage_reports()
+        
+        assert recorded == [("gpt-4o-mini", 15)]
+        assert not mock_llm_client._usage_tasks
+
+    @pytest.mark.asyncio
+    async def test_classify_fact_runs_calls_concurrently(self, mock_llm_client):
+        """classify_fact returns importance, category and relationship."""
+        mock_llm_client.rate_importance = AsyncMock(return_value=0.8)
+        mock_llm_client.assign_category = AsyncMock(return_value="personal/food")
+        mock_llm_client.is_update_or_correction = AsyncMock(return_value="UPDATE")
+        
+        result = await mock_llm_client.classify_fact(
+            "I now prefer tea", ["personal/food"], existing_content="I prefer coffee"
+        )
+        
+        assert result == (0.8, "personal/food", "UPDATE")
+        mock_llm_client.is_update_or_correction.assert_awaited_once_with(
+            "I now prefer tea", "I prefer coffee"
+        )
+        
+        result = await mock_llm_client.classify_fact("I like tea", [])
+        assert result == (0.8, "personal/food", None)
+
+    @pytest.mark.asyncio
+    async def test_chat_requests_respect_concurrency_cap(self):
+        """No more than max_concurrency chat requests are in flight."""
+        import asyncio
+        from eternal_memory.llm.client import LLMClient
+        
+        client = LLMClient(api_key="mock-key", max_concurrency=2)
+        client.client = AsyncMock()
+        in_flight = 0
+        peak = 0
+        
+        async def fake_create(**kwargs):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            response = MagicMock()
+            response.choices = [MagicMock()]
+            response.choices[0].message.content = "ok"
+            return response
+        
+        client.client.chat.completions.create = fake_create
+        
+        results = await asyncio.gather(
+            *[client.summarize_category("knowledge", ["fact"]) for _ in range(6)]
+        )
+        
+        assert results == ["ok"] * 6
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("reply,expected", [
+        ("7", 0.7), ("10", 1.0), (" 3\n", 0.3), ("12", 1.0), ("8.", 0.8), ("high", 0.5),
+    ])
+    async def test_rate_importance_parses_reply(self, mock_llm_client, reply, expected):
+        """rate_importance normalizes and clamps the model's 1-10 score."""
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = reply
+        mock_llm_client.client.chat.completions.create = AsyncMock(return_value=mock_response)
+        
+        assert await mock_llm_client.rate_importance("fact") == expected
+
+    @pytest.mark.asyncio
+    async def test_batch_rate_importance_parses_reply(self, mock_llm_client):
+        """One call rates every memory; missing or unreadable scores default to 0.5."""
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "7, 12,high"
+        mock_llm_client.client.chat.completions.create = AsyncMock(return_value=mock_response)
+        
+        scores = await mock_llm_client.batch_rate_importance(["a", "b", "c", "d"])
+        
+        assert scores == [0.7, 1.0, 0.5, 0.5]
+        mock_llm_client.client.chat.completions.create.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_reason_from_context_bounds_prompt(self, mock_llm_client):
+        """Long context items are cut and low-ranked ones dropped past the budget."""
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "answer"
+        mock_llm_client.client.chat.completions.create = AsyncMock(return_value=mock_response)
+        mock_llm_client.REASON_ITEM_MAX_CHARS = 20
+        mock_llm_client.REASON_CONTEXT_TOKEN_BUDGET = 25
+        
+        await mock_llm_client.reason_from_context("q", ["a" * 100, "short", "b" * 40], [])
+        
+        prompt = mock_llm_client.client.chat.completions.create.call_args.kwargs["messages"][-1]["content"]
+        assert prompt.endswith("- " + "a" * 20 + "...\n- short")
+        assert "b" not in prompt.split("Relevant memories:")[1]
+
+    @pytest.mark.asyncio
+    async def test_hot_path_prompts_share_static_prefix(self, mock_llm_client):
+        """Instructions go first and stay identical across calls, so the prefix is cacheable."""
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "answer"
+        create = mock_llm_client.client.chat.completions.create = AsyncMock(return_value=mock_response)
+        
+        await mock_llm_client.reason_from_context("first?", ["a"], [])
+        await mock_llm_client.reason_from_context("second?", ["b"], ["s"])
+        
+        first, second = (call.kwargs["messages"] for call in create.call_args_list)
+        assert first[0] == second[0] == {"role": "system", "content": mock_llm_client._REASON_SYSTEM}
+        assert "first?" in first[1]["content"] and "second?" in second[1]["content"]
+
+    @pytest.mark.asyncio
+    async def test_reason_from_context_puts_entity_facts_last(self, mock_llm_client):
+        """Per-query entity facts follow the memories instead of leading the prompt."""
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "answer"
+        mock_llm_client.client.chat.completions.create = AsyncMock(return_value=mock_response)
+        
+        await mock_llm_client.reason_from_context(
+            "q", ["memory"], ["summary"], entity_facts="user likes tea"
+        )
+        
+        prompt = mock_llm_client.client.chat.completions.create.call_args.kwargs["messages"][-1]["content"]
+        assert prompt.index("summary") < prompt.index('"q"') < prompt.index("- memory")
+        assert prompt.endswith("[High-precision entity facts]: user likes tea")
+
+    def test_fit_to_budget_keeps_items_within_budget(self, mock_llm_client):
+        """Prompt items are trimmed to the estimated token budget."""
+        items = ["a" * 100, "b" * 100, "c" * 100]  # ~51 estimated tokens each
+        
+        assert mock_llm_client._fit_to_budget(items, 110) == items[:2]
+        assert mock_llm_client._fit_to_budget(items, 110, keep_latest=True) == items[1:]
+        assert mock_llm_client._fit_to_budget(items, 10) == items[:1]
+        assert mock_llm_client._fit_to_budget(items, 10_000) == items
+
+    @pytest.mark.asyncio
+    async def test_daily_reflection_prompt_respects_budget(self, mock_llm_client):
+        """Oldest memories are dropped from an oversized daily prompt."""
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = '{"summary": "ok"}'
+        mock_llm_client.client.chat.completions.create = AsyncMock(return_value=mock_response)
+        mock_llm_client.DAILY_REFLECTION_TOKEN_BUDGET = 60
+        
+        await mock_llm_client.generate_daily_reflection(["old " * 25, "new " * 25], "2026-01-31")
+        
+        prompt = mock_llm_client.client.chat.completions.create.call_args.kwargs["messages"][0]["content"]
+        assert "new new" in prompt
+        assert "old old" not in prompt
+
+    @pytest.mark.asyncio
+    async def test_stream_complete_yields_deltas_and_reports_usage(self, mock_llm_client):
+        """stream_complete yields text deltas and reports usage from the final chunk."""
+        def chunk(text=None, usage=None):
+            c = MagicMock()
+            c.choices = [MagicMock()] if text is not None else []
+            if text is not None:
+                c.choices[0].delta.content = text
+            c.usage = usage
+            return c
+
+        async def fake_stream():
+            for c in (chunk("- Fact"), chunk(" 1\n"), chunk(""), chunk(usage=MagicMock(prompt_tokens=5, completion_tokens=3, total_tokens=8))):
+                yield c
+
+        mock_llm_client.client.chat.completions.create = AsyncMock(return_value=fake_stream())
+        mock_llm_client.usage_callback = MagicMock()
+
+        deltas = [d async for d in mock_llm_client.stream_complete("prompt")]
+
+        assert deltas == ["- Fact", " 1\n"]
+        assert mock_llm_client.client.chat.completions.create.call_args.kwargs["stream"] is True
+        mock_llm_client.usage_callback.assert_called_once_with("gpt-4o-mini", 5, 3, 8)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("deltas,expected", [
+        (['{"facts": [{"content": "A", "impor', 'tance": 0.8}, {"con', 'tent": "B [x]"}', "]}"],
+         [{"content": "A", "importance": 0.8}, {"content": "B [x]"}]),
+        (['{"content": "tags [a', ', b]"}'], [{"content": "tags [a, b]"}]),
+        (["not json"], []),
+    ])
+    async def test_stream_extract_facts_yields_each_fact(self, mock_llm_client, deltas, expected):
+        """Facts are yielded as each object completes; other replies are parsed at the end."""
+        seen = []
+
+        async def fake_stream():
+            for delta in deltas:
+                seen.append(delta)
+                c = MagicMock()
+                c.choices = [MagicMock()]
+                c.choices[0].delta.content = delta
+                yield c
+
+        mock_llm_client.client.chat.completions.create = AsyncMock(return_value=fake_stream())
+
+        facts = []
+        async for fact in mock_llm_client.stream_extract_facts("text", []):
+            facts.append((fact, len(seen)))
+
+        assert [fact for fact, _ in facts] == expected
+        if len(expected) == 2:
+            # The first fact arrives before the rest of the reply is read
+            assert facts[0][1] == 2
+
+    @pytest.mark.asyncio
+    async def test_aclose_leaves_caller_http_client_open(self):
+        """A caller-supplied http_client is closed by its owner, not by aclose()."""
+        import openai
+        from eternal_memory.llm.client import LLMClient
+        
+        http_client = openai.DefaultAsyncHttpxClient()
+        shared = LLMClient(api_key="mock-key", http_client=http_client)
+        owned = LLMClient(api_key="mock-key")
+        
+        await shared.aclose()
+        await owned.aclose()
+        
+        assert not http_client.is_closed
+        assert owned.client._client.is_closed
+        await http_client.aclose()
+
+    @pytest.mark.asyncio
+    async def test_embedding_provider_never_closes_borrowed_clients(self):
+        """Shared and caller-supplied clients outlive the embedding provider."""
+        import openai
+        from eternal_memory.llm.client import LLMClient
+        
+        http_client = openai.DefaultAsyncHttpxClient()
+        same_key = LLMClient(api_key="mock-key", http_client=http_client)
+        other_key = LLMClient(api_key="mock-key", embedding_api_key="other-key", http_client=http_client)
+        
+        assert same_key._embedding_provider.client is same_key.client
+        assert other_key._embedding_provider.client._client is http_client
+        await same_key.aclose()
+        await other_key.aclose()
+        
+        assert not http_client.is_closed
+        await http_client.aclose()
 
 
 class TestLLMErrorHandling:
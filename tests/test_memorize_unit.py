@@ -0,0 +1,454 @@
+"""
+Unit Tests for Memorize Pipeline
+
+Tests fact storage orchestration in MemorizePipeline.execute using mocks.
+"""
+
+import asyncio
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from eternal_memory.models.memory_item import MemoryItem
+from eternal_memory.pipelines.memorize import MemorizePipeline
+from tests.conftest import stream_of
+
+
+class TestMemorizePipelineExecute:
+    """Tests for MemorizePipeline.execute."""
+
+    @pytest.fixture
+    def pipeline(self):
+        """Create a MemorizePipeline with mocked dependencies."""
+        repo = AsyncMock()
+        llm = AsyncMock()
+        vault = AsyncMock()
+        llm.batch_generate_embeddings.side_effect = lambda texts: [[0.1] * 4 for _ in texts]
+        repo.vector_search_batch.side_effect = lambda query_embeddings, **kwargs: [[] for _ in query_embeddings]
+        repo.get_memory_items_by_content_hashes.return_value = {}
+        return MemorizePipeline(repo, llm, vault, enable_monitoring=False)
+
+    @pytest.mark.asyncio
+    async def test_facts_are_stored_concurrently(self, pipeline):
+        """Distinct facts overlap; facts with the same content do not."""
+        pipeline.llm.stream_extract_facts = stream_of([
+            {"content": "I like tea"},
+            {"content": "I live in Seoul"},
+            {"content": "i like  TEA"},
+            {"content": "I work remotely"},
+        ])
+        in_flight = []
+        max_in_flight = 0
+
+        async def store(content, **kwargs):
+            nonlocal max_in_flight
+            key = " ".join(content.lower().split())
+            assert key not in in_flight
+            in_flight.append(key)
+            max_in_flight = max(max_in_flight, len(in_flight))
+            await asyncio.sleep(0.01)
+            in_flight.remove(key)
+            return MagicMock(content=content)
+
+        pipeline.store_single_memory = store
+
+        items = await pipeline.execute("conversation")
+
+        assert [item.content for item in items] == [
+            "I like tea", "I live in Seoul", "i like  TEA", "I work remotely"
+        ]
+        assert max_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_fact_does_not_drop_others(self, pipeline):
+        """A fact that fails to store is skipped; the rest are returned."""
+        pipeline.llm.stream_extract_facts = stream_of([
+            {"content": "Fact 1"},
+            {"content": "Fact 2"},
+        ])
+
+        async def store(content, **kwargs):
+            if content == "Fact 1":
+                raise RuntimeError("db down")
+            return MagicMock(content=content)
+
+        pipeline.store_single_memory = store
+
+        items = await pipeline.execute("conversation")
+
+        assert [item.content for item in items] == ["Fact 2"]
+
+    @pytest.mark.asyncio
+    async def test_duplicates_found_in_one_search_and_reinforced_in_bulk(self, pipeline):
+        """Known facts are reinforced together; only new facts are stored."""
+        existing = MemoryItem(content="I like tea", category_path="personal", importance=0.5)
+        pipeline.llm.stream_extract_facts = stream_of([
+            {"content": "I like tea"},
+            {"content": "I live in Seoul"},
+            {"content": "I like tea!"},
+        ])
+        pipeline.repository.vector_search_batch.side_effect = None
+        pipeline.repository.vector_search_batch.return_value = [[existing], [], [existing]]
+        pipeline.repository.reinforce_memory_items_bulk.return_value = {existing.id: 3}
+        stored = []
+
+        async def store(content, **kwargs):
+            stored.append((content, kwargs["skip_duplicate_check"]))
+            return MagicMock(content=content)
+
+        pipeline.store_single_memory = store
+
+        items = await pipeline.execute("conversation")
+
+        pipeline.repository.vector_search_batch.assert_awaited_once()
+        pipeline.repository.reinforce_memory_items_bulk.assert_awaited_once_with(
+            item_ids=[existing.id], importances=[0.7], increments=[2]
+        )
+        # Queued behind the batch's appends, not written immediately
+        pipeline.vault.update_memory_in_file.assert_not_awaited()
+        batch = pipeline.vault.apply_batch.call_args.args[0]
+        assert batch.memory_updates == {"personal": {"I like tea": (0.7, 3)}}
+        assert stored == [("I live in Seoul", True)]
+        assert items[0] is existing and items[2] is existing
+        assert existing.mention_count == 3
+
+
+    @pytest.mark.asyncio
+    async def test_vault_appends_applied_once_per_execute(self, pipeline):
+        """Category and timeline appends of all facts are applied as one batch."""
+        paths = {"I like tea": "personal", "I like coffee": "personal", "I use Python": "knowledge"}
+        pipeline.llm.stream_extract_facts = stream_of([{"content": c} for c in paths])
+
+        async def store(content, vault_batch, now, **kwargs):
+            vault_batch.append_to_category(paths[content], content, "fact", now)
+            return MemoryItem(content=content, category_path=paths[content])
+
+        pipeline.store_single_memory = store
+
+        await pipeline.execute("conversation")
+
+        pipeline.vault.append_to_category.assert_not_awaited()
+        pipeline.vault.append_to_timeline.assert_not_awaited()
+        pipeline.vault.apply_batch.assert_awaited_once()
+        batch = pipeline.vault.apply_batch.call_args.args[0]
+        writes = {path: [e[0] for e in entries] for path, entries in batch.category_entries.items()}
+        assert writes == {"personal": ["I like tea", "I like coffee"], "knowledge": ["I use Python"]}
+        assert [e[0][:9] for e in batch.timeline_entries] == ["Stored 3 "]
+
+    @pytest.mark.asyncio
+    async def test_exact_repeats_are_not_embedded(self, pipeline):
+        """Facts matching a stored memory's content hash skip the embedding call."""
+        from eternal_memory.models.memory_item import content_hash
+
+        existing = MemoryItem(content="I like tea", category_path="personal", importance=0.5)
+        pipeline.llm.stream_extract_facts = stream_of([
+            {"content": "I like tea"},
+            {"content": "I live in Seoul"},
+        ])
+        pipeline.repository.get_memory_items_by_content_hashes.return_value = {
+            content_hash("I like tea"): existing
+        }
+        pipeline.repository.reinforce_memory_items_bulk.return_value = {existing.id: 2}
+        pipeline.store_single_memory = AsyncMock(side_effect=lambda content, **kwargs: MagicMock(content=content))
+
+        items = await pipeline.execute("conversation")
+
+        pipeline.llm.batch_generate_embeddings.assert_awaited_once_with(["I live in Seoul"])
+        assert items[0] is existing
+        assert items[1].content == "I live in Seoul"
+
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("text", ["ok", "Thanks!", "good morning!!", "   "])
+    async def test_trivial_input_skips_extraction(self, pipeline, text):
+        """Bare greetings and blank inputs are never sent for extraction."""
+        pipeline.llm.stream_extract_facts = stream_of([{"content": "unexpected"}])
+
+        assert await pipeline.execute(text) == []
+
+        pipeline.llm.stream_extract_facts.assert_not_called()
+        pipeline.repository.create_resource.assert_not_awaited()
+        assert pipeline.vault.append_to_timeline.await_count == (1 if text.strip() else 0)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("text", ["I'm Bob", "I am 30", "나 비건이야"])
+    async def test_short_facts_are_extracted(self, pipeline, text):
+        """Short statements still carry facts, Korean ones especially."""
+        pipeline.llm.stream_extract_facts = stream_of([])
+
+        await pipeline.execute(text)
+
+        pipeline.llm.stream_extract_facts.assert_called_once()
+        assert pipeline.llm.stream_extract_facts.call_args.args[0] == text
+
+    @pytest.mark.asyncio
+    async def test_facts_embedded_while_extraction_streams(self, pipeline):
+        """A full micro-batch is embedded before later facts are generated."""
+        pipeline.PREPARE_BATCH_SIZE = 2
+        events = []
+
+        async def stream(text, existing_categories):
+            for content in ("Fact 1", "Fact 2", "Fact 3"):
+                events.append(f"yield {content}")
+                yield {"content": content}
+                await asyncio.sleep(0.01)
+
+        async def embed(texts):
+            events.append(f"embed {len(texts)}")
+            return [[0.1] * 4 for _ in texts]
+
+        pipeline.llm.stream_extract_facts = stream
+        pipeline.llm.batch_generate_embeddings.side_effect = embed
+        pipeline.store_single_memory = AsyncMock(side_effect=lambda content, **kwargs: MagicMock(content=content))
+
+        items = await pipeline.execute("conversation")
+
+        assert events == ["yield Fact 1", "yield Fact 2", "embed 2", "yield Fact 3", "embed 1"]
+        assert [item.content for item in items] == ["Fact 1", "Fact 2", "Fact 3"]
+
+    @pytest.mark.asyncio
+    async def test_importance_rated_in_one_call(self, pipeline):
+        """New facts with default importance share one batched rating call."""
+        pipeline.llm_config.use_llm_importance = True
+        pipeline.llm.stream_extract_facts = stream_of([
+            {"content": "I like tea"},
+            {"content": "I got married", "importance": 0.9},
+            {"content": "I live in Seoul"},
+        ])
+        pipeline.llm.batch_rate_importance.return_value = [0.3, 0.6]
+        pipeline.store_single_memory = AsyncMock(side_effect=lambda content, **kwargs: MagicMock(content=content))
+
+        await pipeline.execute("conversation")
+
+        pipeline.llm.batch_rate_importance.assert_awaited_once_with(["I like tea", "I live in Seoul"])
+        pipeline.llm.rate_importance.assert_not_awaited()
+        ratings = {
+            call.kwargs["content"]: call.kwargs["precomputed_importance"]
+            for call in pipeline.store_single_memory.await_args_list
+        }
+        assert ratings == {"I like tea": 0.3, "I got married": None, "I live in Seoul": 0.6}
+
+
+class TestStoreSingleMemory:
+    """Tests for MemorizePipeline.store_single_memory."""
+
+    @pytest.fixture
+    def pipeline(self):
+        """Pipeline with LLM importance rating enabled."""
+        from eternal_memory.config import LLMConfig
+
+        pipeline = MemorizePipeline(
+            AsyncMock(), AsyncMock(), AsyncMock(),
+            llm_config=LLMConfig(use_llm_importance=True),
+            enable_monitoring=False,
+        )
+        pipeline.process_fact = AsyncMock(side_effect=lambda **kwargs: MagicMock(**kwargs))
+        return pipeline
+
+    @pytest.mark.asyncio
+    async def test_lookups_overlap_with_duplicate_search(self, pipeline):
+        """Category search and importance rating start before the dedup search ends."""
+        started = []
+
+        async def lookup(name, result):
+            started.append(name)
+            await asyncio.sleep(0.01)
+            return result
+
+        pipeline.repository.vector_search = lambda **kwargs: lookup("dedup", [])
+        pipeline.repository.vector_search_categories_with_scores = lambda **kwargs: lookup(
+            "categories", [(MagicMock(path="personal"), 0.5)]
+        )
+        pipeline.llm.rate_importance = lambda content: lookup("importance", 0.9)
+        pipeline.llm.suggest_category.return_value = "personal"
+
+        item = await pipeline.store_single_memory("I like tea", precomputed_embedding=[0.1] * 4)
+
+        assert started == ["dedup", "categories", "importance"]
+        pipeline.llm.suggest_category.assert_awaited_once_with("I like tea", ["personal"])
+        assert item.importance == 0.9 and item.category_path == "personal"
+
+    @pytest.mark.asyncio
+    async def test_confident_category_match_skips_llm(self, pipeline):
+        """A top candidate above category_auto_threshold is used directly."""
+        from eternal_memory.models.memory_item import Category
+
+        pipeline.llm_config.use_llm_importance = False
+        pipeline.repository.vector_search.return_value = []
+        pipeline.repository.vector_search_categories_with_scores.return_value = [
+            (Category(name="coding", path="knowledge/coding"), 0.8),
+            (Category(name="personal", path="personal"), 0.4),
+        ]
+
+        item = await pipeline.store_single_memory("I write Rust", precomputed_embedding=[0.1] * 4)
+
+        assert item.category_path == "knowledge/coding"
+        pipeline.llm.suggest_category.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_repeat_reinforcement_queued_behind_batch_appends(self, pipeline):
+        """A fact stored earlier in the batch has no vault line yet: its update waits."""
+        from datetime import datetime
+        from eternal_memory.vault import VaultBatch
+
+        now = datetime.now()
+        first = MemoryItem(content="I like tea", category_path="personal", importance=0.5)
+        batch = VaultBatch()
+        batch.append_to_category("personal", first.content, "fact", now)
+        pipeline.recent_memories.add(first)
+        pipeline.repository.reinforce_memory_item.return_value = 2
+
+        item = await pipeline.store_single_memory("I like tea", vault_batch=batch, now=now)
+
+        assert item is first
+        pipeline.vault.update_memory_in_file.assert_not_awaited()
+        assert batch.memory_updates == {"personal": {"I like tea": (0.6, 2)}}
+
+    @pytest.mark.asyncio
+    async def test_items_share_the_callers_timestamp(self, pipeline):
+        """now stamps created_at (in UTC) so a batch shares one clock read."""
+        from datetime import datetime, timezone
+
+        pipeline.llm_config.use_llm_importance = False
+        pipeline.repository.vector_search.return_value = []
+        now = datetime(2024, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+        items = [
+            await pipeline.store_single_memory(
+                content, category_path="personal", precomputed_embedding=[0.1] * 4, now=now
+            )
+            for content in ("I like tea", "I live in Seoul")
+        ]
+
+        assert [item.created_at for item in items] == [now, now]
+
+    @pytest.mark.asyncio
+    async def test_duplicate_cancels_pending_lookups(self, pipeline):
+        """A duplicate hit returns the existing memory without categorizing."""
+        existing = MemoryItem(content="I like tea", category_path="personal")
+        rating = asyncio.Event()
+
+        async def rate(content):
+            await rating.wait()
+            return 0.9
+
+        pipeline.repository.vector_search.return_value = [existing]
+        pipeline.repository.reinforce_memory_items_bulk.return_value = {existing.id: 2}
+        pipeline.llm.rate_importance.side_effect = rate
+
+        result = await pipeline.store_single_memory("I like tea!", precomputed_embedding=[0.1] * 4)
+
+        assert result is existing
+        pipeline.llm.suggest_category.assert_not_awaited()
+        pipeline.process_fact.assert_not_awaited()
+        pipeline.repository.create_resource.assert_not_awaited()
+
+
+    @pytest.mark.asyncio
+    async def test_supersede_checks_run_concurrently(self, pipeline):
+        """Candidates are judged together and superseded in one update."""
+        pipeline.llm_config.use_llm_importance = False
+        pipeline.llm_config.use_memory_supersede = True
+        old = MemoryItem(content="I live in Busan", category_path="personal")
+        other = MemoryItem(content="I lived in Seoul in 2010", category_path="personal")
+        failing = MemoryItem(content="I like Seoul", category_path="personal")
+        pipeline.repository.vector_search.side_effect = [[], [old, other, failing]]
+        in_flight = 0
+        max_in_flight = 0
+
+        async def judge(new_content, existing_content, model_override):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if existing_content == failing.content:
+                raise RuntimeError("rate limited")
+            return "UPDATE" if existing_content == old.content else "NEW"
+
+        pipeline.llm.is_update_or_correction = judge
+
+        item = await pipeline.store_single_memory(
+            "I live in Seoul", category_path="personal", precomputed_embedding=[0.1] * 4
+        )
+
+        assert max_in_flight == 3
+        pipeline.repository.supersede_memory_items.assert_awaited_once_with(
+            old_item_ids=[old.id], new_item_id=item.id
+        )
+
+
+class TestEnsureCategory:
+    """Tests for MemorizePipeline._ensure_category."""
+
+    @pytest.mark.asyncio
+    async def test_missing_levels_created_in_one_bulk_insert(self):
+        """Existing prefixes are found in one query; the rest are inserted together."""
+        from eternal_memory.models.memory_item import Category
+
+        repo = AsyncMock()
+        llm = AsyncMock()
+        vault = AsyncMock()
+        root = Category(name="knowledge", path="knowledge")
+        repo.get_category_by_path.return_value = None
+        repo.get_categories_by_paths.return_value = [root]
+        repo.create_categories_bulk.side_effect = lambda categories, embeddings: categories
+        llm.batch_generate_embeddings.side_effect = lambda texts: [[0.1] * 4 for _ in texts]
+        pipeline = MemorizePipeline(repo, llm, vault, enable_monitoring=False)
+
+        leaf = await pipeline._ensure_category("knowledge/coding/python")
+
+        repo.get_categories_by_paths.assert_awaited_once_with(
+            ["knowledge", "knowledge/coding", "knowledge/coding/python"]
+        )
+        created, embeddings = repo.create_categories_bulk.call_args.args
+        assert [c.path for c in created] == ["knowledge/coding", "knowledge/coding/python"]
+        assert created[0].parent_id == root.id
+        assert created[1].parent_id == created[0].id
+        assert len(embeddings) == 2
+        assert vault.ensure_category_file.await_count == 2
+        assert leaf is created[1]
+        repo.get_category_by_path.assert_awaited_once()  # entry check only
+
+    @pytest.mark.asyncio
+    async def test_creation_serialized_per_root(self):
+        """Paths under one root are created one at a time; other roots overlap."""
+        repo = AsyncMock()
+        repo.get_category_by_path.return_value = None
+        pipeline = MemorizePipeline(repo, AsyncMock(), AsyncMock(), enable_monitoring=False)
+        in_flight = []
+        seen_together = set()
+
+        async def create(path, parent_id):
+            seen_together.update((other, path) for other in in_flight)
+            in_flight.append(path)
+            await asyncio.sleep(0.01)
+            in_flight.remove(path)
+            return MagicMock(path=path)
+
+        pipeline._create_category_path = create
+
+        await asyncio.gather(
+            pipeline._ensure_category("knowledge/a"),
+            pipeline._ensure_category("knowledge/b"),
+            pipeline._ensure_category("personal/c"),
+        )
+
+        assert ("knowledge/a", "personal/c") in seen_together
+        assert ("knowledge/a", "knowledge/b") not in seen_together
+
+    @pytest.mark.asyncio
+    async def test_resolved_paths_are_cached(self):
+        """Later facts in the same category skip the DB lookup."""
+        from eternal_memory.models.memory_item import Category
+
+        repo = AsyncMock()
+        category = Category(name="python", path="knowledge/python")
+        repo.get_category_by_path.return_value = category
+        pipeline = MemorizePipeline(repo, AsyncMock(), AsyncMock(), enable_monitoring=False)
+
+        first = await pipeline._ensure_category("knowledge/python")
+        second = await pipeline._ensure_category("knowledge/python")
+
+        assert first is second is category
+        repo.get_category_by_path.assert_awaited_once()
@@ -9,8 +9,11 @@ from datetime import datetime
 
 import pytest
 
+from eternal_memory.models._raw import RawMemoryItem, RawSemanticTriple
+from eternal_memory.models.ids import uuid7
 from eternal_memory.models.memory_item import Category, MemoryItem, MemoryType, Resource
 from eternal_memory.models.retrieval import RetrievalResult
+from eternal_memory.models.semantic_triple import SemanticTriple, normalize_predicate
 
 
 class TestMemoryItem:
@@ -30,6 +33,7 @@ class TestMemoryItem:
         assert item.importance == 0.5
         assert item.id is not None
         assert isinstance(item.created_at, datetime)
+        assert item.created_at.tzinfo is not None
     
     def test_create_with_all_fields(self):
         """Test creating MemoryItem with all fields specified."""
@@ -81,6 +85,20 @@ class TestMemoryItem:
                 confidence=-0.1,  # Invalid: < 0.0
             )
 
+    def test_from_trusted_applies_defaults(self):
+        """Test building from a trusted row skips validation but fills defaults."""
+        item = MemoryItem.from_trusted(
+            content="User likes tea",
+            category_path="preferences/drinks",
+            type="preference",
+        )
+
+        assert item.type == MemoryType.PREFERENCE
+        assert item.importance == 0.5
+        assert item.id is not None
+        assert isinstance(item.created_at, datetime)
+        assert item.model_dump()["type"] == "preference"
+
 
 class TestResource:
     """Tests for Resource model."""
@@ -172,3 +190,81 @@ class TestRetrievalResult:
         assert len(result.items) == 2
         assert result.retrieval_mode == "deep"
         assert result.confidence_score == 0.85
+
+
+class TestSemanticTriple:
+    """Tests for SemanticTriple model and predicate normalization."""
+    
+    def test_is_opposite_of_both_directions(self):
+        """Test opposite predicates are detected regardless of order and case."""
+        likes = SemanticTriple(subject="User", predicate="Likes", object="apples")
+        dislikes = SemanticTriple(subject="User", predicate="dislikes", object="apples")
+        other = SemanticTriple(subject="User", predicate="dislikes", object="pears")
+        
+        assert likes.is_opposite_of(dislikes)
+        assert dislikes.is_opposite_of(likes)
+        assert not likes.is_opposite_of(other)
+    
+    def test_predicate_is_canonicalized(self):
+        """Test aliases are resolved at construction so opposites match."""
+        loves = SemanticTriple(subject="User", predicate="Loves", object="jazz")
+        hates = SemanticTriple(subject="User", predicate="hates", object="jazz")
+        
+        assert loves.predicate == "likes"
+        assert hates.predicate == "dislikes"
+        assert loves.is_opposite_of(hates)
+    
+    def test_normalize_predicate(self):
+        """Test whitespace collapsing and alias mapping."""
+        assert normalize_predicate("  Lives   In ") == "resides_in"
+        assert normalize_predicate("is born\ton") == "is_born_on"
+        assert normalize_predicate("LOVES") == "likes"
+
+
+class TestIds:
+    """Tests for time-ordered primary key generation."""
+    
+    def test_uuid7_version_and_order(self):
+        """Test generated IDs are version 7 and sort in creation order."""
+        ids = [uuid7() for _ in range(100)]
+        
+        assert all(i.version == 7 for i in ids)
+        assert all(i.variant == uuid.RFC_4122 for i in ids)
+        assert len(set(ids)) == len(ids)
+        assert ids == sorted(ids)
+    
+    def test_models_use_uuid7(self):
+        """Test model primary keys default to UUIDv7."""
+        item = MemoryItem(content="Fact", category_path="test")
+        triple = SemanticTriple(subject="User", predicate="likes", object="tea")
+        
+        assert item.id.version == 7
+        assert triple.id.version == 7
+
+
+class TestRawIntermediates:
+    """Tests for slotted extraction intermediates."""
+    
+    def test_raw_memory_item_from_dict(self):
+        """Test LLM fact dicts are parsed with defaults."""
+        fact = RawMemoryItem.from_dict({"content": "User likes tea", "importance": "0.8"})
+        
+        assert fact.content == "User likes tea"
+        assert fact.type == "fact"
+        assert fact.importance == 0.8
+        assert not hasattr(fact, "__dict__")
+    
+    def test_raw_triple_to_model(self):
+        """Test raw triples canonicalize predicates and convert at the boundary."""
+        item_id = uuid.uuid4()
+        raw = RawSemanticTriple.from_dict(
+            {"subject": "User", "predicate": "Loves", "object": "jazz"}
+        )
+        
+        triple = raw.to_model(memory_item_id=item_id, importance=0.7)
+        
+        assert isinstance(triple, SemanticTriple)
+        assert triple.predicate == "likes"
+        assert triple.memory_item_id == item_id
+        assert triple.importance == 0.7
+        assert triple.id.version == 7
@@ -0,0 +1,162 @@
+"""
+Unit Tests for PerformanceMonitor
+
+Tests metric recording and JSONL log writing in a temporary directory.
+"""
+
+import asyncio
+import random
+import statistics
+import time
+from datetime import datetime
+
+import pytest
+
+from eternal_memory.monitoring.performance import PerformanceMonitor, _P2Quantile
+
+
+class TestPerformanceMonitor:
+    """Tests for PerformanceMonitor class."""
+
+    @pytest.fixture
+    def monitor(self, tmp_path):
+        """Create a monitor writing to a temporary log directory."""
+        monitor = PerformanceMonitor(log_dir=str(tmp_path))
+        yield monitor
+        monitor.close()
+
+    @staticmethod
+    def _context(**overrides):
+        context = {
+            "text": "hello",
+            "start_time": time.perf_counter(),
+            "stage_timers": {"extract": time.perf_counter()},
+            "created_items": [object(), object()],
+        }
+        context.update(overrides)
+        return context
+
+    @pytest.mark.asyncio
+    async def test_writes_are_deferred_and_batched(self, monitor):
+        """Recording does not touch the file until the deferred flush runs."""
+        await monitor.record_pipeline_execution(self._context())
+        await monitor.record_embedding_performance({"batch_embeddings": [[0.1]]})
+
+        log_file = monitor.log_dir / monitor.get_log_files()[0]
+        assert log_file.read_bytes() == b""
+
+        await asyncio.sleep(monitor.FLUSH_INTERVAL * 2)
+
+        lines = log_file.read_text().splitlines()
+        assert len(lines) == 2
+
+    @pytest.mark.asyncio
+    async def test_read_log_file_sees_pending_metrics(self, monitor):
+        """Reading a log file includes metrics that are still buffered."""
+        await monitor.record_pipeline_execution(self._context())
+
+        metrics = monitor.read_log_file(monitor.get_log_files()[0])
+
+        assert len(metrics) == 1
+        assert metrics[0]["type"] == "pipeline_execution"
+        assert metrics[0]["facts"]["stored"] == 2
+        assert monitor.stats["total_pipelines"] == 1
+
+    @pytest.mark.asyncio
+    async def test_rolls_over_to_new_file_on_day_change(self, monitor, monkeypatch):
+        """Writes after UTC midnight land in the next day's file."""
+        from eternal_memory.monitoring import performance
+
+        class NextDay(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                return datetime(2099, 1, 2, 0, 0, 1, tzinfo=tz)
+
+        monkeypatch.setattr(performance, "datetime", NextDay)
+        await monitor.record_pipeline_execution(self._context())
+        monitor.flush()
+
+        assert "metrics_20990102.jsonl" in monitor.get_log_files()
+        assert len(monitor.read_log_file("metrics_20990102.jsonl")) == 1
+
+    @pytest.mark.asyncio
+    async def test_summary_averages_cover_recent_window(self, tmp_path):
+        """Averages track the recent window as old metrics are evicted."""
+        monitor = PerformanceMonitor(log_dir=str(tmp_path), max_recent=2)
+        try:
+            for stored in (10, 1, 3):
+                await monitor.record_pipeline_execution(
+                    self._context(created_items=[object()] * stored)
+                )
+
+            summary = monitor.get_summary()
+        finally:
+            monitor.close()
+
+        assert summary["total_pipelines"] == 3
+        assert summary["total_facts"] == 14
+        assert summary["recent_count"] == 2
+        assert summary["avg_facts_per_pipeline"] == 2.0
+
+    def test_log_file_listing_is_cached(self, monitor):
+        """Repeated listings within the TTL do not rescan the directory."""
+        first = monitor.get_log_files()
+        (monitor.log_dir / "metrics_20000101.jsonl").touch()
+
+        assert monitor.get_log_files() == first
+
+        monitor._log_files_cache = None
+        assert "metrics_20000101.jsonl" in monitor.get_log_files()
+
+    def test_get_monitor_is_a_singleton_across_threads(self, tmp_path, monkeypatch):
+        """Concurrent first calls from several threads share one monitor."""
+        import threading
+        from eternal_memory.monitoring import performance
+
+        monkeypatch.setattr(performance, "_monitor", None)
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(performance.get_monitor(str(tmp_path))))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len({id(m) for m in results}) == 1
+        results[0].close()
+
+    def test_read_log_file_tail(self, monitor):
+        """A limit returns the last valid lines in file order."""
+        log_file = monitor.log_dir / "metrics_20000101.jsonl"
+        log_file.write_text(
+            "".join(f'{{"n": {i}}}\n' for i in range(10)) + "not json\n\n"
+        )
+
+        assert monitor.read_log_file(log_file.name, limit=3) == [{"n": 7}, {"n": 8}, {"n": 9}]
+        assert len(monitor.read_log_file(log_file.name)) == 10
+        assert monitor.read_log_file(log_file.name, limit=50)[0] == {"n": 0}
+
+
+class TestP2Quantile:
+    """Tests for the streaming quantile estimator."""
+
+    def test_exact_for_few_samples(self):
+        """With five or fewer samples the estimate is an observed value."""
+        estimator = _P2Quantile(0.5)
+        for x in (5.0, 1.0, 3.0):
+            estimator.add(x)
+
+        assert estimator.value() == 3.0
+
+    def test_tracks_p95_of_stream(self):
+        """The estimate stays close to the exact p95 of a long stream."""
+        rng = random.Random(42)
+        samples = [rng.expovariate(1.0) for _ in range(5000)]
+        estimator = _P2Quantile(0.95)
+        for x in samples:
+            estimator.add(x)
+
+        exact = statistics.quantiles(samples, n=20)[18]
+        assert estimator.value() == pytest.approx(exact, rel=0.05)
@@ -22,6 +22,7 @@ class TestReinforcementLogic:
         repo = AsyncMock()
         llm = AsyncMock()
         vault = AsyncMock()
+        repo.get_memory_items_by_content_hashes.return_value = {}  # no exact repeat
         
         pipeline = MemorizePipeline(repo, llm, vault)
         return pipeline, repo, llm, vault
@@ -135,3 +136,59 @@ class TestReinforcementLogic:
         assert result.importance == 1.0
         
         repo.reinforce_memory_item.assert_called_once_with(existing_memory.id, 1.0)
+
+    @pytest.mark.asyncio
+    async def test_repeat_within_session_skips_vector_search(self, mock_components):
+        """Test that a recently stored fact is reinforced from the in-process cache."""
+        pipeline, repo, llm, vault = mock_components
+        
+        llm.generate_embedding.return_value = [0.2] * 1536
+        repo.vector_search.return_value = []
+        repo.get_category_by_path.return_value = MagicMock(id=uuid4())
+        repo.reinforce_memory_item.return_value = 2
+        
+        first = await pipeline.store_single_memory(content="I love Python", category_path="knowledge/coding")
+        repo.vector_search.reset_mock()
+        
+        second = await pipeline.store_single_memory(content="I love Python")
+        
+        assert second is first
+        assert second.mention_count == 2
+        repo.vector_search.assert_not_called()
+        repo.reinforce_memory_item.assert_called_once_with(first.id, 0.6)
+
+    @pytest.mark.asyncio
+    async def test_stale_cache_entry_falls_back_to_database(self, mock_components):
+        """Test that a cached memory deleted from the DB is not reinforced."""
+        pipeline, repo, llm, vault = mock_components
+        
+        stale = MemoryItem(content="I love Python", category_path="knowledge/coding")
+        pipeline.recent_memories.add(stale)
+        llm.generate_embedding.return_value = [0.2] * 1536
+        repo.reinforce_memory_item.return_value = 0  # row is gone
+        repo.vector_search.return_value = []
+        repo.get_category_by_path.return_value = MagicMock(id=uuid4())
+        
+        result = await pipeline.store_single_memory(content="I love Python", category_path="knowledge/coding")
+        
+        assert result is not stale
+        repo.vector_search.assert_called()
+        repo.create_memory_item.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_exact_repeat_found_by_content_hash_skips_embedding(self, mock_components):
+        """Test that an exact repeat of a stored fact is reinforced before embedding."""
+        from eternal_memory.models.memory_item import content_hash
+
+        pipeline, repo, llm, vault = mock_components
+        
+        existing = MemoryItem(content="I love Python", category_path="knowledge/coding", importance=0.5)
+        repo.get_memory_items_by_content_hashes.return_value = {content_hash("i love  python"): existing}
+        repo.reinforce_memory_item.return_value = 2
+        
+        result = await pipeline.store_single_memory(content="I love  PYTHON")
+        
+        assert result is existing
+        repo.get_memory_items_by_content_hashes.assert_awaited_once_with([content_hash("I love Python")])
+        llm.generate_embedding.assert_not_called()
+        repo.vector_search.assert_not_called()
@@ -8,7 +8,7 @@ import pytest
 from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
 from datetime import datetime, timedelta
-from eternal_memory.database.repository import MemoryRepository
+from eternal_memory.database.repository import MemoryRepository, _decode_vector, _encode_vector
 
 class TestRepositoryUnit:
     """Unit tests for MemoryRepository."""
@@ -29,6 +29,10 @@ class TestRepositoryUnit:
         mock_ctx.__aexit__ = AsyncMock(return_value=None)
         
         mock_pool.acquire.return_value = mock_ctx
+        # conn.transaction() is a sync call returning an async context manager
+        mock_conn.transaction = MagicMock()
+        mock_conn.transaction.return_value.__aenter__ = AsyncMock()
+        mock_conn.transaction.return_value.__aexit__ = AsyncMock(return_value=None)
         
         repo._pool = mock_pool
         return repo
@@ -161,6 +165,169 @@ class TestRepositoryUnit:
         sql = args[0][0]
         assert "INSERT INTO scheduled_tasks" in sql
 
+    @pytest.mark.asyncio
+    async def test_vector_search_batch_groups_rows_by_query(self, mock_repo):
+        """Batched vector search returns one result list per query, in order."""
+        mock_conn = await mock_repo._pool.acquire.return_value.__aenter__()
+        item_id = uuid4()
+        mock_conn.fetch.return_value = [
+            {
+                "idx": 2,
+                "id": item_id,
+                "content": "test",
+                "similarity": 0.97,
+                "category_path": "test",
+                "created_at": datetime.now(),
+                "importance": 0.5,
+                "type": "fact",
+                "confidence": 1.0,
+                "resource_id": None,
+                "last_accessed": datetime.now(),
+            }
+        ]
+        
+        results = await mock_repo.vector_search_batch([[0.1] * 3, [0.2] * 3], limit=1, threshold=0.95)
+        
+        assert [len(r) for r in results] == [0, 1]
+        assert results[1][0].id == item_id
+        mock_conn.fetch.assert_awaited_once()
+        assert mock_conn.fetch.call_args[0][1] == ["[0.1,0.1,0.1]", "[0.2,0.2,0.2]"]
+        # Access timestamps are bumped in one statement
+        mock_conn.execute.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_embeddings_bound_without_text_formatting(self, mock_repo):
+        """Embeddings reach asyncpg as-is; the codec does the encoding."""
+        mock_conn = mock_repo._pool.acquire.return_value.__aenter__.return_value
+        mock_conn.fetch.return_value = []
+        embedding = [0.1, 0.2, 0.3]
+
+        await mock_repo.vector_search(embedding, limit=1, threshold=0.5)
+
+        assert mock_conn.fetch.call_args[0][1] is embedding
+
+
+    @pytest.mark.asyncio
+    async def test_create_categories_bulk_adopts_existing_ids(self, mock_repo):
+        """A path inserted concurrently keeps its ID, and children follow it."""
+        from eternal_memory.models.memory_item import Category
+
+        mock_conn = mock_repo._pool.acquire.return_value.__aenter__.return_value
+        mock_conn.transaction = MagicMock()
+        mock_conn.transaction.return_value.__aenter__ = AsyncMock()
+        mock_conn.transaction.return_value.__aexit__ = AsyncMock(return_value=None)
+        parent = Category(name="coding", path="knowledge/coding")
+        child = Category(name="python", path="knowledge/coding/python", parent_id=parent.id)
+        stored_parent_id = uuid4()
+        mock_conn.fetchval.side_effect = [stored_parent_id, child.id]
+
+        created = await mock_repo.create_categories_bulk([parent, child], [None, None])
+
+        assert created == [parent, child]
+        assert parent.id == stored_parent_id
+        assert child.parent_id == stored_parent_id
+        assert mock_conn.fetchval.call_args_list[1].args[4] == stored_parent_id
+
+
+    @pytest.mark.asyncio
+    async def test_supersede_memory_items_single_statement(self, mock_repo):
+        """Several memories are superseded with one UPDATE."""
+        mock_conn = mock_repo._pool.acquire.return_value.__aenter__.return_value
+        mock_conn.execute.return_value = "UPDATE 2"
+        old_ids = [uuid4(), uuid4()]
+
+        count = await mock_repo.supersede_memory_items(old_ids, uuid4())
+
+        assert count == 2
+        mock_conn.execute.assert_awaited_once()
+        assert mock_conn.execute.call_args[0][1] == old_ids
+        assert await mock_repo.supersede_memory_items([], uuid4()) == 0
+
+    @pytest.mark.asyncio
+    async def test_generative_agents_search_can_exclude_outdated_triples(self, mock_repo):
+        """The triple-coverage filter is only added to the SQL on request."""
+        mock_conn = mock_repo._pool.acquire.return_value.__aenter__.return_value
+        mock_conn.fetch.return_value = []
+
+        await mock_repo.generative_agents_search([0.1] * 4)
+        await mock_repo.generative_agents_search([0.1] * 4, exclude_outdated_triples=True)
+
+        plain, filtered = (call.args[0] for call in mock_conn.fetch.call_args_list)
+        assert "semantic_triples" not in plain
+        assert "bool_or(t.is_active)" in filtered
+
+    @pytest.mark.asyncio
+    async def test_get_items_for_categories_uses_one_query(self, mock_repo):
+        """All requested categories are fetched with a single ranked query."""
+        mock_conn = mock_repo._pool.acquire.return_value.__aenter__.return_value
+        mock_conn.fetch.return_value = []
+
+        assert await mock_repo.get_items_for_categories([]) == []
+        await mock_repo.get_items_for_categories(["knowledge", "personal"], per_category_limit=2)
+
+        mock_conn.fetch.assert_awaited_once()
+        sql, paths, limit = mock_conn.fetch.call_args.args
+        assert "ROW_NUMBER()" in sql
+        assert paths == ["knowledge", "personal"] and limit == 2
+
+    @pytest.mark.asyncio
+    async def test_generative_agents_search_cascade_shortlists_on_prefix(self, mock_repo):
+        """With cascade_dim, full-vector scoring is limited to a prefix shortlist."""
+        mock_conn = mock_repo._pool.acquire.return_value.__aenter__.return_value
+        mock_conn.fetch.return_value = []
+
+        await mock_repo.generative_agents_search([0.1] * 4)
+        await mock_repo.generative_agents_search([0.1] * 4, cascade_dim=128, cascade_candidates=50)
+
+        plain, cascaded = (call.args[0] for call in mock_conn.fetch.call_args_list)
+        assert "subvector" not in plain
+        assert "subvector(embedding, 1, 128)::vector(128)" in cascaded
+        assert "LIMIT 50" in cascaded
+        assert "JOIN candidates USING (id)" in cascaded
+        # The HNSW scan may return as many rows as the shortlist needs
+        mock_conn.execute.assert_awaited_once_with(
+            "SELECT set_config('hnsw.ef_search', $1, true)", "50"
+        )
+
+    @pytest.mark.asyncio
+    async def test_generative_agents_search_quantized_prefilter(self, mock_repo):
+        """The quantized shortlist compares binary codes by Hamming distance."""
+        mock_conn = mock_repo._pool.acquire.return_value.__aenter__.return_value
+        mock_conn.fetch.return_value = []
+
+        await mock_repo.generative_agents_search([0.1] * 4, quantized_prefilter=True)
+        await mock_repo.generative_agents_search([0.1] * 4, cascade_dim=128, quantized_prefilter=True)
+
+        full, prefix = (call.args[0] for call in mock_conn.fetch.call_args_list)
+        assert "binary_quantize(embedding)::bit(1536) <~> binary_quantize($1::vector)::bit(1536)" in full
+        assert "binary_quantize(subvector(embedding, 1, 128))::bit(128)" in prefix
+
+    @pytest.mark.asyncio
+    async def test_shortlist_uses_configured_embedding_dimension(self, mock_repo):
+        """Full-width quantized shortlists follow the repository's embedding_dim."""
+        mock_conn = mock_repo._pool.acquire.return_value.__aenter__.return_value
+        mock_conn.fetch.return_value = []
+        mock_repo.embedding_dim = 768
+
+        await mock_repo.generative_agents_search([0.1] * 4, quantized_prefilter=True)
+
+        assert "binary_quantize(embedding)::bit(768)" in mock_conn.fetch.call_args.args[0]
+
+
+class TestVectorCodec:
+    """Tests for the pgvector binary codec."""
+
+    def test_round_trip(self):
+        """Lists, packed arrays and text literals encode to the same bytes."""
+        from array import array
+
+        data = _encode_vector([0.5, -1.0, 2.25])
+
+        assert data[:4] == b"\x00\x03\x00\x00"  # dimensions, unused
+        assert data == _encode_vector(array("f", [0.5, -1.0, 2.25]))
+        assert data == _encode_vector("[0.5, -1.0, 2.25]")
+        assert list(_decode_vector(data)) == [0.5, -1.0, 2.25]
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -0,0 +1,51 @@
+"""
+Unit Tests for LLMResponseCache
+
+Tests exact-match response caching. Does not require API keys.
+"""
+
+import pytest
+from unittest.mock import AsyncMock
+
+from eternal_memory.llm.response_cache import LLMResponseCache
+
+
+class TestLLMResponseCache:
+    """Tests for LLMResponseCache."""
+
+    @pytest.mark.asyncio
+    async def test_exact_hit_skips_compute(self):
+        """The same prompt is answered from cache the second time."""
+        cache = LLMResponseCache()
+        compute = AsyncMock(return_value={"insights": [{"content": "x"}]})
+
+        first = await cache.get_or_compute("prompt", compute, model="m")
+        first["insights"].clear()  # callers may mutate results
+        second = await cache.get_or_compute("prompt", compute, model="m")
+
+        assert compute.await_count == 1
+        assert second == {"insights": [{"content": "x"}]}
+        assert cache.hits == 1 and cache.misses == 1
+
+    @pytest.mark.asyncio
+    async def test_key_includes_model_and_format(self):
+        """Different models or response formats never share entries."""
+        cache = LLMResponseCache()
+        compute = AsyncMock(return_value="ok")
+
+        await cache.get_or_compute("prompt", compute, model="a")
+        await cache.get_or_compute("prompt", compute, model="b")
+        await cache.get_or_compute("prompt", compute, model="a", response_format="json_object")
+
+        assert compute.await_count == 3
+
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_recomputed(self):
+        """Entries older than the TTL are not served."""
+        cache = LLMResponseCache(ttl_seconds=0)
+        compute = AsyncMock(return_value="ok")
+
+        await cache.get_or_compute("prompt", compute)
+        await cache.get_or_compute("prompt", compute)
+
+        assert compute.await_count == 2
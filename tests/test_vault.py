@@ -71,6 +71,55 @@ class TestMarkdownVault:
         content = filepath.read_text()
         assert "Test entry" in content
     
+    @pytest.mark.asyncio
+    async def test_apply_batch_writes_queued_entries(self, temp_vault):
+        """Queued category and timeline appends are all written."""
+        from eternal_memory.vault import VaultBatch
+        
+        await temp_vault.initialize()
+        now = datetime.now()
+        batch = VaultBatch()
+        batch.append_to_category("personal", "Likes tea", "preference", now)
+        batch.append_to_category("knowledge", "Uses Python", "fact", now)
+        batch.append_to_timeline("Stored 2 memories", now)
+        
+        await temp_vault.apply_batch(batch)
+        
+        assert "Likes tea" in await temp_vault.read_category_file("personal")
+        assert "Uses Python" in await temp_vault.read_category_file("knowledge")
+        timeline = (temp_vault.memory_path / "timeline" / now.strftime("%Y-%m.md")).read_text()
+        assert "Stored 2 memories" in timeline
+    
+    @pytest.mark.asyncio
+    async def test_apply_batch_updates_lines_appended_in_same_batch(self, temp_vault):
+        """A queued reinforcement finds a memory queued earlier in the batch."""
+        from eternal_memory.vault import VaultBatch
+        
+        await temp_vault.initialize()
+        now = datetime.now()
+        batch = VaultBatch()
+        batch.append_to_category("personal", "Likes tea", "preference", now)
+        batch.update_memory_in_file("personal", "Likes tea", 0.7, 3)
+        batch.update_memory_in_file("personal", "Likes tea", 0.6, 2)  # finished later
+        
+        await temp_vault.apply_batch(batch)
+        
+        assert "Likes tea (x3)" in await temp_vault.read_category_file("personal")
+    
+    @pytest.mark.asyncio
+    async def test_timeline_header_written_once(self, temp_vault):
+        """The month header starts a new file and is not repeated."""
+        await temp_vault.initialize()
+        
+        now = datetime.now()
+        await temp_vault.append_to_timeline("First", now)
+        await temp_vault.append_to_timeline("Second", now)
+        
+        content = (temp_vault.memory_path / "timeline" / now.strftime("%Y-%m.md")).read_text()
+        assert content.startswith("# Timeline - ")
+        assert content.count("# Timeline - ") == 1
+        assert content.index("First") < content.index("Second")
+    
     @pytest.mark.asyncio
     async def test_ensure_category_file(self, temp_vault):
         """Test creating category files."""
@@ -99,6 +148,21 @@ class TestMarkdownVault:
         assert "Python uses indentation for blocks" in content
         assert "📝" in content  # Fact emoji
     
+    @pytest.mark.asyncio
+    async def test_append_to_category_bulk(self, temp_vault):
+        """Several memories land in one write, in order."""
+        await temp_vault.initialize()
+        now = datetime.now()
+        
+        await temp_vault.append_to_category_bulk(
+            "personal/preferences",
+            [("Likes tea", "preference", now), ("Lives in Seoul", "fact", now)],
+        )
+        
+        content = await temp_vault.read_category_file("personal/preferences")
+        assert content.index("⭐") < content.index("Likes tea") < content.index("📝 ")
+        assert content.endswith("Lives in Seoul\n")
+    
     @pytest.mark.asyncio
     async def test_different_memory_types(self, temp_vault):
         """Test that different memory types get different emojis."""
@@ -285,3 +349,27 @@ class TestVaultExceptionHandling:
         # At least 1 entry should have been written successfully
         assert entries_found >= 1, f"Expected at least 1 entry, found {entries_found}"
 
+
+    @pytest.mark.asyncio
+    async def test_concurrent_update_and_append_keep_all_entries(self, temp_vault):
+        """Rewriting a file for reinforcement does not drop concurrent appends."""
+        import asyncio
+        
+        await temp_vault.initialize()
+        await temp_vault.append_to_category(
+            "test/mixed", "I love apples", "fact", datetime.now()
+        )
+        
+        await asyncio.gather(
+            temp_vault.update_memory_in_file("test/mixed", "I love apples", 0.6, 2),
+            *[
+                temp_vault.append_to_category(
+                    "test/mixed", f"Entry number {i}", "fact", datetime.now()
+                )
+                for i in range(5)
+            ],
+        )
+        
+        content = await temp_vault.read_category_file("test/mixed")
+        assert "I love apples (x2)" in content
+        assert all(f"Entry number {i}" in content for i in range(5))